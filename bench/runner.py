@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+"""Run sympycore benchmarks and compare the results against a baseline.
+
+Benchmarks are functions named ``test`` or ``test_*`` that are
+defined in the ``test_*.py`` modules of the bench directory. The
+first line of the function documentation string is used as the
+benchmark title. A function with a ``params`` attribute defines a
+scaling sweep: it is timed separately for each parameter value. If
+the function also has a ``setup`` attribute then ``setup(param)`` is
+called outside of the timed region and must return a tuple of
+arguments to the benchmark function, otherwise the benchmark function
+is called with the parameter value.
+
+Usage::
+
+  python bench/runner.py [options] [<module>|<module>.<function> ...]
+
+Examples::
+
+  python bench/runner.py -o results.json
+  python bench/runner.py -b baseline.json -t 0.15 test_expand test_str
+  python bench/runner.py -k '*binomial*' --threshold-for '*matrix*=0.3'
+
+Each benchmark is run in a separate Python process (unless
+``--in-process`` is given) so that the memory high-water mark
+reported by ``getrusage`` is specific to the benchmark. For each
+benchmark the following statistics of per-call times (in seconds)
+are recorded: median, first and third quartile, IQR, min and max,
+together with the memory high-water mark of the process and its
+growth during the benchmark (in kilobytes).
+
+When a baseline file is given, a benchmark is reported as a
+regression when its median exceeds the baseline median by more than
+the threshold ratio *and* the absolute difference exceeds the larger
+of the two IQRs. The runner exits with status 1 if any regressions
+were found.
+"""
+
+import os
+import sys
+import glob
+import math
+import time
+import timeit
+import fnmatch
+import optparse
+
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+result_prefix = 'BENCH_RESULT='
+format_version = 1
+
+def get_maxrss():
+    """ Return the memory high-water mark of the process in kilobytes.
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform=='darwin':
+        maxrss //= 1024
+    return maxrss
+
+def percentile(sorted_values, p):
+    """ Return p-th percentile of sorted values using linear interpolation.
+    """
+    n = len(sorted_values)
+    k = (n - 1) * p
+    i = int(math.floor(k))
+    j = min(i + 1, n - 1)
+    return sorted_values[i] + (sorted_values[j] - sorted_values[i]) * (k - i)
+
+def import_module(name):
+    if bench_dir not in sys.path:
+        sys.path.insert(0, bench_dir)
+    __import__(name)
+    return sys.modules[name]
+
+def iter_benchmarks(module_name, include_sweeps=True):
+    """ Yield ``(name, func, param)`` for benchmarks in a module.
+    """
+    module = import_module(module_name)
+    funcs = [(func.func_code.co_firstlineno, name, func) for name, func in module.__dict__.items() \
+             if (name=='test' or name.startswith('test_')) and callable(func) \
+             and getattr(func, '__module__', None)==module_name]
+    funcs.sort()
+    for lineno, name, func in funcs:
+        params = getattr(func, 'params', None)
+        if params is None:
+            yield '%s.%s' % (module_name, name), func, None
+        elif include_sweeps:
+            for param in params:
+                yield '%s.%s(%s)' % (module_name, name, param), func, param
+
+def find_benchmarks(args, patterns, include_sweeps=True):
+    """ Return a list of benchmark names selected by command line arguments.
+    """
+    if not args:
+        args = sorted([os.path.splitext(os.path.basename(fn))[0] \
+                       for fn in glob.glob(os.path.join(bench_dir, 'test_*.py'))])
+    names = []
+    for arg in args:
+        if arg.endswith('.py'):
+            arg = os.path.splitext(os.path.basename(arg))[0]
+        if '.' in arg:
+            module_name, func_name = arg.split('.', 1)
+        else:
+            module_name, func_name = arg, None
+        for name, func, param in iter_benchmarks(module_name, include_sweeps):
+            if func_name is not None and func.__name__!=func_name:
+                continue
+            if patterns and not [p for p in patterns if fnmatch.fnmatch(name, p)]:
+                continue
+            names.append(name)
+    return names
+
+def get_benchmark(name):
+    """ Return ``(func, param)`` for a benchmark name.
+    """
+    module_name = name.split('.', 1)[0]
+    for name1, func, param in iter_benchmarks(module_name):
+        if name1==name:
+            return func, param
+    raise KeyError('no benchmark named %r' % (name))
+
+def run_benchmark(name, repeat=7, min_time=0.05, max_time=10.0):
+    """ Time a benchmark and return a dictionary of its statistics.
+    """
+    func, param = get_benchmark(name)
+    doc = func.__doc__ or func.__name__
+    title = doc.strip().splitlines()[0].strip()
+    if param is not None:
+        setup = getattr(func, 'setup', None)
+        if setup is not None:
+            args = setup(param)
+        else:
+            args = (param,)
+        title = '%s [%s]' % (title, param)
+    else:
+        args = ()
+    timer = timeit.default_timer
+    maxrss0 = get_maxrss()
+
+    # calibrate number of calls per sample, this also serves as warmup:
+    number = 1
+    while 1:
+        t0 = timer()
+        for i in xrange(number):
+            func(*args)
+        t = timer() - t0
+        if t >= min_time or number >= 1<<20:
+            break
+        if t > 0:
+            number = max(number * 2, min(int(number * min_time / t * 1.2) + 1, number * 64))
+        else:
+            number *= 64
+    # limit the total time spent on slow benchmarks:
+    repeat = max(3, min(repeat, int(max_time / max(t, 1e-9))))
+
+    samples = []
+    for r in xrange(repeat):
+        t0 = timer()
+        for i in xrange(number):
+            func(*args)
+        samples.append((timer() - t0) / number)
+
+    maxrss = get_maxrss()
+    if maxrss is not None:
+        maxrss_delta = maxrss - maxrss0
+    else:
+        maxrss_delta = None
+    samples.sort()
+    q1 = percentile(samples, 0.25)
+    q3 = percentile(samples, 0.75)
+    result = dict(title = title,
+                  param = param,
+                  number = number,
+                  repeat = repeat,
+                  median = percentile(samples, 0.5),
+                  q1 = q1, q3 = q3, iqr = q3 - q1,
+                  min = samples[0], max = samples[-1],
+                  maxrss_kb = maxrss,
+                  maxrss_delta_kb = maxrss_delta)
+    return result
+
+def run_isolated(name, options):
+    """ Run a benchmark in a separate Python process.
+    """
+    import subprocess
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker',
+           '--repeat', str(options.repeat),
+           '--min-time', str(options.min_time),
+           '--max-time', str(options.max_time),
+           name]
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    output = p.communicate()[0]
+    for line in output.splitlines():
+        if line.startswith(result_prefix):
+            return json.loads(line[len(result_prefix):])
+    raise RuntimeError('benchmark %s failed (exit status %s)' % (name, p.returncode))
+
+def get_environment():
+    import platform
+    import sympycore
+    return dict(python = sys.version.split()[0],
+                implementation = platform.python_implementation(),
+                platform = platform.platform(),
+                sympycore = sympycore.__version__,
+                compiled = 'sympycore.expr_ext' in sys.modules,
+                date = time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+def get_threshold(name, options):
+    for pattern, value in options.thresholds:
+        if fnmatch.fnmatch(name, pattern):
+            return value
+    return options.threshold
+
+def compare(results, baseline, options):
+    """ Compare results with baseline results.
+
+    Returns a dictionary mapping benchmark names to ``(status, ratio)``
+    where status is one of ``'regression'``, ``'improvement'``,
+    ``'memory'`` (memory growth exceeds memory threshold) or ``''``.
+    """
+    comparison = {}
+    for name, r in results.iteritems():
+        b = baseline.get(name)
+        if b is None or not b['median']:
+            continue
+        ratio = r['median'] / b['median']
+        threshold = get_threshold(name, options)
+        noise = max(r['iqr'], b['iqr'])
+        status = ''
+        if ratio > 1 + threshold and r['median'] - b['median'] > noise:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold) and b['median'] - r['median'] > noise:
+            status = 'improvement'
+        elif options.memory_threshold is not None \
+                 and r.get('maxrss_delta_kb') is not None \
+                 and b.get('maxrss_delta_kb') is not None:
+            m0 = max(b['maxrss_delta_kb'], 1024)
+            if r['maxrss_delta_kb'] > m0 * (1 + options.memory_threshold):
+                status = 'memory'
+        comparison[name] = status, ratio
+    return comparison
+
+def format_time(t):
+    for unit, scale in [('s', 1), ('ms', 1e3), ('us', 1e6), ('ns', 1e9)]:
+        if t * scale >= 1:
+            break
+    return '%.3g%s' % (t * scale, unit)
+
+def print_report(names, results, comparison, stream=sys.stdout):
+    width = max([len(name) for name in names] + [9])
+    print >>stream, '%-*s %10s %10s %10s %8s  %s' % (width, 'benchmark', 'median', 'IQR', 'maxrss', 'ratio', 'status')
+    for name in names:
+        r = results[name]
+        maxrss = r['maxrss_kb']
+        maxrss = maxrss is not None and '%.1fM' % (maxrss / 1024.0) or '-'
+        status, ratio = comparison.get(name, ('', None))
+        ratio = ratio is not None and '%.3f' % (ratio) or '-'
+        print >>stream, '%-*s %10s %10s %10s %8s  %s' % (width, name, format_time(r['median']),
+                                                         format_time(r['iqr']), maxrss, ratio, status)
+
+def parse_threshold(option, opt_str, value, parser):
+    try:
+        pattern, threshold = value.rsplit('=', 1)
+        threshold = float(threshold)
+    except ValueError:
+        raise optparse.OptionValueError('%s expects PATTERN=RATIO, got %r' % (opt_str, value))
+    parser.values.thresholds.append((pattern, threshold))
+
+def main(argv=None, modules=None):
+    """ Command line entry point.
+
+    modules can be a list of module names (or file names) that are
+    benchmarked when no arguments are given, this is used when
+    benchmark modules are executed as scripts.
+    """
+    parser = optparse.OptionParser(usage='%prog [options] [<module>|<module>.<function> ...]')
+    parser.add_option('-o', '--output', help='write results as JSON to FILE', metavar='FILE')
+    parser.add_option('-b', '--baseline', help='compare results against JSON FILE', metavar='FILE')
+    parser.add_option('-t', '--threshold', type='float', default=0.1,
+                      help='relative slowdown of median reported as regression [default: %default]')
+    parser.add_option('--threshold-for', action='callback', type='string', callback=parse_threshold,
+                      dest='thresholds', default=[], metavar='PATTERN=RATIO',
+                      help='threshold for benchmarks matching PATTERN, can be repeated')
+    parser.add_option('--memory-threshold', type='float', default=None, metavar='RATIO',
+                      help='relative growth of memory high-water mark reported as regression')
+    parser.add_option('-r', '--repeat', type='int', default=7,
+                      help='number of timing samples [default: %default]')
+    parser.add_option('--min-time', type='float', default=0.05,
+                      help='minimal duration of a timing sample in seconds [default: %default]')
+    parser.add_option('--max-time', type='float', default=10.0,
+                      help='time budget per benchmark in seconds, reduces the number of samples '\
+                      '(but not below 3) [default: %default]')
+    parser.add_option('-k', dest='patterns', action='append', default=[], metavar='PATTERN',
+                      help='run benchmarks with names matching PATTERN, can be repeated')
+    parser.add_option('--no-sweeps', action='store_true', default=False,
+                      help='skip scaling sweeps')
+    parser.add_option('--in-process', action='store_true', default=False,
+                      help='run all benchmarks in the current process')
+    parser.add_option('-l', '--list', action='store_true', default=False,
+                      help='list benchmarks and exit')
+    parser.add_option('--worker', action='store_true', default=False,
+                      help=optparse.SUPPRESS_HELP)
+    options, args = parser.parse_args(argv)
+
+    if options.worker:
+        for name in args:
+            r = run_benchmark(name, options.repeat, options.min_time, options.max_time)
+            print result_prefix + json.dumps(r)
+        return 0
+
+    if not args and modules:
+        args = modules
+    names = find_benchmarks(args, options.patterns, not options.no_sweeps)
+    if options.list:
+        for name in names:
+            print name
+        return 0
+
+    results = {}
+    for name in names:
+        print >>sys.stderr, 'Running %s' % (name),
+        if options.in_process:
+            r = run_benchmark(name, options.repeat, options.min_time, options.max_time)
+        else:
+            r = run_isolated(name, options)
+        print >>sys.stderr, '%s (IQR %s)' % (format_time(r['median']), format_time(r['iqr']))
+        results[name] = r
+
+    comparison = {}
+    if options.baseline:
+        f = open(options.baseline)
+        baseline = json.load(f)['benchmarks']
+        f.close()
+        comparison = compare(results, baseline, options)
+
+    print_report(names, results, comparison)
+
+    if options.output:
+        data = dict(version = format_version,
+                    environment = get_environment(),
+                    benchmarks = results)
+        if comparison:
+            data['comparison'] = dict([(name, dict(status=status, ratio=ratio)) \
+                                       for name, (status, ratio) in comparison.iteritems()])
+        f = open(options.output, 'w')
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.close()
+
+    regressions = [name for name, (status, ratio) in comparison.iteritems() if status in ['regression', 'memory']]
+    if regressions:
+        print >>sys.stderr, '%s regression(s) found: %s' % (len(regressions), ', '.join(sorted(regressions)))
+        return 1
+    return 0
+
+if __name__=='__main__':
+    sys.exit(main())
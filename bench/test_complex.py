@@ -48,6 +48,5 @@ def test_pow():
             s ** t
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_add, test_sub, test_mul,
-               test_div, test_pow])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -51,7 +51,5 @@ def test_integrate_defined2(f1=f1):
         i -= 1
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_diff1, test_diff2, test_integrate,
-               test_integrate_defined1, test_integrate_defined2
-               ])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
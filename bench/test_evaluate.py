@@ -44,5 +44,5 @@ def test_inverse_complex():
         1/re
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_sin, test_cos, test_complex_power, test_rat_complex_power, test_inverse_complex])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
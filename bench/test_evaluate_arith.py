@@ -62,11 +62,6 @@ def test_Div2():
         n -= 1
         x / n / y
 
-
-
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_Add, test_Add2, test_Sub2,
-               test_Mul, test_Mul2, test_Div2,
-               test_directadd5])
-
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -79,10 +79,5 @@ def test_nested():
     nested.expand()
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([
-        test_bin_1, test_bin_2, test_bin_3,
-        test_quad_1, test_quad_2,
-        test_mixed_1, test_mixed_2, test_nested,
-        test_high_3
-        ])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -35,8 +35,6 @@ def test_mul_sparse():
     """Multiply 5x5 random sparse matrices."""
     c * d
 
-
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_mul, test_mul_sparse, test_lu, test_inv])
-
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
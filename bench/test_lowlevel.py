@@ -73,8 +73,16 @@ def test_compare_is():
         not not (s1 is s1)
         n -= 1
 
+def test_multinomial():
+    """ term_coeff_dict_add_multinomial for expand((x+y+z+w+1)**6)
+    """
+    from sympycore.core import expr_module
+    from sympycore.arithmetic.number_theory import multinomial_coefficients
+    data = (x+y+z+w+1).data
+    term_coeff_list = [(term.base_exp(), coeff) for term, coeff in data.items()]
+    mdata = multinomial_coefficients(len(term_coeff_list), 6)
+    expr_module.term_coeff_dict_add_multinomial(Calculus, {}, term_coeff_list, mdata)
+
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_hash, test_compare_eq1, test_compare_eq2,
-               test_compare_eq3, test_compare_ne1, test_compare_ne2,
-               test_compare_is])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
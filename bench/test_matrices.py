@@ -40,8 +40,6 @@ def test_add_sparse():
     """Add two 15x20 random sparse int matricies."""
     c + d
 
-
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_neg, test_add, test_sub, test_mul_coeff, test_div_coeff,
-               test_add_sparse])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -79,6 +79,5 @@ def test_mixed_symbolic():
     x/e + x/f + x/g
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_compare, test_equality, test_add, test_sub, test_mul,
-               test_div, test_pow, test_mixed_symbolic])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -0,0 +1,52 @@
+"""Matching expressions against many patterns with RuleSet.
+"""
+
+from sympycore import Symbol, RuleSet, sin, cos
+from sympycore.basealgebra.ruleset import _match
+
+x, y, z, w, v = map(Symbol, 'xyzwv')
+
+def make_patterns(n):
+    patterns = []
+    for k in range(n):
+        patterns.append((sin(w)**(k+2), (w,)))
+        patterns.append((cos(w)**(k+2) + v, (w, v)))
+        patterns.append((w**(k+2)*v, (w, v)))
+    return patterns
+
+def make_exprs():
+    return [sin(x)**5, cos(x+y)**7 + z, x**3*y, sin(x)*cos(y), x+y+z]
+
+def setup(n):
+    rules = RuleSet()
+    for pattern, wilds in make_patterns(n):
+        rules.add(pattern, *wilds)
+    return rules, make_exprs()
+
+def test_ruleset_match(rules, exprs):
+    """ match expressions against 3*n rules in one traversal
+    """
+    for e in exprs:
+        rules.match(e)
+test_ruleset_match.params = [10, 50, 200]
+test_ruleset_match.setup = setup
+
+def setup_loop(n):
+    patterns = []
+    for pattern, wilds in make_patterns(n):
+        patterns.append((pattern, dict([(s, True) for s in wilds]), frozenset(wilds)))
+    return patterns, make_exprs()
+
+def test_pattern_loop(patterns, exprs):
+    """ match expressions against 3*n patterns one by one
+    """
+    for e in exprs:
+        for pattern, wilds, wildset in patterns:
+            for b in _match(pattern, e, {}, wilds, wildset):
+                pass
+test_pattern_loop.params = [10, 50, 200]
+test_pattern_loop.setup = setup_loop
+
+if __name__=='__main__':
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
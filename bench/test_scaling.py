@@ -0,0 +1,110 @@
+"""Scaling sweeps: benchmarks timed for a range of problem sizes.
+"""
+
+import random
+
+from sympycore import Symbol, Matrix
+x,y,z = map(Symbol,'xyz')
+
+def expanded_binomial(n):
+    return (((x+y)**n).expand(),)
+
+def random_matrices(n, count=2, density=None):
+    # sparse matrices have about density*n nonzero elements per row
+    random.seed(n)
+    l = []
+    for k in range(count):
+        if density is None:
+            l.append(Matrix(n, n, random=(-10, 10)))
+        else:
+            data = {}
+            for i in range(n):
+                for j in random.sample(xrange(n), min(n, density)):
+                    data[i,j] = random.randint(1, 10)
+            l.append(Matrix(n, n, data))
+    return tuple(l)
+
+def test_expand_binomial(n):
+    """ expand((x+y)**n)
+    """
+    ((x+y)**n).expand()
+test_expand_binomial.params = [10, 25, 50, 100, 200]
+
+def test_expand_trinomial(n):
+    """ expand((x+y+z)**n)
+    """
+    ((x+y+z)**n).expand()
+test_expand_trinomial.params = [5, 10, 20, 40]
+
+def test_str_binomial(e):
+    """ str(e), e = expand((x+y)**n)
+    """
+    str(e)
+test_str_binomial.params = [10, 50, 100, 200]
+test_str_binomial.setup = expanded_binomial
+
+def test_subs_binomial(e):
+    """ e.subs(x, z), e = expand((x+y)**n)
+    """
+    e.subs(x, z)
+test_subs_binomial.params = [10, 50, 100, 200]
+test_subs_binomial.setup = expanded_binomial
+
+def test_diff_binomial(e):
+    """ e.diff(x), e = expand((x+y)**n)
+    """
+    e.diff(x)
+test_diff_binomial.params = [10, 50, 100, 200]
+test_diff_binomial.setup = expanded_binomial
+
+def test_matrix_add(a, b):
+    """ a + b, a, b = random dense n x n matrices
+    """
+    a + b
+test_matrix_add.params = [10, 50, 100, 200, 500]
+test_matrix_add.setup = random_matrices
+
+def test_matrix_mul(a, b):
+    """ a * b, a, b = random dense n x n matrices
+    """
+    a * b
+test_matrix_mul.params = [10, 25, 50, 100, 200]
+test_matrix_mul.setup = random_matrices
+
+def test_matrix_mul_sparse(a, b):
+    """ a * b, a, b = random sparse n x n matrices with 5 elements per row
+    """
+    a * b
+test_matrix_mul_sparse.params = [10, 50, 100, 200, 500]
+test_matrix_mul_sparse.setup = lambda n: random_matrices(n, density=5)
+
+def test_matrix_transpose_mul(a):
+    """ a.T * a, a = random sparse n x n matrix with 5 elements per row
+    """
+    a.T * a
+test_matrix_transpose_mul.params = [10, 50, 100, 200, 500]
+test_matrix_transpose_mul.setup = lambda n: random_matrices(n, count=1, density=5)
+
+def test_matrix_lu(a):
+    """ a.lu(), a = random dense n x n matrix
+    """
+    a.lu()
+test_matrix_lu.params = [5, 10, 20, 40]
+test_matrix_lu.setup = lambda n: random_matrices(n, count=1)
+
+def test_matrix_solve_sparse(a, b):
+    """ a.solve(b), a = random sparse n x n matrix with 3 elements per row plus diagonal
+    """
+    a.solve(b)
+def _solve_setup(n):
+    a, = random_matrices(n, count=1, density=3)
+    for i in range(n):
+        a[i,i] = 100 + i
+    b = Matrix(n, 1, random=(-10, 10))
+    return a, b
+test_matrix_solve_sparse.params = [10, 25, 50]
+test_matrix_solve_sparse.setup = _solve_setup
+
+if __name__=='__main__':
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -0,0 +1,42 @@
+"""Startup benchmarks: time of importing sympycore in a fresh interpreter.
+"""
+
+import os
+import sys
+import subprocess
+
+_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(code):
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([_path] + filter(None, [env.get('PYTHONPATH')]))
+    p = subprocess.Popen([sys.executable, '-c', code], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    p.communicate()
+    if p.returncode:
+        raise RuntimeError('%r failed with exit status %s' % (code, p.returncode))
+
+def test_python():
+    """ python -c pass
+    """
+    run_python('pass')
+
+def test_import():
+    """ import sympycore
+    """
+    run_python('import sympycore')
+
+def test_import_all():
+    """ from sympycore import *
+    """
+    run_python('from sympycore import *')
+
+def test_import_subpackage(name):
+    """ import sympycore.<name>
+    """
+    run_python('import sympycore.%s' % (name))
+test_import_subpackage.params = ['sets', 'polynomials', 'matrices', 'physics']
+
+if __name__=='__main__':
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
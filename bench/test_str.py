@@ -1,5 +1,6 @@
 
 from sympycore import Symbol, Number
+from sympycore.printing import tostr
 x,y,z = map(Symbol,'xyz')
 e1 = ((x+2*y+3*z)**50).expand()
 e2 = ((x+2*y+3*z)**2).expand()
@@ -17,6 +18,25 @@ def test_short():
         n -= 1
         str(e2)
 
+def test_tostr_long():
+    """tostr(e), e = expand((x+2*y+3*z)**50)"""
+    tostr(e1)
+
+def test_tostr_long_unordered():
+    """tostr(e, order=False), e = expand((x+2*y+3*z)**50)"""
+    tostr(e1, order=False)
+
+def test_tostr_long_maxlen():
+    """tostr(e, maxlen=80), e = expand((x+2*y+3*z)**50)"""
+    tostr(e1, maxlen=80)
+
+def test_tostr_short():
+    """tostr(e), e = expand((x+2*y+3*z)**2), 221x"""
+    n = 221
+    while n:
+        n -= 1
+        tostr(e2)
+
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_long, test_short])
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
@@ -8,5 +8,5 @@ def test():
     e.subs(x,z).subs(y,z)
 
 if __name__=='__main__':
-    from func_timeit import Timer
-    Timer(test).smart_timeit()
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
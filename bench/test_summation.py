@@ -67,10 +67,5 @@ def test_inplace_sum4():
         n -= 1
 
 if __name__=='__main__':
-    from func_timeit import run_tests
-    run_tests([test_sum, test_inplace_sum,
-               test_sum40, test_inplace_sum40,
-               test_sum4, test_inplace_sum4,
-               test_negsum
-               ])
-
+    from runner import main
+    raise SystemExit(main(modules=[__file__]))
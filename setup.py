@@ -121,15 +121,15 @@ class build_py(_build_py):
             revision = self._get_svn_revision(src_dir)
             if revision is not None:
                 target = os.path.join(src_dir, '__svn_version__.py')
-                print 'Creating ', target
+                print('Creating %s' % (target))
                 f = open(target,'w')
                 f.write('version = %r\n' % (str(revision)))
                 f.close()
                 import atexit
                 def rm_file(f=target):
-                    try: os.remove(f); print 'Removed ',f
+                    try: os.remove(f); print('Removed %s' % (f))
                     except OSError: pass
-                    try: os.remove(f+'c'); print 'Removed ',f+'c'
+                    try: os.remove(f+'c'); print('Removed %s' % (f+'c'))
                     except OSError: pass
                 atexit.register(rm_file)
                 files.append(target)
@@ -39,6 +39,16 @@ static char Expr_doc[] = \
   "\n"									\
   "  <Expr>.is_writable -> True or False\n"				\
   "\n"									\
+  "Concurrency: in-place operations (``+=``, ``*=``) modify the data of\n"\
+  "a writable left operand without checking which threads can see it.\n"\
+  "Sharing a writable expression between threads is the responsibility\n"\
+  "of the caller: compute its hash value, ``hash(<Expr>)``, before the\n"\
+  "expression is shared, then in-place operations work on copies. The\n"\
+  "shared tables of sympycore (head singletons, factorials, BDD nodes,\n"\
+  "the integral memo) are updated atomically or while holding a lock,\n"\
+  "so that independent expressions can be processed in concurrent\n"\
+  "threads.\n"\
+  "\n"\
   "There are two ways to access the parts of a Expr instance from\n"	\
   "Python::\n"								\
   "\n"									\
@@ -53,10 +63,33 @@ static char Expr_doc[] = \
 
 #include <Python.h>
 #include <assert.h>
+
+/*
+  Python 3 support. The code below is written against Python 2 C API,
+  the following definitions map it to Python 3 C API. Note that
+  Python 3 int objects are PyLong objects, hence PyInt_Check is always
+  false and code paths for PyLong objects are used instead.
+ */
+#if PY_MAJOR_VERSION >= 3
+#define IS_PY3K
+#define PyInt_Check(op) 0
+#define PyInt_CheckExact(op) 0
+#define PyInt_AS_LONG PyLong_AsLong
+#define PyInt_FromLong PyLong_FromLong
+#define PyString_FromString PyUnicode_FromString
+#define PyString_FromFormat PyUnicode_FromFormat
+#define PyString_AsString PyUnicode_AsUTF8
+typedef Py_hash_t expr_hash_t;
+#define HASH_FMT "n"
+#else
+typedef long expr_hash_t;
+#define HASH_FMT "l"
+#endif
+
 typedef struct {
   PyObject_HEAD
   PyObject *pair;
-  long hash;
+  expr_hash_t hash;
 } Expr;
 
 static PyTypeObject ExprType;
@@ -90,9 +123,9 @@ static PyObject* str_to_lowlevel;
 static PyObject* algebra_base_exp_dict_get_coefficient(PyTypeObject* Algebra, PyObject* d);
 
 #define Expr_Check(op) PyObject_TypeCheck(op, &ExprType)
-#define Expr_CheckExact(op) ((op)->ob_type == &ExprType)
+#define Expr_CheckExact(op) (Py_TYPE(op) == &ExprType)
 #define Pair_Check(op) PyObject_TypeCheck(op, &PairType)
-#define Pair_CheckExact(op) ((op)->ob_type == &PairType)
+#define Pair_CheckExact(op) (Py_TYPE(op) == &PairType)
 
 #define EXPR_GET_HEAD(OBJ) PyTuple_GET_ITEM(((Expr*)OBJ)->pair, 0)
 #define EXPR_GET_DATA(OBJ) PyTuple_GET_ITEM(((Expr*)OBJ)->pair, 1)
@@ -269,7 +302,7 @@ static void
 Expr_dealloc(Expr* self)
 {
   Expr_clear(self);
-  self->ob_type->tp_free((PyObject*)self);
+  Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
 static PyObject *
@@ -354,10 +387,45 @@ Pair_new(PyTypeObject *type, PyObject *args, PyObject *kws)
   return (PyObject *)self;
 }
 
-static long dict_hash(PyObject *d);
-static long list_hash(PyObject *d);
+static expr_hash_t dict_hash(PyObject *d);
+static expr_hash_t list_hash(PyObject *d);
 
-static long
+#ifdef IS_PY3K
+/*
+  Python 3 uses different hash algorithms for tuples and frozensets
+  than Python 2, so the hash is computed from the corresponding
+  objects to ensure that it is equal to the hash of pure Python Expr.
+ */
+static expr_hash_t
+tuple2_hash(PyObject *item0, PyObject *item1) {
+  PyObject *obj = NULL;
+  PyObject *items = NULL;
+  PyObject *tuple = NULL;
+  expr_hash_t h;
+  if (PyDict_Check(item1)) {
+    items = PyDict_Items(item1);
+    if (items==NULL)
+      return -1;
+    obj = PyFrozenSet_New(items);
+    Py_DECREF(items);
+  } else if (PyList_Check(item1)) {
+    obj = PyList_AsTuple(item1);
+  } else {
+    Py_INCREF(item1);
+    obj = item1;
+  }
+  if (obj==NULL)
+    return -1;
+  tuple = PyTuple_Pack(2, item0, obj);
+  Py_DECREF(obj);
+  if (tuple==NULL)
+    return -1;
+  h = PyObject_Hash(tuple);
+  Py_DECREF(tuple);
+  return h;
+}
+#else
+static expr_hash_t
 tuple2_hash(PyObject *item0, PyObject *item1) {
   register long hash, h;
   long mult = 1000003L;
@@ -381,13 +449,14 @@ tuple2_hash(PyObject *item0, PyObject *item1) {
     hash = -2;
   return hash;
 }
+#endif
 
 /*
   hash(dict) == hash(frozenset(dict.items()))
 
   Code copied from Pyhton-2.5.1/Objects/setobject.c.
  */
-static long
+static expr_hash_t
 dict_hash(PyObject *d) {
   Py_ssize_t i;
   PyObject *key, *value;
@@ -411,12 +480,12 @@ dict_hash(PyObject *d) {
 
   Code copied from Pyhton-2.5.1/Objects/tupleobject.c
 */
-static long
+static expr_hash_t
 list_hash(PyObject *o)
 {
   PyListObject *v = (PyListObject *)o;
   register long x, y;
-  register Py_ssize_t len = v->ob_size;
+  register Py_ssize_t len = Py_SIZE(v);
   register PyObject **p;
   long mult = 1000003L;
   x = 0x345678L;
@@ -445,7 +514,7 @@ list_hash(PyObject *o)
   else:
       hash(expr) := hash(expr.as_lowlevel())
  */
-static long
+static expr_hash_t
 Expr_hash(PyObject *self)
 {
   Expr *o = (Expr *)self;
@@ -466,8 +535,8 @@ Expr_hash(PyObject *self)
 static PyObject *
 Expr_sethash(Expr *self, PyObject *args)
 {
-  long h = -1;
-  if (PyArg_ParseTuple(args, "l", &h)==-1)
+  expr_hash_t h = -1;
+  if (!PyArg_ParseTuple(args, HASH_FMT, &h))
     return NULL;
   self->hash = h;
   Py_INCREF(Py_None);
@@ -514,10 +583,14 @@ Expr_getpair(Expr *self, void *closure)
 static PyObject *
 Expr_repr(Expr *self)
 {
+#ifdef IS_PY3K
+  return PyUnicode_FromFormat("%s%R", Py_TYPE(self)->tp_name, self->pair);
+#else
   return PyString_Format(PyString_FromString("%s%r"),
 			 PyTuple_Pack(2,
-				      PyString_FromString(self->ob_type->tp_name), 
+				      PyString_FromString(Py_TYPE(self)->tp_name), 
 				      self->pair));
+#endif
 }
 
 /* Pickle support */
@@ -531,8 +604,8 @@ Expr_reduce(Expr *self)
   PyObject *mod = NULL;
   PyObject *ret = NULL;
   PyObject *obj = NULL;
-  PyObject *cls = (PyObject *)self->ob_type;
-  PyObject *typ = (PyObject *)cls->ob_type;
+  PyObject *cls = (PyObject *)Py_TYPE(self);
+  PyObject *typ = (PyObject *)Py_TYPE(cls);
   PyObject *args = NULL;
 
   /* __reduce__ will return a tuple consisting of the following items:
@@ -563,7 +636,7 @@ Expr_reduce(Expr *self)
   switch (version) {
   case 1:
     PyTuple_SET_ITEM(ret, 1,
-		     Py_BuildValue("l(OOl)",
+		     Py_BuildValue("l(OO" HASH_FMT ")",
 				   version,
 				   cls,
 				   self->pair,
@@ -575,14 +648,14 @@ Expr_reduce(Expr *self)
     if (args==NULL) {
       PyErr_Clear();
       PyTuple_SET_ITEM(ret, 1,
-		       Py_BuildValue("l(OOl)",
+		       Py_BuildValue("l(OO" HASH_FMT ")",
 				     version,
 				     cls,
 				     self->pair,
 				     self->hash));
     } else {
       PyTuple_SET_ITEM(ret, 1,
-		       Py_BuildValue("l((ON)Ol)",
+		       Py_BuildValue("l((ON)O" HASH_FMT ")",
 				     version,
 				     typ, args,
 				     self->pair,
@@ -726,7 +799,7 @@ Expr_as_lowlevel(Expr *self)
 	}
     }
   else 
-    return PyObject_CallMethodObjArgs(head, str_to_lowlevel, self->ob_type, data, self->pair, NULL);
+    return PyObject_CallMethodObjArgs(head, str_to_lowlevel, Py_TYPE(self), data, self->pair, NULL);
   Py_INCREF(self->pair);
   return self->pair;
 }
@@ -769,7 +842,7 @@ Expr_nonzero2(Expr *self) {
  */
 static int
 check_comparable_types(PyObject *v, PyObject *w) {
-  if (v->ob_type == w->ob_type)// || Expr_Check(v) || Expr_Check(w))
+  if (Py_TYPE(v) == Py_TYPE(w))// || Expr_Check(v) || Expr_Check(w))
     return 1;
   else if (PyInt_CheckExact(v))
     return (PyLong_CheckExact(w) || PyFloat_CheckExact(w) || PyComplex_CheckExact(w));
@@ -830,7 +903,7 @@ Expr_richcompare(PyObject *v, PyObject *w, int op)
     { 
       PyObject* vh = PyTuple_GET_ITEM(ve->pair, 0);
       PyObject* vd = PyTuple_GET_ITEM(ve->pair, 1);
-      if (v->ob_type == w->ob_type)
+      if (Py_TYPE(v) == Py_TYPE(w))
 	{
 	  PyObject* wh = PyTuple_GET_ITEM(we->pair, 0);
 	  PyObject* wd = PyTuple_GET_ITEM(we->pair, 1);
@@ -932,14 +1005,14 @@ Expr_term_coeff(Expr *self)
     return PyTuple_Pack(2, self, data);
   if (head==BASE_EXP_DICT)
     {
-      PyObject *coeff = algebra_base_exp_dict_get_coefficient(self->ob_type, data);
+      PyObject *coeff = algebra_base_exp_dict_get_coefficient(Py_TYPE(self), data);
       if (coeff != Py_None)
 	{
 	  PyObject *new_data = PyDict_Copy(data);
 	  PyObject *new_expr = NULL;
 	  if (new_data==NULL) return NULL;
 	  if (PyDict_DelItem(new_data, coeff)==-1) return NULL;
-	  new_expr = Expr_new_from_data(self->ob_type, BASE_EXP_DICT, new_data);
+	  new_expr = Expr_new_from_data(Py_TYPE(self), BASE_EXP_DICT, new_data);
 	  Py_DECREF(new_data);
 	  if (new_expr==NULL) return NULL;
 	  Py_INCREF(coeff);
@@ -1349,13 +1422,13 @@ Pair_richcompare(PyObject *v, PyObject *w, int op)
 static Py_ssize_t
 Pairlength(Expr *self)
 {
-  return ((PyTupleObject*)(self->pair))->ob_size;
+  return Py_SIZE(self->pair);
 }
 
 static PyObject *
 Pairitem(register Expr *self, register Py_ssize_t i)
 {
-  if (i < 0 || i >= ((PyTupleObject*)(self->pair))->ob_size) {
+  if (i < 0 || i >= Py_SIZE(self->pair)) {
     PyErr_SetString(PyExc_IndexError, "Pair index out of range");
     return NULL;
   }
@@ -1517,6 +1590,142 @@ PyObject* algebra_base_exp_dict_new(PyTypeObject* Algebra, PyObject* data)
   return Expr_new_from_head_data(Algebra, BASE_EXP_DICT, data);
 }
 
+/* Add base**exp to d. The factors of a product base are added
+   separately when exp is an integer so that d stays canonical. */
+static int algebra_base_exp_dict_add_power(PyTypeObject* Algebra, PyObject* d, PyObject* base, PyObject* exp)
+{
+  PyObject *b = NULL;
+  PyObject *e = NULL;
+  PyObject *tmp = NULL;
+  Py_ssize_t pos = 0;
+  int fail;
+  if (EXPR_GET_HEAD(base)!=BASE_EXP_DICT || !OBJ_IS_INTEGER(exp))
+    return algebra_base_exp_dict_add_item(Algebra, d, base, exp);
+  while (PyDict_Next(EXPR_GET_DATA(base), &pos, &b, &e))
+    {
+      e = PyNumber_Multiply(e, exp);
+      if (e==NULL)
+	return -1;
+      if (EXPR_IS_NUMBER(b) && OBJ_IS_INTEGER(e))
+	{
+	  tmp = PyNumber_Power(b, e, Py_None);
+	  Py_DECREF(e);
+	  if (tmp==NULL)
+	    return -1;
+	  fail = algebra_base_exp_dict_add_item(Algebra, d, tmp, one);
+	  Py_DECREF(tmp);
+	}
+      else
+	{
+	  fail = algebra_base_exp_dict_add_item(Algebra, d, b, e);
+	  Py_DECREF(e);
+	}
+      if (fail==-1)
+	return -1;
+    }
+  return 0;
+}
+
+int algebra_term_coeff_dict_add_multinomial(PyTypeObject* Algebra, PyObject* d, PyObject* term_coeff_list, PyObject* mdata)
+{
+  PyObject *e = NULL;
+  PyObject *c = NULL;
+  Py_ssize_t pos = 0;
+  Py_ssize_t i, n;
+  PyObject *df = NULL;
+  PyObject *new_coeff = NULL;
+  PyObject *new_term = NULL;
+  PyObject *item = NULL;
+  PyObject *base = NULL;
+  PyObject *exp = NULL;
+  PyObject *coeff = NULL;
+  PyObject *e_i = NULL;
+  PyObject *tmp = NULL;
+  PyObject *tmp2 = NULL;
+  long k;
+  int fail;
+  if (!PyList_Check(term_coeff_list) || !PyDict_Check(mdata))
+    {
+      PyErr_SetString(PyExc_TypeError, "term_coeff_dict_add_multinomial expects list and dict arguments");
+      return -1;
+    }
+  n = PyList_GET_SIZE(term_coeff_list);
+  while (PyDict_Next(mdata, &pos, &e, &c))
+    {
+      if (!PyTuple_Check(e) || PyTuple_GET_SIZE(e)!=n)
+	{
+	  PyErr_SetString(PyExc_ValueError, "term_coeff_dict_add_multinomial: exponent tuple size mismatch");
+	  return -1;
+	}
+      df = PyDict_New();
+      if (df==NULL)
+	return -1;
+      Py_INCREF(c);
+      new_coeff = c;
+      for (i=0; i<n; ++i)
+	{
+	  e_i = PyTuple_GET_ITEM(e, i);
+	  k = (PyInt_CheckExact(e_i) ? PyInt_AS_LONG(e_i) : PyObject_IsTrue(e_i));
+	  if (!k)
+	    continue;
+	  item = PyList_GET_ITEM(term_coeff_list, i);
+	  base = PyTuple_GET_ITEM(PyTuple_GET_ITEM(item, 0), 0);
+	  exp = PyTuple_GET_ITEM(PyTuple_GET_ITEM(item, 0), 1);
+	  coeff = PyTuple_GET_ITEM(item, 1);
+	  if (k==1 && PyInt_CheckExact(e_i))
+	    {
+	      if (algebra_base_exp_dict_add_power(Algebra, df, base, exp)==-1)
+		goto fail;
+	      if (coeff != one)
+		{
+		  tmp = PyNumber_Multiply(new_coeff, coeff);
+		  if (tmp==NULL)
+		    goto fail;
+		  Py_DECREF(new_coeff);
+		  new_coeff = tmp;
+		}
+	    }
+	  else
+	    {
+	      tmp = PyNumber_Multiply(exp, e_i);
+	      if (tmp==NULL)
+		goto fail;
+	      fail = algebra_base_exp_dict_add_power(Algebra, df, base, tmp);
+	      Py_DECREF(tmp);
+	      if (fail==-1)
+		goto fail;
+	      if (coeff != one)
+		{
+		  tmp2 = PyNumber_Power(coeff, e_i, Py_None);
+		  if (tmp2==NULL)
+		    goto fail;
+		  tmp = PyNumber_Multiply(new_coeff, tmp2);
+		  Py_DECREF(tmp2);
+		  if (tmp==NULL)
+		    goto fail;
+		  Py_DECREF(new_coeff);
+		  new_coeff = tmp;
+		}
+	    }
+	}
+      new_term = algebra_base_exp_dict_new(Algebra, df);
+      Py_DECREF(df);
+      df = NULL;
+      if (new_term==NULL)
+	goto fail;
+      fail = algebra_term_coeff_dict_add_item(Algebra, d, new_term, new_coeff);
+      Py_DECREF(new_term);
+      Py_DECREF(new_coeff);
+      if (fail==-1)
+	return -1;
+    }
+  return 0;
+ fail:
+  Py_XDECREF(df);
+  Py_DECREF(new_coeff);
+  return -1;
+}
+
 PyObject* algebra_add_new(PyTypeObject* Algebra, PyObject* data)
 {
   PyObject* obj = NULL;
@@ -1583,6 +1792,7 @@ ALGEBRA_DICT_PROC_WRAPPER_4(algebra_base_exp_dict_sub_item, "base_exp_dict_sub_i
 ALGEBRA_DICT_PROC_WRAPPER_3(algebra_base_exp_dict_add_dict, "base_exp_dict_add_dict");
 ALGEBRA_DICT_PROC_WRAPPER_3(algebra_base_exp_dict_sub_dict, "base_exp_dict_sub_dict");
 ALGEBRA_DICT_PROC_WRAPPER_3(algebra_term_coeff_dict_add_dict, "term_coeff_dict_add_dict");
+ALGEBRA_DICT_PROC_WRAPPER_4(algebra_term_coeff_dict_add_multinomial, "term_coeff_dict_add_multinomial");
 
 ALGEBRA_DICT_PROC_WRAPPER_4(algebra_dict_add_item, "dict_add_item");
 ALGEBRA_DICT_PROC_WRAPPER_4(algebra_dict_subtract_item, "dict_sub_item");
@@ -1612,6 +1822,9 @@ static PyMethodDef Expr_methods[] = {
   {"as_lowlevel", (PyCFunction)Expr_as_lowlevel, METH_VARARGS, NULL},
   {"__reduce__", (PyCFunction)Expr_reduce, METH_VARARGS, NULL},
   {"__nonzero__", (PyCFunction)Expr_nonzero, METH_VARARGS, NULL},
+#ifdef IS_PY3K
+  {"__bool__", (PyCFunction)Expr_nonzero, METH_VARARGS, NULL},
+#endif
   {"__nonzero2__", (PyCFunction)Expr_nonzero2, METH_VARARGS, NULL},
   {"_sethash", (PyCFunction)Expr_sethash, METH_VARARGS, NULL},
   {"term_coeff", (PyCFunction)Expr_term_coeff, METH_VARARGS, NULL},
@@ -1620,8 +1833,7 @@ static PyMethodDef Expr_methods[] = {
 };
 
 static PyTypeObject ExprType = {
-  PyObject_HEAD_INIT(NULL)
-  0,                         /*ob_size*/
+  PyVarObject_HEAD_INIT(NULL, 0)
   "Expr",                    /*tp_name*/
   sizeof(Expr),              /*tp_basicsize*/
   0,                         /*tp_itemsize*/
@@ -1674,8 +1886,7 @@ static PySequenceMethods Pair_as_sequence = {
 
 
 static PyTypeObject PairType = {
-  PyObject_HEAD_INIT(NULL)
-  0,                         /*ob_size*/
+  PyVarObject_HEAD_INIT(NULL, 0)
   "Pair",                    /*tp_name*/
   sizeof(Expr),              /*tp_basicsize*/
   0,                         /*tp_itemsize*/
@@ -1786,14 +1997,31 @@ static PyMethodDef module_methods[] = {
    "term_coeff_dict_mul_dict(Algebra, dict, dict1, dict2) - multiply dict1 and dict2 items and add them to dict"},
   {"term_coeff_dict_add_dict",  func_algebra_term_coeff_dict_add_dict, METH_VARARGS,
    "term_coeff_dict_add_dict(Algebra, dict1, dict2) - add dict2 items to dict1"},
+  {"term_coeff_dict_add_multinomial",  func_algebra_term_coeff_dict_add_multinomial, METH_VARARGS,
+   "term_coeff_dict_add_multinomial(Algebra, dict, term_coeff_list, mdata) - add terms of multinomial expansion to dict"},
   {NULL}  /* Sentinel */
 };
 
 #ifndef PyMODINIT_FUNC	/* declarations for DLL import/export */
 #define PyMODINIT_FUNC void
 #endif
+#ifdef IS_PY3K
+#define INITERROR return NULL
+static struct PyModuleDef moduledef = {
+  PyModuleDef_HEAD_INIT,
+  "expr_ext",                          /* m_name */
+  "Provides extension type Expr.",     /* m_doc */
+  -1,                                  /* m_size */
+  module_methods,                      /* m_methods */
+};
+
+PyMODINIT_FUNC
+PyInit_expr_ext(void)
+#else
+#define INITERROR return
 PyMODINIT_FUNC
 initexpr_ext(void) 
+#endif
 {
   PyObject* m = NULL;
   NUMBER = SYMBOL = SPECIAL = ADD = MUL = POW = TERM_COEFF_DICT =
@@ -1801,40 +2029,46 @@ initexpr_ext(void)
   py_try_power = py_numbertypes = NULL;
   
   if (PyType_Ready(&ExprType) < 0)
-    return;
+    INITERROR;
 
   PairType.tp_base = &ExprType;
   if (PyType_Ready(&PairType) < 0)
-    return;
+    INITERROR;
 
   zero = PyInt_FromLong(0);
-  if (zero==NULL) return;
+  if (zero==NULL) INITERROR;
   one = PyInt_FromLong(1);
-  if (one==NULL) return;
+  if (one==NULL) INITERROR;
 
   str_new = PyString_FromString("new");
   if (str_new==NULL)
-    return;
+    INITERROR;
   str_convert = PyString_FromString("convert");
   if (str_convert==NULL)
-    return;
+    INITERROR;
   str_handle_numeric_item = PyString_FromString("handle_numeric_item");
   if (str_handle_numeric_item==NULL)
-    return;
+    INITERROR;
   str_getinitargs = PyString_FromString("__getinitargs__");
   if (str_getinitargs==NULL)
-    return;
+    INITERROR;
   str_to_lowlevel = PyString_FromString("to_lowlevel");
   if (str_to_lowlevel==NULL)
-    return;
+    INITERROR;
+#ifdef IS_PY3K
+  m = PyModule_Create(&moduledef);
+#else
   m = Py_InitModule3("expr_ext", module_methods, "Provides extension type Expr.");
-  
+#endif
   if (m == NULL)
-    return;
+    INITERROR;
 
   Py_INCREF(&ExprType);
   PyModule_AddObject(m, "Expr", (PyObject *)&ExprType);
 
   Py_INCREF(&PairType);
   PyModule_AddObject(m, "Pair", (PyObject *)&PairType);
+#ifdef IS_PY3K
+  return m;
+#endif
 }
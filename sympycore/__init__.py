@@ -7,6 +7,9 @@ __date__ = '2008'
 __author__ = 'Pearu Peterson, Fredrik Johansson'
 __license__ = 'New BSD License'
 
+import sys as _sys
+import types as _types
+
 from .version import version as __version__
 
 from .core import classes, defined_functions, DefinedFunction, Expr, Pair, IntegerList
@@ -23,13 +26,27 @@ from ring import *
 from basealgebra import *
 from algebras import *
 from logic import *
-from sets import *
 from calculus import *
-from polynomials import *
-from matrices import *
-from physics import *
 from functions import *
 
+# The following subpackages and modules are imported on first access
+# to their names, see _LazyModule below:
+_lazy_names = {'sets': ['Set', 'Integers'],
+               'polynomials': ['PolynomialRing', 'UnivariatePolynomial', 'poly'],
+               'matrices': ['Matrix', 'MatrixBase', 'Polyhedron', 'concatenate', 'eye', 'jacobian', 'hessian'],
+               'physics': ['Unit', 'meter', 'second', 'kilogram', 'Dimension', 'Quantity'],
+               'calculus.cancel': ['cancel'],
+               'calculus.autodiff': ['gradient_function', 'gradient_source'],
+               'calculus.series': ['PowerSeries', 'power_series'],
+               'calculus.identity': ['is_zero'],
+               }
+
+# Names of modules that are not exported by ``from sympycore import *``:
+_excluded_names = ['autodiff', 'bdd', 'identity', 'monomials', 'ruleset', 'series']
+classes.set_lazy('Set', 'sympycore.sets')
+classes.set_lazy('PolynomialRing', 'sympycore.polynomials')
+classes.set_lazy('Unit', 'sympycore.physics')
+
 CollectingField = CommutativeRing
 
 ### Initialize sympycore subpackage namespaces
@@ -117,9 +134,9 @@ class _Tester:
 
     def check_testing(self):
         import os, sys
-        try:
-            import nose
-        except ImportError:
+        nose = sys.modules.get('nose')
+        if nose is None:
+            # not running under nose, importing nose is expensive
             return
         if sys.platform=='win32':
             m = lambda s: s.lower()
@@ -182,3 +199,34 @@ class _Tester:
 test = _Tester().test
 del _Tester
 
+class _LazyModule(_types.ModuleType):
+    """ Module type of sympycore that imports subpackages listed in
+    _lazy_names when their names are accessed for the first time.
+    """
+
+    def __getattr__(self, name):
+        # called only when name is not in module namespace
+        if name=='__all__':
+            # from sympycore import *
+            for subpackage in _lazy_names:
+                self._import_lazy(subpackage)
+            return [n for n in self.__dict__ if not (n.startswith('_') or n in _excluded_names)]
+        for subpackage, names in _lazy_names.iteritems():
+            if name==subpackage or name in names:
+                self._import_lazy(subpackage)
+                if name in self.__dict__:
+                    return self.__dict__[name]
+        raise AttributeError('module %r has no attribute %r' % (self.__name__, name))
+
+    def _import_lazy(self, subpackage):
+        module = __import__('%s.%s' % (self.__name__, subpackage), fromlist=['*'])
+        init_module.execute()
+        for name in _lazy_names[subpackage]:
+            self.__dict__.setdefault(name, getattr(module, name))
+
+_module = _LazyModule(__name__, __doc__)
+_module.__dict__.update(globals())
+# the functions defined above use the namespace of the original module
+_module._original_module = _sys.modules[__name__]
+_sys.modules[__name__] = _module
+
@@ -0,0 +1,223 @@
+"""Provides packing of exponent vectors into integers.
+
+A monomial ``x_0**e_0 * ... * x_{n-1}**e_{n-1}`` with exponents in
+``[0, 2**(bits-1))`` is packed into the integer ``sum(e_i <<
+bits*(n-1-i))`` where bits is 8, 16 or 32. Multiplication of packed monomials is one integer
+addition, and integer comparison orders monomials
+lexicographically. The highest bit of each field is a guard bit
+that detects borrows in subtraction, so divisibility of monomials is
+tested with one subtraction and one mask operation.
+
+The field width is chosen from the exponent bounds of an operation
+so that its results cannot overflow, negative exponents are handled
+by offsetting the exponents by their minimum values.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['MonomialPacker', 'mul_exp_coeff_dicts', 'pow_exp_coeff_dict', 'mul_packed_items',
+           'pow_packed_items']
+
+import sys
+from array import array
+from binascii import hexlify, unhexlify
+
+from ..core import IntegerList
+from ..heads import INTEGER_LIST
+
+# Field widths are whole bytes so that packing and unpacking run in
+# array and binascii code, big-endian order makes integer comparison
+# lexicographic:
+typecodes = {}
+for _t in 'BHIL':
+    typecodes.setdefault(array(_t).itemsize * 8, _t)
+swap_bytes = sys.byteorder=='little'
+
+# Minimal number of term products for which packing pays off:
+PACKED_MUL_THRESHOLD = 64
+
+def exponents_data(exps):
+    """ Return exponents as a list or tuple of integers.
+    """
+    t = type(exps)
+    if t is IntegerList:
+        return exps.data
+    if t is int or t is long:
+        return exps,
+    return exps
+
+def exponent_bounds(exps_seq, nvars):
+    """ Return lists of minimal and maximal exponents.
+    """
+    lo = hi = None
+    for exps in exps_seq:
+        exps = exponents_data(exps)
+        if lo is None:
+            lo = list(exps)
+            hi = list(exps)
+            continue
+        for i, e in enumerate(exps):
+            if e < lo[i]:
+                lo[i] = e
+            elif e > hi[i]:
+                hi[i] = e
+    if lo is None:
+        return [0]*nvars, [0]*nvars
+    return lo, hi
+
+class MonomialPacker(object):
+    """ Packs exponent vectors of nvars integers into integers with
+    fields of the given number of bits, exponents are stored relative
+    to offsets.
+    """
+
+    def __init__(self, nvars, bits, offsets=None):
+        if bits not in typecodes:
+            raise ValueError('bits must be one of %s but got %r' % (sorted(typecodes), bits))
+        self.nvars = nvars
+        self.bits = bits
+        self.typecode = typecodes[bits]
+        self.mask = (1 << bits) - 1
+        self.width = nvars * bits // 4
+        guard = 0
+        for i in xrange(nvars):
+            guard = (guard << bits) | (1 << (bits - 1))
+        self.guard = guard
+        if offsets is None or not any(offsets):
+            self.offsets = None
+        else:
+            self.offsets = list(offsets)
+
+    @classmethod
+    def for_ranges(cls, ranges, offsets=None):
+        """ Return a packer for exponents ``offsets[i] + e_i`` where
+        ``0 <= e_i <= ranges[i]``.
+        """
+        bits = max([0] + [r.bit_length() for r in ranges]) + 1
+        for b in sorted(typecodes):
+            if bits <= b:
+                return cls(len(ranges), b, offsets)
+        raise OverflowError('exponent range %s is too large for packing' % (max(ranges)))
+
+    def __repr__(self):
+        return '%s(%s, %s, %s)' % (type(self).__name__, self.nvars, self.bits, self.offsets)
+
+    def pack(self, exps):
+        exps = exponents_data(exps)
+        if self.offsets is not None:
+            exps = [e - o for e, o in zip(exps, self.offsets)]
+        if not self.nvars:
+            return 0
+        try:
+            a = array(self.typecode, exps)
+        except OverflowError:
+            a = None
+        if a is None or max(a) >> (self.bits - 1):
+            raise OverflowError('exponents %s do not fit to %s bits' % (list(exps), self.bits))
+        if swap_bytes and self.bits > 8:
+            a.byteswap()
+        return int(hexlify(a.tostring()), 16)
+
+    def unpack(self, m):
+        """ Return exponents of a packed monomial as a list.
+        """
+        if not self.nvars:
+            return []
+        a = array(self.typecode, unhexlify('%0*x' % (self.width, m)))
+        if swap_bytes and self.bits > 8:
+            a.byteswap()
+        if self.offsets is None:
+            return a.tolist()
+        return [e + o for e, o in zip(a, self.offsets)]
+
+    def unpack_key(self, m):
+        return IntegerList(INTEGER_LIST, self.unpack(m))
+
+    def divides(self, m1, m2):
+        """ Check if packed monomial m1 divides m2.
+        """
+        d = m2 - m1
+        return d >= 0 and not (d & self.guard)
+
+    def is_overflow(self, m):
+        """ Check if a sum of packed monomials overflowed to guard bits.
+        """
+        return bool(m & self.guard)
+
+def integer_list_items(d):
+    """ Return items of a dictionary with IntegerList keys, used when
+    exponents are too large for packing.
+    """
+    return [(IntegerList(INTEGER_LIST, list(exponents_data(exps))), coeff) for exps, coeff in d.iteritems()]
+
+def mul_packed_items(items1, items2):
+    """ Return the product of lists of ``(packed monomial,
+    coefficient)`` pairs as a dictionary.
+    """
+    d = {}
+    d_get = d.get
+    for m1, coeff1 in items1:
+        for m2, coeff2 in items2:
+            m = m1 + m2
+            c = coeff1 * coeff2
+            b = d_get(m)
+            if b is None:
+                d[m] = c
+            else:
+                c = b + c
+                if c:
+                    d[m] = c
+                else:
+                    del d[m]
+    return d
+
+def mul_exp_coeff_dicts(dict1, dict2, nvars):
+    """ Return the product of dictionaries of ``{exponents:
+    coefficient}`` pairs with IntegerList keys.
+    """
+    lo1, hi1 = exponent_bounds(dict1, nvars)
+    lo2, hi2 = exponent_bounds(dict2, nvars)
+    offsets = [a + b for a, b in zip(lo1, lo2)]
+    ranges = [h1 - l1 + h2 - l2 for l1, h1, l2, h2 in zip(lo1, hi1, lo2, hi2)]
+    try:
+        packer = MonomialPacker.for_ranges(ranges, offsets)
+    except OverflowError:
+        return mul_packed_items(integer_list_items(dict1), integer_list_items(dict2))
+    pack1 = MonomialPacker(nvars, packer.bits, lo1).pack
+    pack2 = MonomialPacker(nvars, packer.bits, lo2).pack
+    d = mul_packed_items([(pack1(exps), coeff) for exps, coeff in dict1.iteritems()],
+                         [(pack2(exps), coeff) for exps, coeff in dict2.iteritems()])
+    unpack_key = packer.unpack_key
+    return dict([(unpack_key(m), c) for m, c in d.iteritems()])
+
+def pow_exp_coeff_dict(dict1, exp, nvars):
+    """ Return the exp-th power of a dictionary of ``{exponents:
+    coefficient}`` pairs with IntegerList keys, exp is positive
+    integer. Uses repeated squaring of packed monomials.
+    """
+    lo, hi = exponent_bounds(dict1, nvars)
+    try:
+        packer = MonomialPacker.for_ranges([exp * (h - l) for l, h in zip(lo, hi)],
+                                           [exp * l for l in lo])
+    except OverflowError:
+        return dict(pow_packed_items(integer_list_items(dict1), exp))
+    pack = MonomialPacker(nvars, packer.bits, lo).pack
+    items = [(pack(exps), coeff) for exps, coeff in dict1.iteritems()]
+    unpack_key = packer.unpack_key
+    return dict([(unpack_key(m), c) for m, c in pow_packed_items(items, exp)])
+
+def pow_packed_items(items, exp):
+    """ Return the exp-th power of a list of ``(packed monomial,
+    coefficient)`` pairs as a list, exp is positive integer.
+    """
+    result = None
+    while 1:
+        if exp & 1:
+            if result is None:
+                result = items
+            else:
+                result = mul_packed_items(result, items).items()
+        exp >>= 1
+        if not exp:
+            break
+        items = mul_packed_items(items, items).items()
+    return result
@@ -1,6 +1,8 @@
 """Provides algorithms from number theory.
 """
 
+import threading
+
 from ..core import init_module
 
 init_module.import_lowlevel_operations()
@@ -14,19 +16,33 @@ __all__ = ['gcd', 'lcm', 'factorial',
 
 __docformat__ = "restructuredtext en"
 
-def factorial(n, memo=[1, 1]):
+# Factorials of integers below 100, the list is only extended while
+# holding the lock so that concurrent calls cannot interleave appends:
+_factorials = [1, 1]
+_factorials_lock = threading.Lock()
+
+def factorial(n):
     """Return n factorial (for integers n >= 0 only)."""
     if n < 0:
         raise ValueError("expected non-negative integer, got %r" % (n)) #pragma NO COVER
-    k = len(memo)
+    memo = _factorials
+    k = start = len(memo)
     if n < k:
         return memo[n]
-    p = memo[-1]
+    p = memo[k-1]
+    new = []
     while k <= n:
         p *= k
         k += 1
         if k < 100:
-            memo.append(p)
+            new.append(p)
+    if new:
+        _factorials_lock.acquire()
+        try:
+            if len(memo)==start:
+                memo.extend(new)
+        finally:
+            _factorials_lock.release()
     return p
 
 def gcd(*args):
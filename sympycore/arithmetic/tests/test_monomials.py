@@ -0,0 +1,34 @@
+from sympycore.core import IntegerList
+from sympycore.arithmetic.monomials import *
+
+def test_packer():
+    p = MonomialPacker(3, 8)
+    m = p.pack([1, 2, 0])
+    assert m == (1 << 16) + (2 << 8)
+    assert p.unpack(m) == [1, 2, 0]
+    assert p.divides(m, p.pack([1, 3, 2]))
+    assert not p.divides(p.pack([1, 3, 2]), m)
+    assert not p.divides(p.pack([0, 0, 1]), p.pack([1, 0, 0]))
+    assert p.pack([0, 0, 1]) < p.pack([0, 1, 0]) < p.pack([1, 0, 0])
+    assert p.is_overflow(p.pack([100, 0, 0]) + p.pack([100, 0, 0]))
+    try:
+        p.pack([128, 0, 0])
+    except OverflowError:
+        pass
+    else:
+        assert 0, 'expected OverflowError'
+    p = MonomialPacker.for_ranges([3, 200], [-1, 0])
+    assert p.bits == 16
+    assert p.unpack(p.pack([-1, 200])) == [-1, 200]
+
+def test_mul_pow():
+    L = IntegerList
+    d1 = {L([1, 0]): 1, L([0, 1]): 1, L([0, 0]): 1}
+    d2 = {L([1, 0]): 1, L([0, -1]): -1}
+    assert mul_exp_coeff_dicts(d1, d2, 2) == {L([2, 0]): 1, L([1, 1]): 1, L([1, 0]): 1,
+                                              L([1, -1]): -1, L([0, 0]): -1, L([0, -1]): -1}
+    assert pow_exp_coeff_dict(d1, 2, 2) == {L([2, 0]): 1, L([0, 2]): 1, L([0, 0]): 1,
+                                            L([1, 1]): 2, L([1, 0]): 2, L([0, 1]): 2}
+    d3 = {L([2**40, 0]): 2, L([0, 1]): 3}
+    assert pow_exp_coeff_dict(d3, 2, 2) == {L([2**41, 0]): 4, L([2**40, 1]): 12, L([0, 2]): 9}
+    assert mul_packed_items([(1, 2), (0, 1)], [(1, 1), (0, -1)]) == {2: 2, 1: -1, 0: -1}
@@ -5,6 +5,7 @@ __docformat__ = 'restructuredtext'
 from ..core import init_module
 from .algebra import Algebra, SymbolicEquality
 from .verbatim import Verbatim
+from .ruleset import RuleSet
 #from .pairs import CollectingField
 #from ..ring import CommutativeRing as CollectingField
 
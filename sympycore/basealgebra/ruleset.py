@@ -0,0 +1,398 @@
+""" Provides RuleSet class for matching an expression against many patterns.
+"""
+__docformat__ = "restructuredtext"
+__all__ = ['RuleSet']
+
+from ..core import Expr
+from ..heads import TERM_COEFF_DICT, BASE_EXP_DICT
+
+class _Node(object):
+    """ Node of a discrimination net.
+
+    Edges are labeled by tokens of pattern preorder traversal:
+
+    exact
+      maps subpatterns that contain no wildcards to child nodes, a
+      subexpression matches when it is equal to the subpattern.
+    struct
+      maps ``(head, arity)`` pairs to child nodes, the items of
+      subexpression data are matched by the following tokens.
+      Plain tuples in expression data use ``(tuple, arity)``.
+    wild
+      maps ``(wildcard, predicate, wildcards)`` triples to child
+      nodes.
+    commutative
+      maps heads to _CommutativeIndex instances, the subexpression
+      data dictionary is matched as a multiset.
+    """
+
+    __slots__ = ['exact', 'struct', 'wild', 'commutative', 'rules']
+
+    def __init__(self):
+        self.exact = {}
+        self.struct = {}
+        self.wild = {}
+        self.commutative = {}
+        self.rules = []
+
+def _has_wild(pattern, wilds):
+    if isinstance(pattern, Expr):
+        for s in pattern.symbols:
+            if s in wilds:
+                return True
+        return False
+    if isinstance(pattern, tuple):
+        for p in pattern:
+            if _has_wild(p, wilds):
+                return True
+    return False
+
+def _bind(wild, predicate, wildset, expr, bindings):
+    """ Return bindings extended with ``wild: expr`` or None when
+    wild cannot be bound to expr.
+    """
+    cls = type(wild)
+    if not isinstance(expr, cls):
+        expr = cls.convert(expr, False)
+        if expr is NotImplemented:
+            return
+    value = bindings.get(wild)
+    if value is not None:
+        if value==expr:
+            return bindings
+        return
+    if expr in wildset:
+        # wilds do not match other wilds
+        return
+    if wild in expr.symbols:
+        # wild does not match expressions containing the wild
+        return
+    if predicate is not True and not predicate(expr):
+        return
+    bindings = bindings.copy()
+    bindings[wild] = expr
+    return bindings
+
+def _match(pattern, expr, bindings, wilds, wildset):
+    """ Generate the extensions of bindings such that pattern matches
+    expr. wilds is a dictionary of wildcards and their predicates.
+    """
+    if not _has_wild(pattern, wilds):
+        if pattern==expr:
+            yield bindings
+        return
+    if isinstance(pattern, tuple):
+        if isinstance(expr, tuple) and len(expr)==len(pattern):
+            for b in _match_seq(pattern, expr, 0, bindings, wilds, wildset):
+                yield b
+        return
+    if pattern in wilds:
+        b = _bind(pattern, wilds[pattern], wildset, expr, bindings)
+        if b is not None:
+            yield b
+        return
+    if not isinstance(expr, Expr):
+        return
+    phead, pdata = pattern.pair
+    head, data = expr.pair
+    if phead is not head:
+        return
+    if isinstance(pdata, dict):
+        if isinstance(data, dict):
+            for b in _Commutative(pattern, wilds, wildset).match(expr, bindings):
+                yield b
+    elif isinstance(data, tuple) and len(data)==len(pdata):
+        for b in _match_seq(pdata, data, 0, bindings, wilds, wildset):
+            yield b
+
+def _match_seq(patterns, exprs, index, bindings, wilds, wildset):
+    if index==len(patterns):
+        yield bindings
+        return
+    for b in _match(patterns[index], exprs[index], bindings, wilds, wildset):
+        for b1 in _match_seq(patterns, exprs, index+1, b, wilds, wildset):
+            yield b1
+
+class _Commutative(object):
+    """ Matches pattern with dictionary data as a multiset of
+    ``(key, value)`` items.
+
+    Items without wildcards must be present in the expression. A
+    wildcard key with value 1 in TERM_COEFF_DICT or BASE_EXP_DICT
+    pattern matches the rest of the items, for example, ``x + w``
+    matches ``x + y + z`` with ``w = y + z``. Other items are matched
+    one-to-one.
+    """
+
+    def __init__(self, pattern, wilds, wildset):
+        self.pattern = pattern
+        self.wilds = wilds
+        self.wildset = wildset
+        head, data = pattern.pair
+        self.head = head
+        exact = []
+        items = []
+        rest = None
+        for key, value in data.iteritems():
+            if not (_has_wild(key, wilds) or _has_wild(value, wilds)):
+                exact.append((key, value))
+            elif rest is None and key in wilds and value==1 \
+                     and head in (TERM_COEFF_DICT, BASE_EXP_DICT):
+                rest = key
+            else:
+                items.append((key, value))
+        self.exact = exact
+        # match items with structured keys first
+        items.sort(key=lambda item: item[0] in wilds)
+        self.items = items
+        self.rest = rest
+        # matching expression must contain the anchor, see
+        # _CommutativeIndex
+        self.anchor = None
+        if exact:
+            self.anchor = 'key', exact[0][0]
+        elif items and items[0][0] not in wilds:
+            self.anchor = 'pattern', items[0][0]
+        else:
+            for key, value in items:
+                if not _has_wild(value, wilds):
+                    self.anchor = 'value', value
+                    break
+
+    def match(self, expr, bindings):
+        data = expr.data
+        n = len(data) - len(self.exact)
+        if n < len(self.items) or (self.rest is None and n > len(self.items)):
+            return
+        remaining = dict(data)
+        for key, value in self.exact:
+            if key not in remaining or remaining[key]!=value:
+                return
+            del remaining[key]
+        for b in self._match_items(0, remaining, bindings, type(expr)):
+            yield b
+
+    def _match_items(self, index, remaining, bindings, cls):
+        if index==len(self.items):
+            if self.rest is None:
+                yield bindings
+            elif remaining:
+                rest = self.head.new(cls, dict(remaining))
+                b = _bind(self.rest, self.wilds[self.rest], self.wildset, rest, bindings)
+                if b is not None:
+                    yield b
+            return
+        pkey, pvalue = self.items[index]
+        wilds, wildset = self.wilds, self.wildset
+        for key, value in remaining.items():
+            for b in _match(pkey, key, bindings, wilds, wildset):
+                for b1 in _match(pvalue, value, b, wilds, wildset):
+                    del remaining[key]
+                    for b2 in self._match_items(index+1, remaining, b1, cls):
+                        yield b2
+                    remaining[key] = value
+
+class _CommutativeIndex(object):
+    """ Holds commutative subpatterns with the same head.
+
+    Subpatterns are indexed by an item key that has no wildcards, or
+    by a structured item key stored in a discrimination net, or by an
+    item value that has no wildcards, so that only subpatterns with
+    anchors present in the expression data are tried.
+    """
+
+    def __init__(self):
+        self.by_key = {}
+        self.by_pattern = RuleSet()
+        self.pattern_items = {}
+        self.by_value = {}
+        self.other = []
+
+    def add(self, c):
+        """ Return child node of _Commutative instance c.
+        """
+        if c.anchor is None:
+            lst = self.other
+        elif c.anchor[0]=='key':
+            lst = self.by_key.setdefault(c.anchor[1], [])
+        elif c.anchor[0]=='pattern':
+            key = c.anchor[1], c.wildset
+            lst = self.pattern_items.get(key)
+            if lst is None:
+                lst = self.pattern_items[key] = []
+                self.by_pattern.add(c.anchor[1], *c.wilds.items(), **dict(value=lst))
+        else:
+            lst = self.by_value.setdefault(c.anchor[1], [])
+        for c1, child in lst:
+            if c1.pattern==c.pattern and c1.wilds==c.wilds:
+                return child
+        child = _Node()
+        lst.append((c, child))
+        return child
+
+    def candidates(self, data):
+        """ Generate ``(_Commutative instance, child node)`` pairs
+        that may match expression data.
+        """
+        if self.by_key:
+            for key in data:
+                for item in self.by_key.get(key, ()):
+                    yield item
+        if self.pattern_items:
+            seen = set()
+            for key in data:
+                for lst, bindings in self.by_pattern.match(key):
+                    if id(lst) not in seen:
+                        seen.add(id(lst))
+                        for item in lst:
+                            yield item
+        if self.by_value:
+            for value in set(data.itervalues()):
+                for item in self.by_value.get(value, ()):
+                    yield item
+        for item in self.other:
+            yield item
+
+class RuleSet(object):
+    """ Compiled set of patterns for matching an expression against
+    many patterns in one traversal.
+
+    Patterns are stored in a discrimination net, a trie keyed by
+    heads and arities of pattern subexpressions in preorder. Matching
+    an expression follows only the branches that are consistent with
+    the expression, so that patterns sharing a prefix are tested
+    together. Subpatterns without wildcards are looked up by hash and
+    dictionary data (TERM_COEFF_DICT, BASE_EXP_DICT) is matched as a
+    multiset.
+
+    For example,
+
+    >>> x, y, w, v = map(Symbol, 'xywv')
+    >>> rules = RuleSet()
+    >>> rules.add(sin(w)**2 + cos(w)**2, w, value=1)
+    0
+    >>> rules.add(sin(w)*v, w, v)
+    1
+    >>> rules.match(sin(x)**2 + cos(x)**2)
+    [(1, {Calculus('w'): Calculus('x')})]
+    >>> rules.match(sin(x+y)*y)
+    [(Calculus('Sin(w)*v'), {Calculus('w'): Calculus('y + x'), Calculus('v'): Calculus('y')})]
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.rules = []
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add(self, pattern, *wildcards, **options):
+        """ Add pattern to the rule set and return the index of the rule.
+
+        wildcards and the ``exclude`` option have the same meaning as
+        in Algebra.match. The ``value`` option specifies the value
+        returned when the pattern matches, by default it is the
+        pattern.
+        """
+        exclude = options.get('exclude', [])
+        wilds = {}
+        for w in wildcards:
+            if type(w) in [list, tuple]:
+                assert len(w)==2,`w`
+                s, func = w
+            elif exclude:
+                s, func = w, lambda x: x not in exclude
+            else:
+                s, func = w, True
+            wilds[pattern.convert(s)] = func
+        wildset = frozenset(wilds)
+        node = self.root
+        for kind, key in self._tokens(pattern, wilds, wildset, []):
+            if kind=='commutative':
+                index = node.commutative.get(key.head)
+                if index is None:
+                    index = node.commutative[key.head] = _CommutativeIndex()
+                node = index.add(key)
+            else:
+                edges = getattr(node, kind)
+                child = edges.get(key)
+                if child is None:
+                    child = edges[key] = _Node()
+                node = child
+        index = len(self.rules)
+        self.rules.append(options.get('value', pattern))
+        node.rules.append(index)
+        return index
+
+    def _tokens(self, pattern, wilds, wildset, tokens):
+        if not _has_wild(pattern, wilds):
+            tokens.append(('exact', pattern))
+        elif isinstance(pattern, tuple):
+            tokens.append(('struct', (tuple, len(pattern))))
+            for p in pattern:
+                self._tokens(p, wilds, wildset, tokens)
+        elif pattern in wilds:
+            tokens.append(('wild', (pattern, wilds[pattern], wildset)))
+        else:
+            head, data = pattern.pair
+            if isinstance(data, tuple):
+                tokens.append(('struct', (head, len(data))))
+                for p in data:
+                    self._tokens(p, wilds, wildset, tokens)
+            elif isinstance(data, dict):
+                tokens.append(('commutative', _Commutative(pattern, wilds, wildset)))
+            else:
+                raise NotImplementedError('matching %s data of %r' % (type(data).__name__, head))
+        return tokens
+
+    def match(self, expr):
+        """ Return a list of ``(value, bindings)`` pairs of rules that
+        match expr, in the order the rules were added.
+        """
+        result = []
+        self._retrieve(self.root, (expr, None), {}, result)
+        result.sort(key=lambda item: item[0])
+        rules = self.rules
+        return [(rules[index], bindings) for index, bindings in result]
+
+    def _retrieve(self, node, stack, bindings, result):
+        # stack is a linked list of subexpressions to be matched
+        if stack is None:
+            for index in node.rules:
+                result.append((index, bindings))
+            return
+        expr, stack = stack
+        retrieve = self._retrieve
+        if node.exact:
+            try:
+                child = node.exact.get(expr)
+            except TypeError:
+                # unhashable data
+                child = None
+            if child is not None:
+                retrieve(child, stack, bindings, result)
+        if node.struct:
+            if isinstance(expr, tuple):
+                head, data = tuple, expr
+            elif isinstance(expr, Expr):
+                head, data = expr.pair
+            else:
+                head, data = None, None
+            if isinstance(data, tuple):
+                child = node.struct.get((head, len(data)))
+                if child is not None:
+                    s = stack
+                    for d in reversed(data):
+                        s = (d, s)
+                    retrieve(child, s, bindings, result)
+        if node.commutative and isinstance(expr, Expr):
+            head, data = expr.pair
+            index = node.commutative.get(head)
+            if index is not None and isinstance(data, dict):
+                for c, child in index.candidates(data):
+                    for b in c.match(expr, bindings):
+                        retrieve(child, stack, b, result)
+        for (wild, predicate, wildset), child in node.wild.iteritems():
+            b = _bind(wild, predicate, wildset, expr, bindings)
+            if b is not None:
+                retrieve(child, stack, b, result)
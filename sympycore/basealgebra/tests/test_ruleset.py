@@ -0,0 +1,75 @@
+
+from sympycore import Symbol, Calculus, RuleSet, sin, cos
+
+x, y, z, w, v = map(Symbol, 'xyzwv')
+
+def test_exact():
+    r = RuleSet()
+    assert r.add(x+y) == 0
+    assert r.add(sin(x), value='sin') == 1
+    assert len(r)==2
+    assert r.match(x+y)==[(x+y, {})]
+    assert r.match(sin(x))==[('sin', {})]
+    assert r.match(sin(y))==[]
+
+def test_wild():
+    r = RuleSet()
+    r.add(w, w)
+    r.add(w, (w, lambda e: e.head is x.head))
+    r.add(x, w, exclude=[y])
+    assert r.match(x)==[(w, {w:x}), (w, {w:x}), (x, {})]
+    assert r.match(y)==[(w, {w:y}), (w, {w:y})]
+    assert r.match(x+y)==[(w, {w:x+y})]
+    # wilds do not match other wilds
+    assert r.match(w)==[]
+
+def test_struct():
+    r = RuleSet()
+    r.add(sin(w), w)
+    r.add(w**2, w)
+    r.add(w**v, w, v)
+    r.add(2*w, w)
+    r.add(sin(w)**v, w, v)
+    assert r.match(sin(x+y))==[(sin(w), {w:x+y})]
+    assert r.match(x**2)==[(w**2, {w:x}), (w**v, {w:x, v:2})]
+    assert r.match(x**y)==[(w**v, {w:x, v:y})]
+    assert r.match(2*x)==[(2*w, {w:x})]
+    assert r.match(3*x)==[]
+    assert r.match(sin(x)**3)==[(w**v, {w:sin(x), v:3}), (sin(w)**v, {w:x, v:3})]
+
+def test_repeated_wild():
+    r = RuleSet()
+    r.add(sin(w)**2 + cos(w)**2, w, value=1)
+    assert r.match(sin(x)**2 + cos(x)**2)==[(1, {w:x})]
+    assert r.match(sin(x)**2 + cos(y)**2)==[]
+    r = RuleSet()
+    r.add(w*sin(w), w)
+    assert r.match(x*sin(x))==[(w*sin(w), {w:x})]
+    assert r.match(y*sin(x))==[]
+
+def test_commutative():
+    r = RuleSet()
+    r.add(x + w, w)
+    r.add(x*w, w)
+    r.add(x + 2*w + v, w, v)
+    assert r.match(x+y+z)==[(x+w, {w:y+z})]
+    assert r.match(x+y)==[(x+w, {w:y})]
+    assert r.match(y+z)==[]
+    assert r.match(x*y*z)==[(x*w, {w:y*z})]
+    assert r.match(x+2*y+3)==[(x+w, {w:2*y+3}), (x+2*w+v, {w:y, v:3})]
+    m = r.match(x+2*y+2*z)
+    assert (x+2*w+v, {w:y, v:2*z}) in m
+    assert (x+2*w+v, {w:z, v:2*y}) in m
+    assert len(m)==3
+
+def test_many_rules():
+    r = RuleSet()
+    for k in range(2, 50):
+        r.add(sin(w)**k, w, value=k)
+        r.add(w**k + v, w, v, value=-k)
+    assert r.match(sin(x)**7)==[(7, {w:x})]
+    assert r.match(x**7 + y)==[(-7, {w:x, v:y})]
+    m = r.match(sin(x)**7 + y**7)
+    assert len(m)==2
+    assert (-7, {w:sin(x), v:y**7}) in m
+    assert (-7, {w:y, v:sin(x)**7}) in m
@@ -89,9 +89,11 @@ class Calculus(CommutativeRing):
         """
         if cls is Verbatim:
             return self.as_verbatim()
-        if cls is classes.Unit:
+        # Unit and PolynomialRing are imported lazily, cls cannot
+        # be one of them when they are not loaded yet.
+        if classes.is_loaded('Unit') and cls is classes.Unit:
             return cls(NUMBER, self)
-        if issubclass(cls, PolynomialRing):
+        if classes.is_loaded('PolynomialRing') and issubclass(cls, classes.PolynomialRing):
             return self.as_polynom(cls)
         return self.as_verbatim().as_algebra(cls)
 
@@ -309,11 +311,54 @@ class Calculus(CommutativeRing):
         """
         if ring_cls is None:
             data, variables = self.to_polynomial_data()
-            return PolynomialRing[tuple(variables)].convert(data)
+            return classes.PolynomialRing[tuple(variables)].convert(data)
         else:
             data, variables = self.to_polynomial_data(ring_cls.variables, True)
             return ring_cls.convert(data)
 
+    def cancel(self):
+        """ Return an equivalent expression with the common polynomial
+        factors of its numerator and denominator removed.
+
+        For example,
+
+          >>> x,y = map(Symbol,'xy')
+          >>> ((x**2 - y**2)/(x + y)).cancel()
+          Calculus('x - y')
+
+        """
+        from .cancel import cancel
+        return cancel(self)
+
+    def series(self, x, x0=0, n=6):
+        """ Return the Taylor polynomial of an expression in x at x0
+        with n terms, that is, the expansion up to ``(x-x0)**(n-1)``.
+
+        For example,
+
+          >>> x = Symbol('x')
+          >>> Exp(x).series(x, 0, 4) == 1 + x + x**2/2 + x**3/6
+          True
+
+        See also PowerSeries.
+        """
+        from .series import power_series
+        x = self.convert(x)
+        return power_series(self, x, x0, n).as_expr(x - x0)
+
+    def equals(self, other, method='probabilistic', **kws):
+        """ Check if expressions are mathematically equal, see is_zero.
+
+        For example,
+
+          >>> x,y = map(Symbol,'xy')
+          >>> ((x + y)**2).equals(x**2 + 2*x*y + y**2)
+          True
+
+        """
+        from .identity import is_zero
+        return is_zero(self - other, method=method, **kws)
+
     def __divmod__(self, other):
         if isinstance(other, Calculus):
             lhs = self.as_polynom()
@@ -347,5 +392,4 @@ Calculus.zero = zero
 
 I = Calculus.Number(mpqc(0,1))
 
-from ..polynomials.algebra import PolynomialRing, AdditiveTuple
 from .infinity import CalculusInfinity
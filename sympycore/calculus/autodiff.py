@@ -0,0 +1,308 @@
+""" Provides code generation of functions that compute the value and
+the gradient of an expression by reverse accumulation.
+
+The expression is treated as a DAG of its subexpressions, equal
+subexpressions are evaluated once. The generated function evaluates
+the nodes in topological order and then propagates adjoints from the
+root to the variables in reverse order, so the cost of computing the
+full gradient is a small multiple of the cost of one evaluation::
+
+  >>> f = gradient_function(x*Sin(y) + x**2, [x, y])
+  >>> f(2.0, 0.0)
+  (4.0, (4.0, 2.0))
+
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['gradient_function', 'gradient_source']
+
+from ..utils import (SYMBOL, NUMBER, ADD, MUL, POW, TERM_COEFF, TERM_COEFF_DICT,
+                     BASE_EXP_DICT, APPLY, CALLABLE)
+from ..arithmetic.numbers import mpq
+from ..arithmetic.mpmath import fp
+from .constants import Constant
+
+# Names of the functions of the math and numpy modules:
+function_names = dict(math = dict(Sin='sin', Cos='cos', Tan='tan', Log='log', Ln='log',
+                                  ArcSin='asin'),
+                      numpy = dict(Sin='sin', Cos='cos', Tan='tan', Log='log', Ln='log',
+                                   ArcSin='arcsin'))
+
+# Double precision values of constants, Constant.evalf depends on the
+# current mpmath precision:
+constant_values = dict(pi=fp.pi, E=fp.e, gamma=fp.euler)
+
+def literal(x):
+    """ Return Python literal of a number.
+    """
+    t = type(x)
+    if t is int or t is long:
+        r = repr(x)
+    elif t is mpq:
+        p, q = x
+        r = repr(float(p)/q)
+    else:
+        try:
+            r = repr(float(x))
+        except TypeError:
+            r = repr(complex(x))
+    if r.startswith('-'):
+        return '(%s)' % (r)
+    return r
+
+def product(names):
+    if not names:
+        return '1'
+    return '*'.join(names)
+
+class GradientCodeGenerator(object):
+    """ Generates the source of a function computing the value and
+    gradient of an expression.
+    """
+
+    def __init__(self, cls, variables, module='math'):
+        if module not in function_names:
+            raise ValueError('module must be %s but got %r' % (' or '.join(sorted(function_names)), module))
+        self.cls = cls
+        self.module = module
+        self.variables = variables
+        self.arguments = dict([(v, 'x%s' % (i)) for i, v in enumerate(variables)])
+        self.nodes = {}      # expr -> node index
+        self.values = []     # node index -> value name
+        self.depends = []    # node index -> True if node depends on variables
+        self.edges = []      # node index -> list of (child index, partial code or expr)
+        self.lines = []
+
+    def name(self, expr):
+        """ Return the name of the value of expr, generate code for
+        evaluating expr when needed.
+        """
+        index = self.nodes.get(expr)
+        if index is None:
+            index = self.visit(expr)
+        return self.values[index]
+
+    def new_node(self, expr, value, depends, edges):
+        index = self.nodes[expr] = len(self.values)
+        self.values.append(value)
+        self.depends.append(depends)
+        self.edges.append(edges)
+        return index
+
+    def assign(self, code):
+        name = 'v%s' % (len(self.lines))
+        self.lines.append('%s = %s' % (name, code))
+        return name
+
+    def child(self, expr):
+        """ Return (index, name) of a child node.
+        """
+        name = self.name(expr)
+        return self.nodes[expr], name
+
+    def visit(self, expr):
+        head, data = expr.pair
+        cls = type(expr)
+        if head is SYMBOL:
+            if isinstance(data, Constant):
+                value = constant_values.get(data)
+                if value is None:
+                    value = data.evalf()
+                return self.new_node(expr, literal(value), False, [])
+            arg = self.arguments.get(data)
+            if arg is None:
+                raise ValueError('expression depends on %r that is not in variables' % (data,))
+            return self.new_node(expr, arg, True, [])
+        if head is NUMBER:
+            return self.new_node(expr, literal(data), False, [])
+        if head is TERM_COEFF_DICT or head is ADD or head is TERM_COEFF:
+            if head is TERM_COEFF_DICT:
+                items = data.items()
+            elif head is ADD:
+                items = [(t, 1) for t in data]
+            else:
+                items = [data]
+            terms, edges = [], []
+            for t, c in items:
+                i, n = self.child(t)
+                if c==1:
+                    terms.append(n)
+                    edges.append((i, None))
+                else:
+                    c = literal(c)
+                    terms.append('%s*%s' % (c, n))
+                    edges.append((i, c))
+            value = self.assign(' + '.join(terms))
+            return self.new_node(expr, value, self.any_depends(edges), edges)
+        if head is BASE_EXP_DICT or head is MUL:
+            if head is MUL:
+                items = [(b, 1) for b in data]
+            else:
+                items = data.items()
+            factors = []
+            for b, e in items:
+                if hasattr(e, 'pair'):
+                    if e.head is NUMBER:
+                        e = e.data
+                    else:
+                        # symbolic exponent, handle as a POW node
+                        factors.append((cls(POW, (b, e)), 1))
+                        continue
+                factors.append((b, e))
+            return self.visit_product(expr, factors)
+        if head is POW:
+            b, e = data
+            if hasattr(e, 'pair') and e.head is NUMBER:
+                e = e.data
+            if not hasattr(e, 'pair'):
+                return self.visit_product(expr, [(b, e)])
+            i, bn = self.child(b)
+            j, en = self.child(e)
+            value = self.assign('%s**%s' % (bn, en))
+            edges = [(i, '%s*%s**(%s-1)' % (en, bn, en)),
+                     (j, '%s*%s.log(%s)' % (value, self.module, bn))]
+            return self.new_node(expr, value, self.any_depends(edges), edges)
+        if head is APPLY:
+            func, args = data
+            if func.head is not CALLABLE:
+                raise NotImplementedError('gradient code of %r' % (func,))
+            fname = getattr(func.data, '__name__', None)
+            if fname=='Cot':
+                fcode = '1/%s.tan' % (self.module)
+            else:
+                fname = function_names[self.module].get(fname)
+                if fname is None:
+                    raise NotImplementedError('gradient code of function %r' % (func.data,))
+                fcode = '%s.%s' % (self.module, fname)
+            indices, names = [], []
+            for a in args:
+                i, n = self.child(a)
+                indices.append(i)
+                names.append(n)
+            value = self.assign('%s(%s)' % (fcode, ', '.join(names)))
+            edges = []
+            if self.any_depends([(i, None) for i in indices]):
+                fcls = type(func)
+                for k, a in enumerate(args):
+                    if not self.depends[indices[k]]:
+                        continue
+                    # the partial derivative is evaluated in the backward pass
+                    df = func.head.fdiff(fcls, func.data, func, k, 1)(*args)
+                    edges.append((indices[k], df))
+            return self.new_node(expr, value, bool(edges), edges)
+        raise NotImplementedError('gradient code of %s expression' % (head))
+
+    def visit_product(self, expr, factors):
+        children = [self.child(b) for b, e in factors]
+        powers = []
+        for (i, n), (b, e) in zip(children, factors):
+            if e==1:
+                powers.append(n)
+            else:
+                powers.append(self.assign('%s**%s' % (n, literal(e))))
+        if len(powers)==1:
+            value = powers[0]
+        else:
+            value = self.assign(product(powers))
+        edges = []
+        nfactors = len(factors)
+        prefix = suffix = None
+        if nfactors>3:
+            # prefix[k] is the product of powers[:k], suffix[k] of powers[k+1:]
+            prefix = ['1', powers[0]]
+            for k in range(2, nfactors):
+                prefix.append(self.assign('%s*%s' % (prefix[-1], powers[k-1])))
+            suffix = [powers[-1], '1']
+            for k in range(nfactors-3, -1, -1):
+                suffix.insert(0, self.assign('%s*%s' % (powers[k+1], suffix[0])))
+        for k, ((i, n), (b, e)) in enumerate(zip(children, factors)):
+            if not self.depends[i]:
+                continue
+            if prefix is None:
+                others = [p for j, p in enumerate(powers) if j!=k]
+            else:
+                others = [p for p in [prefix[k], suffix[k]] if p!='1']
+            if e==1:
+                partial = product(others)
+            elif e==2:
+                partial = product(['2', n] + others)
+            else:
+                partial = product(['%s*%s**%s' % (literal(e), n, literal(e-1))] + others)
+            edges.append((i, partial))
+        return self.new_node(expr, value, bool(edges), edges)
+
+    def any_depends(self, edges):
+        for i, p in edges:
+            if self.depends[i]:
+                return True
+        return False
+
+    def generate(self, expr, name='f'):
+        """ Return the source of function name.
+        """
+        root = self.name(expr)
+        index = self.nodes[expr]
+        adjoints = {}
+        lines = self.lines
+        if self.depends[index]:
+            adjoints[index] = adjoint = 'a%s' % (index)
+            lines.append('%s = 1.0' % (adjoint))
+        for k in xrange(index, -1, -1):
+            adjoint = adjoints.get(k)
+            if adjoint is None:
+                continue
+            for i, partial in self.edges[k]:
+                if not self.depends[i]:
+                    continue
+                if partial is None:
+                    term = adjoint
+                else:
+                    if not isinstance(partial, str):
+                        partial = self.name(partial)
+                    term = '%s*%s' % (partial, adjoint)
+                child = adjoints.get(i)
+                if child is None:
+                    adjoints[i] = child = 'a%s' % (i)
+                    lines.append('%s = %s' % (child, term))
+                else:
+                    lines.append('%s += %s' % (child, term))
+        gradient = []
+        for v in self.variables:
+            i = self.nodes.get(self.cls(SYMBOL, v))
+            gradient.append(adjoints.get(i, '0.0'))
+        args = [self.arguments[v] for v in self.variables]
+        body = lines + ['return %s, (%s)' % (root, ''.join([g+', ' for g in gradient]))]
+        return 'def %s(%s):\n    %s\n' % (name, ', '.join(args), '\n    '.join(body))
+
+def variable_names(variables):
+    names = []
+    for v in variables:
+        if isinstance(v, str):
+            names.append(v)
+        else:
+            head, data = v.pair
+            assert head is SYMBOL,`v.pair`
+            names.append(data)
+    return names
+
+def gradient_source(expr, variables, name='f', module='math'):
+    """ Return the source of a Python function that returns the
+    value and the gradient of expr with respect to variables.
+
+    The function takes the values of variables as positional
+    arguments. module is 'math' for scalar arguments or 'numpy' for
+    array arguments.
+    """
+    generator = GradientCodeGenerator(type(expr), variable_names(variables), module=module)
+    return generator.generate(expr, name=name)
+
+def gradient_function(expr, variables, module='math'):
+    """ Return a Python function that returns ``(value, gradient)``
+    of expr for the given values of variables, see gradient_source.
+    """
+    source = gradient_source(expr, variables, module=module)
+    namespace = {module: __import__(module)}
+    exec compile(source, '<gradient of %s>' % (expr,), 'exec') in namespace
+    f = namespace['f']
+    f.source = source
+    return f
@@ -0,0 +1,187 @@
+#
+# Created: October 2026
+#
+""" Provides cancel function that removes common polynomial factors
+from the numerator and denominator of rational expressions.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['cancel']
+
+from ..core import init_module
+init_module.import_heads()
+init_module.import_lowlevel_operations()
+
+from ..arithmetic.numbers import mpq
+
+class _NotRational(Exception):
+    pass
+
+def _collect_generators(expr, generators):
+    """ Collect non-arithmetic subexpressions of expr to generators dict.
+    """
+    head, data = expr.pair
+    cls = type(expr)
+    if head is NUMBER:
+        if not isinstance(data, (int, long, mpq)):
+            raise _NotRational(expr)
+    elif head is TERM_COEFF:
+        term, coeff = data
+        _collect_generators(term, generators)
+        if isinstance(coeff, cls):
+            _collect_generators(coeff, generators)
+        elif not isinstance(coeff, (int, long, mpq)):
+            raise _NotRational(expr)
+    elif head is TERM_COEFF_DICT:
+        for term, coeff in data.iteritems():
+            _collect_generators(term, generators)
+            if not isinstance(coeff, (int, long, mpq)):
+                raise _NotRational(expr)
+    elif head is POW:
+        base, exp = data
+        if isinstance(exp, (int, long)):
+            _collect_generators(base, generators)
+        elif expr not in generators:
+            generators[expr] = len(generators)
+    elif head is BASE_EXP_DICT:
+        for base, exp in data.iteritems():
+            if isinstance(exp, (int, long)):
+                _collect_generators(base, generators)
+            else:
+                _collect_generators(cls(POW, (base, exp)), generators)
+    elif expr not in generators:
+        generators[expr] = len(generators)
+
+def _add(lhs, rhs, nvars):
+    from ..polynomials.gcd import poly_gcd, poly_mul
+    n1, d1 = lhs
+    n2, d2 = rhs
+    if d1==d2:
+        n = dict(n1)
+        for e, c in n2.iteritems():
+            c = n.get(e, 0) + c
+            if c:
+                n[e] = c
+            else:
+                del n[e]
+        return n, d1
+    g, c1, c2 = poly_gcd(d1, d2, nvars)
+    n = poly_mul(n1, c2)
+    for e, c in poly_mul(n2, c1).iteritems():
+        c = n.get(e, 0) + c
+        if c:
+            n[e] = c
+        else:
+            del n[e]
+    return n, poly_mul(d1, c2)
+
+def _mul(lhs, rhs):
+    from ..polynomials.gcd import poly_mul
+    return poly_mul(lhs[0], rhs[0]), poly_mul(lhs[1], rhs[1])
+
+def _pow(base, exp, one):
+    from ..polynomials.gcd import poly_mul
+    n, d = base
+    if exp < 0:
+        n, d = d, n
+        exp = -exp
+    rn, rd = one, one
+    while exp:
+        if exp & 1:
+            rn, rd = poly_mul(rn, n), poly_mul(rd, d)
+        exp >>= 1
+        if exp:
+            n, d = poly_mul(n, n), poly_mul(d, d)
+    return rn, rd
+
+def _number(data, zero):
+    if isinstance(data, mpq):
+        p, q = data
+        return {zero: p}, {zero: q}
+    if data:
+        return {zero: data}, {zero: 1}
+    return {}, {zero: 1}
+
+def _as_rational(expr, generators, nvars):
+    """ Return ``(numer, denom)`` polynomial dictionaries of expr.
+    """
+    head, data = expr.pair
+    cls = type(expr)
+    zero = (0,) * nvars
+    if head is NUMBER:
+        return _number(data, zero)
+    if head is TERM_COEFF:
+        term, coeff = data
+        r = _as_rational(term, generators, nvars)
+        if isinstance(coeff, cls):
+            return _mul(r, _as_rational(coeff, generators, nvars))
+        return _mul(r, _number(coeff, zero))
+    if head is TERM_COEFF_DICT:
+        r = {}, {zero: 1}
+        for term, coeff in data.iteritems():
+            r = _add(r, _mul(_as_rational(term, generators, nvars), _number(coeff, zero)), nvars)
+        return r
+    if head is POW:
+        base, exp = data
+        if isinstance(exp, (int, long)):
+            return _pow(_as_rational(base, generators, nvars), exp, {zero: 1})
+    elif head is BASE_EXP_DICT:
+        r = {zero: 1}, {zero: 1}
+        for base, exp in data.iteritems():
+            if isinstance(exp, (int, long)):
+                r = _mul(r, _pow(_as_rational(base, generators, nvars), exp, {zero: 1}))
+            else:
+                r = _mul(r, _as_rational(cls(POW, (base, exp)), generators, nvars))
+        return r
+    e = [0] * nvars
+    e[generators[expr]] = 1
+    return {tuple(e): 1}, {zero: 1}
+
+def _as_expr(cls, data, generators):
+    terms = {}
+    for exps, coeff in data.iteritems():
+        factors = {}
+        for g, e in zip(generators, exps):
+            if e:
+                base_exp_dict_add_item(cls, factors, g, e)
+        term_coeff_dict_add_item(cls, terms, base_exp_dict_new(cls, factors), coeff)
+    return term_coeff_dict_new(cls, terms)
+
+def cancel(expr):
+    """ Return an equivalent of a rational expression expr with the
+    common polynomial factors of its numerator and denominator
+    removed.
+
+    Subexpressions that are not sums, products or integer powers
+    (symbols, function applications, non-integer powers) are treated
+    as polynomial variables. When expr contains non-rational numbers,
+    it is returned unchanged.
+
+    For example::
+
+      >>> x, y = map(Symbol, 'xy')
+      >>> cancel((x**2 - y**2)/(x + y))
+      Calculus('x - y')
+    """
+    # polynomials are imported on demand, see sympycore.__init__
+    from ..polynomials.gcd import poly_gcd, poly_mul_value
+    cls = type(expr)
+    generators = {}
+    try:
+        _collect_generators(expr, generators)
+    except _NotRational:
+        return expr
+    nvars = len(generators)
+    numer, denom = _as_rational(expr, generators, nvars)
+    if not numer:
+        return cls(NUMBER, 0)
+    g, numer, denom = poly_gcd(numer, denom, nvars)
+    lc = denom[max(denom)]
+    if lc < 0:
+        numer = poly_mul_value(numer, -1)
+        denom = poly_mul_value(denom, -1)
+    generators = sorted(generators, key=generators.get)
+    n = _as_expr(cls, numer, generators)
+    if len(denom)==1 and denom.keys()[0]==(0,)*nvars:
+        return n / denom.values()[0]
+    return n / _as_expr(cls, denom, generators)
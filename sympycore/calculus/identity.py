@@ -0,0 +1,411 @@
+#
+# Created October 2026
+#
+""" Provides probabilistic zero-equivalence testing of Calculus
+expressions.
+
+Structural comparison of expressions does not recognize equal
+expressions unless they are brought to a canonical form, and
+expanding large expressions is expensive. is_zero evaluates an
+expression at random points instead:
+
+* Rational expressions are evaluated modulo a large prime. Function
+  applications and non-integer powers are treated as independent
+  variables. By the Schwartz-Zippel lemma a nonzero rational function
+  with numerator degree d vanishes at a random point with probability
+  at most ``d/p``, so repeated trials bound the probability of a wrong
+  answer by the given error.
+
+* Expressions that are not proven zero in the modular test and that
+  contain function applications or non-integer powers are evaluated
+  in floating point complex arithmetic at random points near the
+  positive real axis. An expression is considered zero when its
+  values are negligible relative to the magnitudes of the evaluated
+  terms, so that small nonzero expressions such as ``Sin(x)/10**12``
+  are not considered zero.
+
+For example::
+
+  >>> is_zero((x + y)**20 - (y + x)**20)
+  True
+  >>> is_zero(Sin(x)**2 + Cos(x)**2 - 1)
+  True
+  >>> (Sin(2*x)).equals(2*Sin(x)*Cos(x))
+  True
+
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['is_zero', 'ZeroTester']
+
+import cmath
+import math
+import random
+
+from ..core import init_module, classes
+init_module.import_heads()
+
+from ..arithmetic.numbers import mpq, mpqc
+from .constants import Constant
+
+# Mersenne prime used for modular evaluation:
+PRIME = 2**61 - 1
+
+# Functions used in floating point evaluation:
+complex_functions = dict(Exp=cmath.exp, Log=cmath.log, Ln=cmath.log, Sqrt=cmath.sqrt,
+                         Sin=cmath.sin, Cos=cmath.cos, Tan=cmath.tan,
+                         Cot=lambda z: 1/cmath.tan(z), ArcSin=cmath.asin)
+
+class _Inconclusive(Exception):
+    pass
+
+class ZeroTester(object):
+    """ Tests if expressions are zero by evaluation at random points.
+
+    error is the bound of the probability that the modular test
+    reports a nonzero expression as zero. tolerance is the relative
+    size of negligible floating point values, ntrials is the number
+    of floating point evaluations.
+    """
+
+    def __init__(self, error=1e-15, tolerance=1e-9, ntrials=3, seed=None):
+        self.error = error
+        self.tolerance = tolerance
+        self.ntrials = ntrials
+        self.random = random.Random(seed)
+
+    def __call__(self, expr):
+        r = self.modular(expr)
+        if r is not None:
+            return r
+        r = self.numeric(expr)
+        if r is None:
+            return expr.expand()==0
+        return r
+
+    def modular(self, expr):
+        """ Return True if expr is zero with error probability at most
+        self.error, False if expr is a nonzero rational function of its
+        symbols, or None when the test is inconclusive: expr contains
+        inexact numbers, or it is nonzero as a rational function of
+        function applications and non-integer powers that may be
+        dependent, for example ``Sin(x)**2 + Cos(x)**2 - 1``.
+        """
+        degree = numerator_degree(expr, {})
+        if degree is None:
+            return
+        if degree==0:
+            ntrials = 1
+        elif degree * 2 > PRIME:
+            return
+        else:
+            ntrials = int(math.ceil(math.log(self.error) / math.log(float(degree) / PRIME)))
+        failures = 0
+        while ntrials:
+            generators = {}
+            try:
+                value = evaluate_modular(expr, generators, self.random, {})
+            except _Inconclusive:
+                return
+            except ZeroDivisionError:
+                # a denominator vanished at the point, try another one
+                failures += 1
+                if failures > 10:
+                    return
+                continue
+            if value:
+                for g in generators:
+                    if g.head is not SYMBOL:
+                        return
+                return False
+            ntrials -= 1
+        return True
+
+    def numeric(self, expr):
+        """ Return True if the values of expr are negligible at random
+        points, False otherwise, or None when expr cannot be evaluated.
+        """
+        evaluated = 0
+        for i in xrange(2 * self.ntrials):
+            try:
+                value, magnitude = evaluate_numeric(expr, {}, self.random, {})
+            except NotImplementedError:
+                return
+            except (ZeroDivisionError, OverflowError, ValueError):
+                # a singular point, try another one
+                continue
+            if abs(value) > self.tolerance * magnitude:
+                return False
+            evaluated += 1
+            if evaluated==self.ntrials:
+                return True
+
+def is_zero(expr, method='probabilistic', **kws):
+    """ Check if expression is zero.
+
+    method is 'structural' for comparing the expanded expression with
+    zero, 'probabilistic' for the evaluation at random points (see
+    ZeroTester for the keyword arguments), or 'modular' for the modular
+    test only, that returns None when it is inconclusive.
+    """
+    if not hasattr(expr, 'pair'):
+        expr = classes.Calculus.convert(expr)
+    if method=='structural':
+        return expr.expand()==0
+    if method=='probabilistic':
+        return ZeroTester(**kws)(expr)
+    if method=='modular':
+        return ZeroTester(**kws).modular(expr)
+    raise ValueError('method must be structural, probabilistic or modular but got %r' % (method,))
+
+def integer_exponent(exp):
+    """ Return exp as an integer or None.
+    """
+    if hasattr(exp, 'pair'):
+        if exp.head is not NUMBER:
+            return
+        exp = exp.data
+    if isinstance(exp, (int, long)):
+        return exp
+
+def numerator_degree(expr, cache):
+    """ Return the bound of the numerator degree of a rational
+    expression, or None when expr contains inexact numbers.
+    """
+    r = degrees(expr, cache)
+    if r is None:
+        return
+    return r[0]
+
+def degrees(expr, cache):
+    """ Return the bounds ``(numer, denom)`` of the degrees of the
+    numerator and the denominator of expr.
+    """
+    r = cache.get(expr, False)
+    if r is not False:
+        return r
+    head, data = expr.pair
+    cls = type(expr)
+    r = (1, 0)
+    if head is NUMBER:
+        r = (0, 0) if is_exact(data) else None
+    elif head is TERM_COEFF:
+        term, coeff = data
+        r = degrees(term, cache)
+        if isinstance(coeff, cls):
+            r = mul_degrees(r, degrees(coeff, cache))
+        elif not is_exact(coeff):
+            r = None
+    elif head is TERM_COEFF_DICT or head is ADD or head is SUB:
+        if head is TERM_COEFF_DICT:
+            terms = data.keys()
+            if not all(map(is_exact, data.values())):
+                terms = None
+        else:
+            terms = data
+        r = (0, 0)
+        for t in terms or ():
+            r = add_degrees(r, degrees(t, cache))
+        if terms is None:
+            r = None
+    elif head is MUL or head is BASE_EXP_DICT or head is POW or head is NEG or head is POS:
+        if head is BASE_EXP_DICT:
+            items = data.items()
+        elif head is POW:
+            items = [data]
+        elif head is MUL:
+            items = [(b, 1) for b in data]
+        else:
+            items = [(data, 1)]
+        r = (0, 0)
+        for b, e in items:
+            e = integer_exponent(e)
+            if e is None:
+                # generator
+                d = (1, 0)
+            else:
+                d = degrees(b, cache)
+                if d is not None:
+                    d = (e * d[0], e * d[1]) if e >= 0 else (-e * d[1], -e * d[0])
+            r = mul_degrees(r, d)
+    cache[expr] = r
+    return r
+
+def add_degrees(a, b):
+    if a is None or b is None:
+        return
+    return max(a[0] + b[1], a[1] + b[0]), a[1] + b[1]
+
+def mul_degrees(a, b):
+    if a is None or b is None:
+        return
+    return a[0] + b[0], a[1] + b[1]
+
+def is_exact(number):
+    return isinstance(number, (int, long, mpq))
+
+def modular_number(number):
+    if isinstance(number, mpq):
+        p, q = number
+        return p * pow(q, PRIME - 2, PRIME) % PRIME
+    if isinstance(number, (int, long)):
+        return number % PRIME
+    raise _Inconclusive(number)
+
+def modular_inverse(value):
+    if not value:
+        raise ZeroDivisionError('modular inverse')
+    return pow(value, PRIME - 2, PRIME)
+
+def modular_power(value, exp):
+    if exp < 0:
+        return pow(modular_inverse(value), -exp, PRIME)
+    return pow(value, exp, PRIME)
+
+def evaluate_modular(expr, generators, random, cache):
+    """ Return the value of expr modulo PRIME where generators maps
+    symbols, function applications and non-integer powers to random
+    values.
+    """
+    r = cache.get(expr)
+    if r is not None:
+        return r
+    head, data = expr.pair
+    cls = type(expr)
+    if head is NUMBER:
+        r = modular_number(data)
+    elif head is TERM_COEFF:
+        term, coeff = data
+        if isinstance(coeff, cls):
+            coeff = evaluate_modular(coeff, generators, random, cache)
+        else:
+            coeff = modular_number(coeff)
+        r = evaluate_modular(term, generators, random, cache) * coeff % PRIME
+    elif head is TERM_COEFF_DICT:
+        r = 0
+        for term, coeff in data.iteritems():
+            r += evaluate_modular(term, generators, random, cache) * modular_number(coeff)
+        r %= PRIME
+    elif head is ADD:
+        r = sum([evaluate_modular(t, generators, random, cache) for t in data]) % PRIME
+    elif head is SUB:
+        r = evaluate_modular(data[0], generators, random, cache)
+        for t in data[1:]:
+            r -= evaluate_modular(t, generators, random, cache)
+        r %= PRIME
+    elif head is NEG:
+        r = -evaluate_modular(data, generators, random, cache) % PRIME
+    elif head is POS:
+        r = evaluate_modular(data, generators, random, cache)
+    elif head is MUL or head is BASE_EXP_DICT or head is POW:
+        if head is BASE_EXP_DICT:
+            items = data.iteritems()
+        elif head is POW:
+            items = [data]
+        else:
+            items = [(b, 1) for b in data]
+        r = 1
+        for b, e in items:
+            i = integer_exponent(e)
+            if i is None:
+                v = generator_value(cls(POW, (b, e)), generators, random)
+            else:
+                v = modular_power(evaluate_modular(b, generators, random, cache), i)
+            r = r * v % PRIME
+    else:
+        r = generator_value(expr, generators, random)
+    cache[expr] = r
+    return r
+
+def generator_value(expr, generators, random):
+    v = generators.get(expr)
+    if v is None:
+        v = generators[expr] = random.randrange(1, PRIME)
+    return v
+
+def complex_number(number):
+    if isinstance(number, mpqc):
+        return complex(float(number.real), float(number.imag))
+    return complex(number)
+
+def evaluate_numeric(expr, symbols, random, cache):
+    """ Return ``(value, magnitude)`` of expr in complex arithmetic
+    where symbols maps symbols to random values, magnitude bounds the
+    absolute values of the evaluated terms.
+    """
+    r = cache.get(expr)
+    if r is not None:
+        return r
+    head, data = expr.pair
+    cls = type(expr)
+    if head is NUMBER:
+        v = complex_number(data)
+        r = v, abs(v)
+    elif head is SYMBOL:
+        if isinstance(data, Constant):
+            v = complex_number(data.evalf())
+        else:
+            v = symbols.get(data)
+            if v is None:
+                v = symbols[data] = complex(random.uniform(0.5, 1.5), random.uniform(-0.5, 0.5))
+        r = v, abs(v)
+    elif head is TERM_COEFF:
+        term, coeff = data
+        v, m = evaluate_numeric(term, symbols, random, cache)
+        if isinstance(coeff, cls):
+            c, cm = evaluate_numeric(coeff, symbols, random, cache)
+        else:
+            c = complex_number(coeff)
+            cm = abs(c)
+        r = v * c, m * cm
+    elif head is TERM_COEFF_DICT or head is ADD or head is SUB or head is NEG or head is POS:
+        if head is TERM_COEFF_DICT:
+            items = data.items()
+        elif head is SUB:
+            items = [(data[0], 1)] + [(t, -1) for t in data[1:]]
+        elif head is ADD:
+            items = [(t, 1) for t in data]
+        else:
+            items = [(data, -1 if head is NEG else 1)]
+        v = m = 0
+        for term, coeff in items:
+            tv, tm = evaluate_numeric(term, symbols, random, cache)
+            c = complex_number(coeff)
+            v += tv * c
+            m += tm * abs(c)
+        r = v, m
+    elif head is MUL or head is BASE_EXP_DICT or head is POW:
+        if head is BASE_EXP_DICT:
+            items = data.iteritems()
+        elif head is POW:
+            items = [data]
+        else:
+            items = [(b, 1) for b in data]
+        v = m = 1
+        for b, e in items:
+            bv, bm = evaluate_numeric(b, symbols, random, cache)
+            if hasattr(e, 'pair'):
+                e = evaluate_numeric(e, symbols, random, cache)[0]
+            else:
+                e = complex_number(e)
+            if e.imag==0 and e.real==int(e.real) and e.real >= 0:
+                e = int(e.real)
+                v *= bv ** e
+                m *= bm ** e
+            else:
+                v *= bv ** e
+                m *= abs(bv ** e)
+        r = v, m
+    elif head is APPLY:
+        func, args = data
+        f = None
+        if func.head is CALLABLE:
+            f = complex_functions.get(getattr(func.data, '__name__', None))
+        if f is None:
+            raise NotImplementedError('numeric evaluation of %r' % (func,))
+        v = f(*[evaluate_numeric(a, symbols, random, cache)[0] for a in args])
+        r = v, abs(v)
+    else:
+        raise NotImplementedError('numeric evaluation of %s expression' % (head))
+    cache[expr] = r
+    return r
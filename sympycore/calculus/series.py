@@ -0,0 +1,544 @@
+#
+# Created October 2026
+#
+""" Provides truncated power series arithmetic and series expansion
+of Calculus expressions.
+
+PowerSeries holds a dense list of coefficients ``c[0], ..., c[n-1]``
+representing ``c[0] + c[1]*t + ... + c[n-1]*t**(n-1) + O(t**n)``.
+Multiplication uses Karatsuba splitting for long series and integer
+arithmetic for rational series, reciprocal and the exponential of
+rational series are computed by Newton iteration, and the other
+elementary functions use the recurrences of the differential
+equations they satisfy, so an expansion costs a few series
+multiplications per node of the expression instead of n symbolic
+differentiations::
+
+  >>> (Sin(x)/Cos(x)).series(x, 0, 8) == x + x**3/3 + 2*x**5/15 + 17*x**7/315
+  True
+
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['PowerSeries', 'power_series']
+
+from ..core import init_module, defined_functions
+init_module.import_heads()
+
+from ..arithmetic.numbers import div, inttypes, mpq, normalized_fraction
+from ..arithmetic.number_theory import lcm
+from .algebra import Calculus
+from .constants import const_E
+
+KARATSUBA_THRESHOLD = 32
+
+def coefficient(obj):
+    """ Return the number of a Calculus number, otherwise obj.
+    """
+    head, data = getattr(obj, 'pair', (None, None))
+    if head is NUMBER:
+        return data
+    return obj
+
+def denominator(coeffs):
+    """ Return the least common denominator of rational coeffs, or
+    None when coeffs contain other objects.
+    """
+    d = 1
+    for c in coeffs:
+        t = type(c)
+        if t is mpq:
+            d = lcm(d, c[1])
+        elif not (t is int or t is long):
+            return None
+    return d
+
+def integer_numerators(coeffs, d):
+    r = []
+    for c in coeffs:
+        if type(c) is mpq:
+            p, q = c
+            r.append(p * (d // q))
+        else:
+            r.append(c * d)
+    return r
+
+def mul_coeffs(a, b, n):
+    """ Return the first n coefficients of the product of a and b.
+
+    Products of rational series are computed in integer arithmetic
+    after clearing the denominators, so that the fractions are
+    normalized once per coefficient instead of once per operation.
+    """
+    a = a[:n]
+    b = b[:n]
+    da = denominator(a)
+    if da is not None:
+        db = denominator(b)
+        if db is not None and (da!=1 or db!=1):
+            d = da * db
+            r = mul_dense(integer_numerators(a, da), integer_numerators(b, db), n)
+            return [normalized_fraction(c, d) for c in r]
+    return mul_dense(a, b, n)
+
+def mul_dense(a, b, n):
+    """ Return the first n coefficients of the product of a and b
+    with at most n coefficients.
+    """
+    if min(len(a), len(b)) > KARATSUBA_THRESHOLD:
+        return karatsuba(a, b)[:n]
+    r = [0] * min(n, len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if not x:
+            continue
+        for j, y in enumerate(b[:n-i]):
+            if y:
+                r[i+j] += x * y
+    return r
+
+def karatsuba(a, b):
+    """ Return the coefficients of the product of a and b.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) <= KARATSUBA_THRESHOLD:
+        return mul_dense(a, b, len(a) + len(b) - 1)
+    k = len(a) // 2
+    a0, a1 = a[:k], a[k:]
+    b0, b1 = b[:k], b[k:]
+    if not b1:
+        r = karatsuba(a0, b0)
+        r1 = karatsuba(a1, b0)
+        r.extend([0] * (len(a) + len(b) - 1 - len(r)))
+        for i, x in enumerate(r1):
+            r[k+i] += x
+        return r
+    z0 = karatsuba(a0, b0)
+    z2 = karatsuba(a1, b1)
+    z1 = karatsuba(add_coeffs(a0, a1), add_coeffs(b0, b1))
+    r = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(z0):
+        r[i] += x
+        z1[i] -= x
+    for i, x in enumerate(z2):
+        r[2*k+i] += x
+        z1[i] -= x
+    for i, x in enumerate(z1):
+        if i + k < len(r):
+            r[k+i] += x
+    return r
+
+def add_coeffs(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    r = list(a)
+    for i, x in enumerate(b):
+        r[i] += x
+    return r
+
+def exp_newton(f):
+    """ Return the coefficients of exp(f) for rational coefficients f
+    with zero constant term.
+
+    Newton iteration ``g <- g*(1 + f - log(g))`` doubles the number of
+    correct terms in each step, so that exp costs a few series
+    multiplications instead of the O(n**2) operations of the
+    differential equation recurrence.
+    """
+    n = len(f)
+    g = [1]
+    k = 1
+    while k < n:
+        l = min(2*k, n)
+        g.extend([0] * (l - k))
+        # log(g) = integral(g'/g), the first k terms of f - log(g) vanish
+        q = mul_coeffs([j * c for j, c in enumerate(g) if j],
+                       PowerSeries(g[:l-1]).reciprocal().coeffs, l-1)
+        e = [0] * k + [f[j] - div(q[j-1], j) for j in xrange(k, l)]
+        e[0] = 1
+        g = mul_coeffs(g, e, l)
+        g.extend([0] * (l - len(g)))
+        k = l
+    return g
+
+class PowerSeries(object):
+    """ Truncated power series ``c[0] + c[1]*t + ... + O(t**order)``.
+
+    Coefficients are numbers or Calculus expressions. Arithmetic
+    operations truncate the result to the smallest order of their
+    operands.
+    """
+
+    __slots__ = ['coeffs']
+
+    def __init__(self, coeffs):
+        self.coeffs = list(coeffs)
+
+    @classmethod
+    def constant(cls, c, order):
+        return cls([c] + [0] * (order - 1))
+
+    @classmethod
+    def variable(cls, x0, order):
+        """ Return power series of ``x0 + t``.
+        """
+        return cls(([x0, 1] + [0] * (order - 2))[:order])
+
+    @property
+    def order(self):
+        return len(self.coeffs)
+
+    @property
+    def valuation(self):
+        """ Index of the first nonzero coefficient.
+        """
+        for i, c in enumerate(self.coeffs):
+            if c:
+                return i
+        return len(self.coeffs)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.coeffs)
+
+    def __eq__(self, other):
+        if isinstance(other, PowerSeries):
+            return self.coeffs == other.coeffs
+        return False
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def truncate(self, order):
+        return type(self)(self.coeffs[:order])
+
+    def as_expr(self, t):
+        """ Return the sum of ``c[k] * t**k`` as an expression.
+        """
+        cls = type(t)
+        return cls.Add(*[cls.convert(c) * t**k for k, c in enumerate(self.coeffs) if c])
+
+    def __neg__(self):
+        return type(self)([-c for c in self.coeffs])
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        if not isinstance(other, PowerSeries):
+            coeffs = list(self.coeffs)
+            coeffs[0] = coeffs[0] + coefficient(other)
+            return type(self)(coeffs)
+        n = min(self.order, other.order)
+        return type(self)([x + y for x, y in zip(self.coeffs[:n], other.coeffs[:n])])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if not isinstance(other, PowerSeries):
+            other = coefficient(other)
+            return type(self)([c * other for c in self.coeffs])
+        n = min(self.order, other.order)
+        coeffs = mul_coeffs(self.coeffs, other.coeffs, n)
+        return type(self)(coeffs + [0] * (n - len(coeffs)))
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        if not isinstance(other, PowerSeries):
+            other = coefficient(other)
+            return type(self)([div(c, other) for c in self.coeffs])
+        v = other.valuation
+        if v:
+            # cancel the common factor t**v
+            if v >= other.order:
+                raise ZeroDivisionError('division by zero power series')
+            if self.valuation < v:
+                raise ValueError('quotient has a pole, it is not a power series')
+            self = type(self)(self.coeffs[v:])
+            other = type(other)(other.coeffs[v:])
+        n = min(self.order, other.order)
+        return self.truncate(n) * other.truncate(n).reciprocal()
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, other):
+        return self.reciprocal() * other
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exponent):
+        return self.power(exponent)
+
+    def reciprocal(self):
+        """ Return ``1/self`` computed by Newton iteration.
+        """
+        f = self.coeffs
+        n = len(f)
+        if not n:
+            return type(self)([])
+        if not f[0]:
+            raise ValueError('reciprocal has a pole, it is not a power series')
+        g = [div(1, f[0])]
+        k = 1
+        while k < n:
+            l = min(2*k, n)
+            # g <- g + g*(1 - f*g), the first k terms of 1 - f*g vanish
+            e = mul_coeffs(f, g, l)
+            e = [0] * k + [-c for c in e[k:]]
+            for i, c in enumerate(mul_coeffs(g, e, l)):
+                if i < k:
+                    continue
+                g.append(c)
+            g.extend([0] * (l - len(g)))
+            k = l
+        return type(self)(g)
+
+    def derivative(self):
+        """ Return the derivative with respect to t.
+        """
+        return type(self)([k * c for k, c in enumerate(self.coeffs) if k])
+
+    def integral(self, c0=0):
+        """ Return the integral with respect to t with constant term c0.
+        """
+        return type(self)([c0] + [div(c, k+1) for k, c in enumerate(self.coeffs)])
+
+    def compose(self, other):
+        """ Return ``self(other)`` where other has zero constant term.
+        """
+        if other.coeffs and other.coeffs[0]:
+            raise ValueError('composition requires zero constant term')
+        n = min(self.order, other.order)
+        coeffs = self.coeffs[:n]
+        r = type(self).constant(coeffs[-1] if coeffs else 0, n)
+        for c in reversed(coeffs[:-1]):
+            r = r * other + c
+        return r
+
+    def shift(self):
+        """ Return (c0, self - c0).
+        """
+        c0 = self.coeffs[0]
+        return c0, type(self)([0] + self.coeffs[1:])
+
+    def exp(self):
+        f = self.coeffs
+        n = len(f)
+        g0 = coefficient(defined_functions.Exp(f[0]))
+        if n > 1 and denominator(f[1:]) is not None:
+            g = exp_newton([0] + f[1:])
+            if g0 != 1:
+                g = [g0 * c for c in g]
+            return type(self)(g)
+        g = [g0]
+        # g' = f' * g
+        for k in xrange(1, n):
+            s = 0
+            for j in xrange(1, k+1):
+                if f[j]:
+                    s += j * f[j] * g[k-j]
+            g.append(div(s, k))
+        return type(self)(g)
+
+    def log(self):
+        f0 = self.coeffs[0]
+        if not f0:
+            raise ValueError('log has a branch point at t=0')
+        return (self.derivative() / self.truncate(self.order-1)).integral(coefficient(defined_functions.Log(f0)))
+
+    def sin_cos(self):
+        """ Return (sin(self), cos(self)).
+        """
+        f = self.coeffs
+        n = len(f)
+        s = [coefficient(defined_functions.Sin(f[0]))]
+        c = [coefficient(defined_functions.Cos(f[0]))]
+        # s' = f' * c, c' = -f' * s
+        for k in xrange(1, n):
+            sk = ck = 0
+            for j in xrange(1, k+1):
+                fj = f[j]
+                if fj:
+                    fj = j * fj
+                    sk += fj * c[k-j]
+                    ck -= fj * s[k-j]
+            s.append(div(sk, k))
+            c.append(div(ck, k))
+        return type(self)(s), type(self)(c)
+
+    def sin(self):
+        return self.sin_cos()[0]
+
+    def cos(self):
+        return self.sin_cos()[1]
+
+    def tan(self):
+        s, c = self.sin_cos()
+        return s / c
+
+    def cot(self):
+        s, c = self.sin_cos()
+        return c / s
+
+    def arcsin(self):
+        f0 = self.coeffs[0]
+        if f0:
+            f0 = coefficient(defined_functions.ArcSin(f0))
+        df = self.derivative()
+        f = self.truncate(df.order)
+        return (df * (1 - f * f).power(div(-1, 2))).integral(f0)
+
+    def power(self, exponent):
+        """ Return ``self**exponent``.
+        """
+        exponent = coefficient(exponent)
+        if isinstance(exponent, inttypes):
+            if exponent < 0:
+                return 1 / self.power(-exponent)
+            r = type(self).constant(1, self.order)
+            f = self
+            while exponent:
+                if exponent & 1:
+                    r = r * f
+                exponent >>= 1
+                if exponent:
+                    f = f * f
+            return r
+        f = self.coeffs
+        n = len(f)
+        f0 = f[0]
+        if not f0:
+            raise ValueError('power has a branch point at t=0')
+        g = [coefficient(Calculus.convert(f0)**exponent)]
+        a1 = exponent + 1
+        # f * g' = exponent * f' * g
+        for k in xrange(1, n):
+            s = 0
+            for j in xrange(1, k+1):
+                if f[j]:
+                    s += (a1 * j - k) * f[j] * g[k-j]
+            g.append(div(s, k * f0))
+        return type(self)(g)
+
+def power_series(expr, x, x0=0, n=6):
+    """ Return PowerSeries of expr in ``t = x - x0`` to order n.
+    """
+    cls = type(expr)
+    x = cls.convert(x)
+    x0 = coefficient(cls.convert(x0))
+    order = n
+    for i in xrange(n + 2):
+        s = SeriesConverter(x.data, x0, order).convert(expr)
+        if s.order >= n:
+            return s.truncate(n)
+        # divisions by series with leading zeros lost precision
+        order += n - s.order
+    raise ValueError('failed to compute %s terms of the series of %s' % (n, expr))
+
+class SeriesConverter(object):
+    """ Converts an expression to PowerSeries, equal subexpressions
+    are converted once.
+    """
+
+    def __init__(self, symbol, x0, order):
+        self.symbol = symbol
+        self.x0 = x0
+        self.order = order
+        self.cache = {}
+
+    def convert(self, expr):
+        s = self.cache.get(expr)
+        if s is None:
+            s = self.cache[expr] = self.visit(expr)
+        return s
+
+    def visit(self, expr):
+        if self.symbol not in expr.symbols_data:
+            return PowerSeries.constant(coefficient(expr), self.order)
+        head, data = expr.pair
+        cls = type(expr)
+        if head is SYMBOL:
+            return PowerSeries.variable(self.x0, self.order)
+        if head is TERM_COEFF_DICT or head is ADD or head is TERM_COEFF:
+            if head is TERM_COEFF_DICT:
+                items = data.iteritems()
+            elif head is ADD:
+                items = [(t, 1) for t in data]
+            else:
+                items = [data]
+            r = None
+            for t, c in items:
+                s = self.convert(t)
+                if c!=1:
+                    s = s * c
+                r = s if r is None else r + s
+            return r
+        if head is BASE_EXP_DICT or head is MUL or head is POW:
+            if head is BASE_EXP_DICT:
+                items = data.iteritems()
+            elif head is MUL:
+                items = [(b, 1) for b in data]
+            else:
+                items = [data]
+            numer = denom = None
+            for b, e in items:
+                e = coefficient(e)
+                if isinstance(e, inttypes) and e < 0:
+                    s = self.power(b, -e)
+                    denom = s if denom is None else denom * s
+                else:
+                    s = self.power(b, e)
+                    numer = s if numer is None else numer * s
+            if denom is None:
+                return numer
+            if numer is None:
+                numer = PowerSeries.constant(1, self.order)
+            return numer / denom
+        if head is APPLY:
+            func, args = data
+            if func.head is CALLABLE and len(args)==1:
+                f = self.convert(args[0])
+                fdata = func.data
+                name = getattr(fdata, '__name__', None)
+                if getattr(defined_functions, str(name), None) is fdata:
+                    method = elementary_methods.get(name)
+                    if method is not None:
+                        return getattr(f, method)()
+                return self.apply(func, f)
+        raise NotImplementedError('series of %s expression' % (head))
+
+    def power(self, base, exp):
+        head, data = base.pair
+        if head is SYMBOL and data == const_E:
+            return self.convert(base.convert(exp)).exp()
+        if hasattr(exp, 'pair') and self.symbol in exp.symbols_data:
+            return (self.convert(exp) * self.convert(base).log()).exp()
+        s = self.convert(base)
+        if exp==1:
+            return s
+        return s.power(exp)
+
+    def apply(self, func, f):
+        """ Return the series of func(f) from the Taylor series of
+        func at the constant term of f.
+        """
+        c0, h = f.shift()
+        fcls = type(func)
+        coeffs = [coefficient(func(c0))]
+        factorial = 1
+        for k in xrange(1, f.order):
+            factorial *= k
+            df = func.head.fdiff(fcls, func.data, func, 0, k)
+            if df is NotImplemented:
+                raise NotImplementedError('series of %s' % (func))
+            coeffs.append(div(coefficient(df(c0)), factorial))
+        return PowerSeries(coeffs).compose(h)
+
+elementary_methods = dict(Log='log', Ln='log', Sin='sin', Cos='cos', Tan='tan',
+                          Cot='cot', ArcSin='arcsin')
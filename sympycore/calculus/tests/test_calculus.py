@@ -10,3 +10,46 @@ def test_factorial():
     assert factorial(0)==1
     
     
+
+def test_identity_operations_share_data():
+    x, y = map(Symbol, 'xy')
+    s = x + 2*y
+    m = x * y**2
+    hash(s), hash(m)
+    assert s + 0 is s
+    assert s * 1 is s
+    assert s * Number(1) is s
+    assert m * Number(1) is m
+    assert m ** 1 is m
+    assert s + 1 == 1 + x + 2*y and s == x + 2*y
+
+def test_identity_operations_copy_writable():
+    x, y = map(Symbol, 'xy')
+    for op in [lambda e: e + 0, lambda e: e - 0, lambda e: e * 1, lambda e: e ** 1]:
+        s = x + 2*y
+        t = op(s)
+        t += x
+        assert s == x + 2*y, `s`
+        assert t == 2*x + 2*y, `t`
+        m = x * y**2
+        t = op(m)
+        t *= x
+        assert m == x * y**2, `m`
+
+def test_identity_operations_copy_on_write():
+    from sympycore.core import using_C_Expr
+    x, y = map(Symbol, 'xy')
+    s = x + 2*y
+    t = s + 0
+    if not using_C_Expr:
+        assert t.data is s.data
+        assert not s.is_writable and not t.is_writable
+    s += x
+    assert s == 2*x + 2*y, `s`
+    assert t == x + 2*y, `t`
+    assert hash(t) == hash(x + 2*y)
+    m = x * y**2
+    t = m ** 1
+    t *= y
+    assert m == x * y**2, `m`
+    assert t == x * y**3, `t`
@@ -0,0 +1,22 @@
+
+from sympycore import *
+
+x, y, z = map(Symbol, 'xyz')
+
+def test_cancel():
+    assert cancel((x**2 - y**2)/(x + y)) == x - y
+    assert ((x**2 - 1)/(x - 1)).cancel() == x + 1
+    assert cancel((x*y + y)/(2*x + 2) + z/3) == y/2 + z/3
+    assert cancel(1/x + 1/y) == (x + y)/(x*y)
+    assert cancel(Number(3,4)) == Number(3,4)
+    assert cancel(x) == x
+    assert cancel(x - x) == 0
+    assert cancel((x**3 - 1)/(1 - x)) == -x**2 - x - 1
+
+def test_cancel_generators():
+    assert cancel(Sin(x)**2/Sin(x)/(x*Sin(x) + Sin(x))) == 1/(x + 1)
+    assert cancel(x**Number(1,2)*(x + 1)/(x**2 + x)) == x**Number(-1,2)
+
+def test_cancel_float():
+    e = 2.5*x/(x*y + x)
+    assert cancel(e) is e
@@ -1,4 +1,5 @@
 from sympycore.calculus import *
+from sympycore.calculus.autodiff import gradient_function, gradient_source
 
 x = Symbol('x')
 n = Symbol('n')
@@ -55,3 +56,26 @@ def test_diff_symbolic_order():
     assert diff(Cos(2*x+3), x, n) == Cos(2*x+3 + n*pi/2) * 2**n, `diff(Cos(2*x+3), x, n)`
     assert diff(Log(2*x+3), x, n) == (-1)**(n-1) * Factorial(n-1) * (3+2*x)**(-n) * 2**n
     assert diff(2**(3*x+4), x, n) == 2**(4+3*x) * 3**n * Log(2)**n
+
+def test_gradient_function():
+    y = Symbol('y')
+    expr = x*Sin(y) + x**2
+    f = gradient_function(expr, [x, y])
+    assert f(2.0, 0.0)==(4.0, (4.0, 2.0))
+    assert f(0.0, 0.0)==(0.0, (0.0, 0.0))
+    expr = Exp(x*y) + Log(x)/y + Sqrt(x+y)*Cos(x)**3 + 3*x*y**2*Sin(y)
+    f = gradient_function(expr, [x, y, n])
+    value, gradient = f(1.25, 0.5, 7)
+    # reference values do not depend on the global mpmath precision
+    from math import exp, log, sqrt, sin, cos
+    a, b = 1.25, 0.5
+    assert abs(value - (exp(a*b) + log(a)/b + sqrt(a+b)*cos(a)**3 + 3*a*b**2*sin(b))) < 1e-12
+    assert gradient[2]==0.0
+    dx = b*exp(a*b) + 1/(a*b) + cos(a)**3/(2*sqrt(a+b)) - 3*sqrt(a+b)*cos(a)**2*sin(a) + 3*b**2*sin(b)
+    dy = a*exp(a*b) - log(a)/b**2 + cos(a)**3/(2*sqrt(a+b)) + 6*a*b*sin(b) + 3*a*b**2*cos(b)
+    assert abs(gradient[0] - dx) < 1e-12, `gradient[0], dx`
+    assert abs(gradient[1] - dy) < 1e-12, `gradient[1], dy`
+    assert gradient_function(x, [x])(3.0)==(3.0, (1.0,))
+    assert gradient_function(Number(2), [x])(3.0)==(2, (0.0,))
+    assert 'def g(x0, x1)' in gradient_source(x*y, [x, y], name='g')
+    assert repr(exp(1.0)) in gradient_source(Exp(x), [x])
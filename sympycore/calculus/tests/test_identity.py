@@ -0,0 +1,37 @@
+from sympycore import *
+from sympycore.calculus.identity import ZeroTester
+
+x, y = map(Symbol, 'xy')
+
+def test_is_zero():
+    assert is_zero((x + y)**20 - (y + x)**10 * (x + y)**10)
+    assert not is_zero((x + y)**20 - (y + x)**10 * (x + y)**10 - x)
+    assert is_zero((x**2 - y**2)/(x - y) - x - y)
+    assert is_zero(1/(x - 1) + 1/(x + 1) - 2*x/(x**2 - 1))
+    assert is_zero(Sin(x)**2 + Cos(x)**2 - 1)
+    assert not is_zero(Sin(x)**2 + Cos(x)**2 - 2)
+    assert is_zero(Exp(x + y) - Exp(x)*Exp(y))
+    assert is_zero(0)
+    assert not is_zero(x, method='structural')
+    assert is_zero((x + 1)**2 - x**2 - 2*x - 1, method='structural')
+    assert is_zero(Sin(x) - Cos(x), method='modular') is None
+    assert is_zero(Sin(x)**2 + Cos(x)**2 - 1, method='modular') is None
+    assert is_zero(x**2 - y, method='modular') is False
+    assert is_zero(x*0.5 - y, method='modular') is None
+
+def test_zero_tester():
+    tester = ZeroTester(error=1e-30, seed=2)
+    assert tester((x + 1)**3 - (x**3 + 3*x**2 + 3*x + 1))
+    assert tester(Log(x*y) - Log(x) - Log(y))
+    assert not tester(Log(x + y) - Log(x) - Log(y))
+
+def test_equals():
+    assert (Sin(2*x)).equals(2*Sin(x)*Cos(x))
+    assert not (Sin(2*x)).equals(2*Sin(x))
+    assert ((x + y)**2).equals(x**2 + 2*x*y + y**2)
+
+def test_small_values():
+    assert not is_zero(Sin(x)/10**12)
+    assert not is_zero(E**x/10**10)
+    assert not is_zero((Sin(x) - x)/10**11)
+    assert is_zero((Sin(x)**2 + Cos(x)**2 - 1)/10**12)
@@ -25,3 +25,20 @@ def test_integrate_defined():
         f1 = f.subs(x,5)-f.subs(x,2)
         f2 = g.integrate((x,2,5))
         assert f2==f1,`str(g), str(f), str(f1), str(f2)`
+
+def test_integral_memo():
+    from sympycore.ring.integration import IntegralMemo, integral_memo
+    z = Symbol('z')
+    integral_memo.clear()
+    r = (x**2*(1+y+2*z)).expand().integrate(x)
+    assert r == (x**3*(1+y+2*z)/3).expand(),`r`
+    assert (integral_memo.hits, integral_memo.misses)==(0, 2)
+    assert (-5*x**2).integrate(x) == -5*x**3/3
+    assert integral_memo.hits==1
+    memo = IntegralMemo(maxsize=2)
+    for i in range(3):
+        memo.set(i, i)
+    assert len(memo)==2 and memo.evictions==1
+    assert memo.get(0) is None and memo.get(1)==1
+    memo.set(3, 3)
+    assert memo.get(1)==1 and memo.get(2) is None
@@ -0,0 +1,40 @@
+from sympycore import *
+
+x, y = map(Symbol, 'xy')
+
+def test_power_series():
+    t = PowerSeries.variable(0, 8)
+    assert map(Number, t.tan().coeffs) == [0, 1, 0, Number(1,3), 0, Number(2,15), 0, Number(17,315)]
+    assert t.exp().log() == t
+    assert t.sin().arcsin() == t
+    assert t.exp().compose(t.sin()) == t.sin().exp()
+    f = PowerSeries([1, 2, 3, 4, 5, 6])
+    assert (f * f.reciprocal()).coeffs == [1, 0, 0, 0, 0, 0]
+    assert f.power(Number(1,2))**2 == f
+    assert f**-2 * f**2 == PowerSeries([1, 0, 0, 0, 0, 0])
+    assert map(Number, (t.sin() / t).coeffs) == [1, 0, Number(-1,6), 0, Number(1,120), 0, Number(-1,5040)]
+    big = PowerSeries.variable(1, 100)
+    assert (big * big.reciprocal()).coeffs == [1] + [0] * 99
+
+def test_series():
+    assert Exp(x).series(x, 0, 4) == 1 + x + x**2/2 + x**3/6
+    assert Tan(x).series(x, 0, 8) == x + x**3/3 + 2*x**5/15 + 17*x**7/315
+    assert (Sin(x)/x).series(x, 0, 5) == 1 - x**2/6 + x**4/120
+    assert Log(1 + x).series(x, 0, 4) == x - x**2/2 + x**3/3
+    assert Sqrt(1 + x).series(x, 0, 3) == 1 + x/2 - x**2/8
+    assert (1/(1 - x)).series(x, 0, 4) == 1 + x + x**2 + x**3
+    assert Exp(Sin(x)).series(x, 0, 5) == 1 + x + x**2/2 - x**4/8
+    assert (x**2 + y*x).series(x, 0, 3) == x**2 + y*x
+    assert Exp(x).series(x, 1, 3) == E + E*(x - 1) + E*(x - 1)**2/2
+    assert Log(x).series(x, 1, 3) == (x - 1) - (x - 1)**2/2
+    assert ArcSin(x).series(x, 0, 6) == x + x**3/6 + 3*x**5/40
+
+def test_long_series():
+    from sympycore.arithmetic.numbers import mpq
+    from sympycore.calculus.series import mul_coeffs
+    t = PowerSeries.variable(0, 70)
+    f = t.sin() + PowerSeries([mpq((1, 3))] * 70) * t * t
+    assert f.exp().log() == f
+    assert (f.exp() * (-f).exp()).coeffs == [1] + [0] * 69
+    g = [mpq((k + 1, 2*k + 3)) for k in range(70)]
+    assert mul_coeffs(g, g, 70) == [sum([g[i]*g[k-i] for i in range(k+1)]) for k in range(70)]
@@ -215,6 +215,29 @@ class Holder:
             self._counter += 1
         self.__dict__[name] = obj
 
+    def __getattr__(self, name):
+        # called only when name is not set, see set_lazy
+        lazy = self.__dict__.get('_lazy')
+        if lazy is not None and name in lazy:
+            __import__(lazy.pop(name))
+            init_module.execute()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError('%s has no attribute %r' % (self, name))
+
+    def set_lazy(self, name, module_name):
+        """ Import module module_name when name is accessed for the
+        first time. The module is expected to set the name.
+        """
+        if name not in self.__dict__:
+            self.__dict__.setdefault('_lazy', {})[name] = module_name
+
+    def is_loaded(self, name):
+        """ Check if name is set. Unlike hasattr, lazy names are not
+        imported.
+        """
+        return name in self.__dict__
+
     def iterNameValue(self):
         for k,v in self.__dict__.iteritems():
             if k.startswith('_'):
@@ -73,6 +73,16 @@ not been computed::
   									
     <Expr>.is_writable -> True or False				
   									
+Concurrency: in-place operations (``+=``, ``*=``) modify the data of
+a writable left operand without checking which threads can see it.
+Sharing a writable expression between threads is the responsibility
+of the caller: compute its hash value, ``hash(<Expr>)``, before the
+expression is shared, then in-place operations work on copies. The
+shared tables of sympycore (head singletons, factorials, BDD nodes,
+the integral memo) are updated atomically or while holding a lock,
+so that independent expressions can be processed in concurrent
+threads.
+
 There are two ways to access the parts of a Expr instance from	
 Python::								
   									
@@ -114,7 +124,7 @@ This is Python version of Expr type.
         dictionary values contain dictionaries.
         """
         h = self._hash
-        if h is None:
+        if h is None or h is False:
             pair = self.pair
             obj = self.as_lowlevel()
             if obj is not pair:
@@ -142,6 +152,19 @@ This is Python version of Expr type.
                 return data.is_writable
         return False
 
+    def freeze(self):
+        """ Make expression read-only without computing its hash value
+        and return it.
+
+        The data of a read-only expression can be shared by other
+        expressions because in-place operations copy it on first
+        write. Not available in expr_ext.Expr where only computing the
+        hash value makes an expression read-only.
+        """
+        if self._hash is None:
+            self._hash = False
+        return self
+
     @property
     def head(self):
         return self.pair[0]
@@ -170,12 +193,12 @@ This is Python version of Expr type.
         from sympycore.core import _reconstruct
         if version==1:
             hashvalue = self._hash
-            if hashvalue is None:
+            if hashvalue is None or hashvalue is False:
                 hashvalue = -1
             state = (type(self), self.pair, hashvalue)
         elif version==2 or version==3:
             hashvalue = self._hash
-            if hashvalue is None:
+            if hashvalue is None or hashvalue is False:
                 hashvalue = -1
             cls = type(self)
             typ = type(cls)
@@ -481,6 +504,41 @@ def dict_mul_value(Algebra, d, value):
         else:
             del d[t]
 
+def base_exp_dict_add_power(Algebra, d, base, exp):
+    """ Add base**exp to d. The factors of a product base are added
+    separately when exp is an integer so that d stays canonical.
+    """
+    if base.head is BASE_EXP_DICT and isinstance(exp, inttypes):
+        for b, e in base.data.iteritems():
+            e = e * exp
+            if b.head is NUMBER and isinstance(e, inttypes):
+                base_exp_dict_add_item(Algebra, d, b ** e, 1)
+            else:
+                base_exp_dict_add_item(Algebra, d, b, e)
+    else:
+        base_exp_dict_add_item(Algebra, d, base, exp)
+
+def term_coeff_dict_add_multinomial(Algebra, d, term_coeff_list, mdata):
+    """ Add the terms of multinomial expansion to d. term_coeff_list
+    contains ((base, exp), coeff) items of the terms of a sum, mdata
+    maps exponent tuples to multinomial coefficients.
+    """
+    for e,c in mdata.iteritems():
+        new_coeff = c
+        df = {}
+        for e_i, ((base, exp), coeff) in zip(e, term_coeff_list):
+            if e_i:
+                if e_i==1:
+                    base_exp_dict_add_power(Algebra, df, base, exp)
+                    if coeff is not 1:
+                        new_coeff *= coeff
+                else:
+                    base_exp_dict_add_power(Algebra, df, base, exp*e_i)
+                    if coeff is not 1:
+                        new_coeff *= coeff ** e_i
+        new_term = base_exp_dict_new(Algebra, df)
+        term_coeff_dict_add_item(Algebra, d, new_term, new_coeff)
+
 term_coeff_dict_mul_dict = dict_mul_dict
 base_exp_dict_mul_value = dict_mul_value
 term_coeff_dict_mul_value = dict_mul_value
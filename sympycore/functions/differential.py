@@ -94,12 +94,14 @@ classes.DifferentialRing = DifferentialRing
 
 class FDFactory(object):
 
-    def __new__(cls, DAlgebra=DifferentialRing, _cache={}):
-        obj = _cache.get(DAlgebra)
+    _cache = {}
+
+    def __new__(cls, DAlgebra=DifferentialRing):
+        obj = cls._cache.get(DAlgebra)
         if obj is None:
             obj = object.__new__(cls)
             obj.DAlgebra = DAlgebra
-            _cache[DAlgebra] = obj
+            obj = cls._cache.setdefault(DAlgebra, obj)
         return obj
     def __str__(self): return 'FD'
     def __repr__(self): return 'FDFactory(%s)' % (self.DAlgebra.__name__)
@@ -108,12 +110,14 @@ class FDFactory(object):
 
 class DFactory(object):
 
-    def __new__(cls, DAlgebra=DifferentialRing, _cache={}):
-        obj = _cache.get(DAlgebra)
+    _cache = {}
+
+    def __new__(cls, DAlgebra=DifferentialRing):
+        obj = cls._cache.get(DAlgebra)
         if obj is None:
             obj = object.__new__(cls)
             obj.DAlgebra = DAlgebra
-            _cache[DAlgebra] = obj
+            obj = cls._cache.setdefault(DAlgebra, obj)
         return obj
     def __str__(self): return 'D'
     def __repr__(self): return 'DFactory(%s)' % (self.DAlgebra.__name__)
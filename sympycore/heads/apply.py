@@ -89,7 +89,9 @@ class ApplyHead(FunctionalHead):
     def expand_intpow(self, cls, base, exp):
         return cls(POW, (base, exp))
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
+        if cache is None:
+            cache = {}
         key = (expr, symbol, order)
         result = cache.get(key)
         if result is not None:
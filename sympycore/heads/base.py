@@ -106,7 +106,8 @@ class Head(object):
             obj._key = key
             obj.init(*args)
             if cls.is_singleton:
-                cls._cache[key] = obj
+                # setdefault is atomic, concurrent callers get the same instance
+                obj = cls._cache.setdefault(key, obj)
                 setattr(heads, repr(obj), obj)
         return obj
 
@@ -229,6 +230,22 @@ class Head(object):
     # track down. However, final derived classes may define ``rop_mth
     # = op_mth`` for efficiency.
 
+    def unchanged(self, cls, expr):
+        """
+        Return expr as the result of an identity operation such as
+        ``expr + 0``. Writable expr is made read-only so that the
+        result shares its data until an in-place operation on either
+        of them copies the data. expr_ext.Expr instances cannot be made
+        read-only without computing the hash value, so their data is
+        copied.
+        """
+        if expr.is_writable:
+            freeze = getattr(expr, 'freeze', None)
+            if freeze is None:
+                return cls(self, expr.data.copy())
+            return freeze()
+        return expr
+
     def neg(self, cls, expr):
         """
         Return the result of negation on given expression: -expr.
@@ -100,6 +100,9 @@ class BaseExpDictHead(ArithmeticHead):
             raise NotImplementedError(`self, cls, rhs.pair`)
     
     def commutative_mul(self, cls, lhs, rhs):
+        rhead, rdata = rhs.pair
+        if rhead is NUMBER and rdata==1:
+            return self.unchanged(cls, lhs)
         data = lhs.data.copy()
         self.inplace_commutative_data_mul(cls, data, rhs)
         return base_exp_dict_new(cls, data)
@@ -172,6 +175,8 @@ class BaseExpDictHead(ArithmeticHead):
             if h is NUMBER and isinstance(d, numbertypes):
                 exp = d
         if isinstance(exp, inttypes):
+            if exp==1:
+                return self.unchanged(cls, base)
             if exp:
                 data = base.data.copy()
                 base_exp_dict_mul_value(cls, data, exp)
@@ -199,7 +204,9 @@ class BaseExpDictHead(ArithmeticHead):
                 data = data2
         return term_coeff_dict_new(cls, data)
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
+        if cache is None:
+            cache = {}
         key = (expr, symbol, order)
         result = cache.get(key)
         if result is not None:
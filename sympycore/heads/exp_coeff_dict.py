@@ -11,7 +11,9 @@ init_module.import_lowlevel_operations()
 @init_module
 def _init(module):
     from ..arithmetic.number_theory import multinomial_coefficients
+    from ..arithmetic import monomials
     module.multinomial_coefficients = multinomial_coefficients
+    module.monomials = monomials
 
 class ExpCoeffDict(ArithmeticHead):
     """
@@ -199,14 +201,15 @@ class ExpCoeffDict(ArithmeticHead):
         if rhead is EXP_COEFF_DICT:
             rvars, rdict = rdata.pair
             d = {}
-            if lvars == rvars:
+            if lvars != rvars:
+                lvars = tuple(sorted(set(lvars + rvars)))
+                ldict = self.to_EXP_COEFF_DICT(cls, lhs.data, lhs, lvars).data[1]
+                rdict = self.to_EXP_COEFF_DICT(cls, rhs.data, rhs, lvars).data[1]
+            if len(ldict) * len(rdict) >= monomials.PACKED_MUL_THRESHOLD:
+                d = monomials.mul_exp_coeff_dicts(ldict, rdict, len(lvars))
+            else:
                 exp_coeff_dict_mul_dict(cls, d, ldict, rdict)
-                return cls(self, Pair(lvars, d))
-            variables = tuple(sorted(set(lvars + rvars)))
-            lhs = self.to_EXP_COEFF_DICT(cls, lhs.data, lhs, variables)
-            rhs = self.to_EXP_COEFF_DICT(cls, rhs.data, rhs, variables)
-            exp_coeff_dict_mul_dict(cls, d, lhs.data[1], rhs.data[1])
-            return cls(self, Pair(variables, d))
+            return cls(self, Pair(lvars, d))
         raise NotImplementedError(`self, rhs.head`)
 
     def commutative_mul_number(self, cls, lhs, rhs):
@@ -321,6 +324,9 @@ class ExpCoeffDict(ArithmeticHead):
                 return cls(self, Pair(variables, {(0,)*len(variables):1}))
             if exp==1:
                 return base
+            if exp>1 and len(exp_coeff_dict) > 1:
+                d = monomials.pow_exp_coeff_dict(exp_coeff_dict, exp, len(variables))
+                return cls(self, Pair(variables, d))
             if exp>1:
                 exps_coeff_list = base.data.data.items()
                 m = len(variables)
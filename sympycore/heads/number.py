@@ -206,7 +206,7 @@ class NumberHead(AtomicHead):
     def expand(self, cls, expr):
         return expr
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
         #if isinstance(data, Expr):
         #    return cls(NUMBER, data.head.diff(type(data), data.data, data, symbol, order))
         return cls(NUMBER, 0)
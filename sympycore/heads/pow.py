@@ -271,7 +271,9 @@ class PowHead(ArithmeticHead):
                 return base.head.expand_intpow(cls, base, exp)
         return cls(POW, (base, exp))
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
+        if cache is None:
+            cache = {}
         # XXXX needs implementatiin
         key = (expr, symbol, order)
         result = cache.get(key)
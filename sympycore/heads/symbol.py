@@ -66,7 +66,7 @@ class SymbolHead(AtomicHead):
             return cls(NUMBER, 1)
         return cls(POW, (expr, intexp))
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
         if order==0:
             return expr
         if data == symbol:
@@ -249,7 +249,7 @@ class TermCoeff(ArithmeticHead):
         term, coeff  = expr.data
         return term.head.expand(cls, term) * coeff
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
         term, coeff = data
         return term.head.diff(cls, term.data, term, symbol, order, cache=cache) * coeff
 
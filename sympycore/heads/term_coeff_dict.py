@@ -11,7 +11,9 @@ init_module.import_lowlevel_operations()
 @init_module
 def _init(module):
     from ..arithmetic.number_theory import multinomial_coefficients
+    from ..ring.integration import integrate_sum
     module.multinomial_coefficients = multinomial_coefficients
+    module.integrate_sum = integrate_sum
 
 class TermCoeffDictHead(ArithmeticHead):
 
@@ -72,12 +74,14 @@ class TermCoeffDictHead(ArithmeticHead):
         return term_coeff_dict_new(cls, data)
 
     def add(self, cls, lhs, rhs, inplace=False):
+        h2, d2 = rhs.pair
         if inplace:
             data = lhs
+        elif h2 is NUMBER and d2 == 0:
+            return self.unchanged(cls, lhs)
         else:
             data = lhs.data.copy()
         
-        h2, d2 = rhs.pair
         if h2 is NUMBER:
             if d2 != 0:
                 dict_add_item(cls, data, cls(NUMBER, 1), d2)
@@ -116,14 +120,14 @@ class TermCoeffDictHead(ArithmeticHead):
 
     def add_number(self, cls, lhs, rhs):
         if rhs==0:
-            return lhs
+            return self.unchanged(cls, lhs)
         data = lhs.data.copy()
         term_coeff_dict_add_item(cls, data, cls(NUMBER, 1), rhs)
         return term_coeff_dict_new(cls, data)
 
     def sub_number(self, cls, lhs, rhs):
         if rhs==0:
-            return lhs
+            return self.unchanged(cls, lhs)
         data = lhs.data.copy()
         term_coeff_dict_add_item(cls, data, cls(NUMBER, 1), -rhs)
         return term_coeff_dict_new(cls, data)
@@ -138,6 +142,8 @@ class TermCoeffDictHead(ArithmeticHead):
         if rhead is NUMBER:
             if rdata==0:
                 return rhs
+            if rdata==1:
+                return self.unchanged(cls, lhs)
             data = lhs.data.copy()
             dict_mul_value(cls, data, rdata)
             return term_coeff_dict_new(cls, data)
@@ -166,6 +172,8 @@ class TermCoeffDictHead(ArithmeticHead):
     def commutative_mul_number(self, cls, lhs, rhs):
         if rhs==0:
             return cls(NUMBER, 0)
+        if rhs==1:
+            return self.unchanged(cls, lhs)
         data = lhs.data.copy()
         dict_mul_value(cls, data, rhs)
         return cls(self, data)
@@ -203,7 +211,7 @@ class TermCoeffDictHead(ArithmeticHead):
         
     def pow(self, cls, base, exp):
         if exp==0: return cls(NUMBER, 1)
-        if exp==1: return base
+        if exp==1: return self.unchanged(cls, base)
         d = base.data
         if len(d)==1:
             t,c = dict_get_item(d)
@@ -237,21 +245,7 @@ class TermCoeffDictHead(ArithmeticHead):
         term_coeff_list = [(term.base_exp(), coeff) for term, coeff in expr.data.items()]
         mdata = multinomial_coefficients(len(term_coeff_list), intexp)
         d = {}
-        for e,c in mdata.iteritems():
-            new_coeff = c
-            df = {}
-            for e_i, ((base, exp), coeff) in zip(e, term_coeff_list):
-                if e_i:
-                    if e_i==1:
-                        base_exp_dict_add_item(cls, df, base, exp)
-                        if coeff is not 1:
-                            new_coeff *= coeff
-                    else:
-                        base_exp_dict_add_item(cls, df, base, exp*e_i)
-                        if coeff is not 1:
-                            new_coeff *= coeff ** e_i
-            new_term = base_exp_dict_new(cls, df)
-            term_coeff_dict_add_item(cls, d, new_term, new_coeff)
+        term_coeff_dict_add_multinomial(cls, d, term_coeff_list, mdata)
         return term_coeff_dict_new(cls, d)
 
     def walk(self, func, cls, data, target):
@@ -281,7 +275,9 @@ class TermCoeffDictHead(ArithmeticHead):
                 NUMBER.scan(proc, cls, c, target)
         proc(cls, self, data, target)
 
-    def diff(self, cls, data, expr, symbol, order, cache={}):
+    def diff(self, cls, data, expr, symbol, order, cache=None):
+        if cache is None:
+            cache = {}
         key = (expr, symbol, order)
         result = cache.get(key)
         if result is not None:
@@ -302,10 +298,7 @@ class TermCoeffDictHead(ArithmeticHead):
         return result
 
     def integrate_indefinite(self, cls, data, expr, x):
-        result = cls(NUMBER, 0)
-        for term, coeff in data.iteritems():
-            result += term.head.integrate_indefinite(cls, term.data, term, x) * coeff
-        return result
+        return integrate_sum(cls, data, x)
 
     def integrate_definite(self, cls, data, expr, x, a, b):
         result = cls(NUMBER, 0)
@@ -326,7 +319,7 @@ class TermCoeffDictHead(ArithmeticHead):
 
     def algebra_add_number(self, Algebra, lhs, rhs, inplace):
         if not rhs:
-            return lhs
+            return lhs if inplace else self.unchanged(Algebra, lhs)
         if inplace:
             term_coeff_dict_add_item(Algebra, lhs.data, Algebra(NUMBER, 1), rhs)
             return term_coeff_dict(Algebra, lhs)
@@ -343,7 +336,7 @@ class TermCoeffDictHead(ArithmeticHead):
                 rhead, rdata = rhs.pair
             if rhead is NUMBER:
                 if not rdata:
-                    return lhs
+                    return lhs if inplace else self.unchanged(Algebra, lhs)
                 rterm, rcoeff = Algebra(NUMBER, 1), rdata
             elif rhead is SYMBOL:
                 rterm, rcoeff = rhs, 1
@@ -374,7 +367,7 @@ class TermCoeffDictHead(ArithmeticHead):
             if not rhs:
                 return Algebra(NUMBER, 0)
             if rhs==1:
-                return lhs
+                return lhs if inplace else self.unchanged(Algebra, lhs)
             if inplace:
                 term_coeff_dict_mul_value(Algebra, lhs.data, rhs)
                 return lhs
@@ -392,7 +385,7 @@ class TermCoeffDictHead(ArithmeticHead):
     def algebra_div_number(self, Algebra, lhs, rhs, inplace):
         if Algebra.algebra_options.get('evaluate_addition'):
             if rhs==1:
-                return lhs
+                return lhs if inplace else self.unchanged(Algebra, lhs)
             d1 = gcd(*lhs.data.values())
             d2 = gcd(d1, rhs)
             d3 = rhs / d2
@@ -0,0 +1,291 @@
+""" Provides opt-in instrumentation of Head methods and Expr construction.
+
+The instrumentation counts calls and accumulates time per ``(head,
+method)`` pair. When enabled, the methods of instrumented classes are
+replaced by counting wrappers and the original methods are restored
+when disabled, so that there is no overhead when the instrumentation
+is not used.
+
+For example,
+
+>>> from sympycore.instrumentation import Instrumentation
+>>> with Instrumentation() as report:
+...     ((x+y)**10).expand()
+...
+>>> print report.tostr(limit=3)
+head                     method                            calls     total(s)      self(s)
+POW                      expand                                1     0.000300     0.000007
+TERM_COEFF_DICT          expand_intpow                         1     0.000261     0.000134
+Calculus                 __init__                             54     0.000209     0.000080
+... 11 more entries
+>>> report.sorted('calls')[0]
+ReportEntry('Calculus', '__hash__', 97, 0.000077, 0.000077)
+
+Add ``from __future__ import with_statement`` to the header of
+python file when using Python version 2.5.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['Instrumentation', 'enable_instrumentation', 'disable_instrumentation',
+           'reset_instrumentation', 'get_report', 'Report', 'ReportEntry']
+
+import types
+import timeit
+
+from .core import Expr
+from .heads.base import Head
+from .arithmetic.numbers import mpq, mpqc
+
+_timer = timeit.default_timer
+
+# Methods that are never instrumented, the wrappers rely on them:
+_skip_methods = set(['__repr__', '__str__', '__new__', '__del__',
+                     '__getattr__', '__getattribute__', '__setattr__'])
+
+class _State:
+
+    def __init__(self):
+        # maps (<head or class name>, <method name>) to
+        # [<number of calls>, <total time>, <self time>]:
+        self.stats = {}
+        self.active = {}
+        self.stack = []
+        self.saved = []
+        self.labels = {}
+
+    def label(self, obj):
+        """ Return name of obj used in reports.
+        """
+        key = id(obj)
+        l = self.labels.get(key)
+        if l is None:
+            if isinstance(obj, Head):
+                l = repr(obj)
+                # heads are singletons, so caching by id is safe
+                self.labels[key] = l
+            else:
+                l = type(obj).__name__
+        return l
+
+    def make_wrapper(self, func, name):
+        stats = self.stats
+        active = self.active
+        stack = self.stack
+        label = self.label
+        timer = _timer
+        def wrapper(obj, *args, **kws):
+            key = (label(obj), name)
+            depth = active.get(key, 0)
+            active[key] = depth + 1
+            frame = [0.0]
+            stack.append(frame)
+            start = timer()
+            try:
+                return func(obj, *args, **kws)
+            finally:
+                elapsed = timer() - start
+                stack.pop()
+                active[key] = depth
+                s = stats.get(key)
+                if s is None:
+                    s = stats[key] = [0, 0.0, 0.0]
+                s[0] += 1
+                if not depth:
+                    # recursive calls are included in the outermost call
+                    s[1] += elapsed
+                s[2] += elapsed - frame[0]
+                if stack:
+                    stack[-1][0] += elapsed
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def enable(self, targets):
+        for cls, names in targets:
+            if names is None:
+                names = [n for n, v in cls.__dict__.items() \
+                         if isinstance(v, types.FunctionType) and n not in _skip_methods]
+            for name in names:
+                func = cls.__dict__.get(name)
+                if not isinstance(func, types.FunctionType):
+                    continue
+                try:
+                    setattr(cls, name, self.make_wrapper(func, name))
+                except TypeError:
+                    # extension types do not allow setting attributes
+                    continue
+                self.saved.append((cls, name, func))
+
+    def disable(self):
+        while self.saved:
+            cls, name, func = self.saved.pop()
+            setattr(cls, name, func)
+        self.active.clear()
+        del self.stack[:]
+
+_state = _State()
+
+def _iter_subclasses(cls):
+    yield cls
+    for c in cls.__subclasses__():
+        for c1 in _iter_subclasses(c):
+            yield c1
+
+def get_default_targets():
+    """ Return a list of ``(cls, method names)`` pairs instrumented by
+    default: methods of all Head classes, Expr construction and
+    hashing, and mpq, mpqc arithmetic. None as method names means all
+    methods defined in cls.
+    """
+    targets = []
+    seen = set()
+    for cls in _iter_subclasses(Head):
+        if cls not in seen:
+            seen.add(cls)
+            targets.append((cls, None))
+    targets.append((Expr, ['__init__', '__hash__']))
+    targets.append((mpq, None))
+    targets.append((mpqc, None))
+    return targets
+
+def enable_instrumentation(targets=None):
+    """ Start counting calls of methods defined in targets.
+
+    targets is a list of ``(cls, method names)`` pairs, see
+    get_default_targets. Calling enable_instrumentation when
+    instrumentation is already enabled has no effect.
+    """
+    if _state.saved:
+        return
+    if targets is None:
+        targets = get_default_targets()
+    _state.enable(targets)
+
+def disable_instrumentation():
+    """ Stop counting calls, restore original methods.
+    """
+    _state.disable()
+
+def is_instrumentation_enabled():
+    return bool(_state.saved)
+
+def reset_instrumentation():
+    """ Clear collected statistics.
+    """
+    _state.stats.clear()
+
+def get_report():
+    """ Return a Report of statistics collected so far.
+    """
+    return Report(_state.stats)
+
+class ReportEntry(tuple):
+    """ Holds statistics of ``(head, method)`` pair.
+
+    Attributes: head, method, calls, total (time including the time
+    spent in called instrumented methods), self (time excluding it).
+    """
+
+    __slots__ = []
+
+    def __new__(cls, head, method, calls, total, self_time):
+        return tuple.__new__(cls, (head, method, calls, total, self_time))
+
+    head = property(lambda e: e[0])
+    method = property(lambda e: e[1])
+    calls = property(lambda e: e[2])
+    total = property(lambda e: e[3])
+    self = property(lambda e: e[4])
+
+    def __repr__(self):
+        return '%s%s' % (type(self).__name__, tuple.__repr__(self))
+
+class Report(object):
+    """ Holds statistics of instrumented methods.
+    """
+
+    def __init__(self, stats=None):
+        self.entries = []
+        if stats is not None:
+            self.update(stats)
+
+    def update(self, stats, previous=None):
+        """ Set report entries from stats. If previous stats are given
+        then report the differences.
+        """
+        entries = []
+        for (head, method), (calls, total, self_time) in stats.iteritems():
+            if previous is not None and (head, method) in previous:
+                calls0, total0, self_time0 = previous[head, method]
+                calls -= calls0
+                total -= total0
+                self_time -= self_time0
+            if calls:
+                entries.append(ReportEntry(head, method, calls, total, self_time))
+        self.entries = entries
+        return self
+
+    def sorted(self, key='total', reverse=None):
+        """ Return a list of report entries sorted by key.
+
+        key can be ``'head'``, ``'method'``, ``'calls'``, ``'total'``
+        or ``'self'``. Numerical keys are sorted in decreasing order by
+        default.
+        """
+        if reverse is None:
+            reverse = key in ['calls', 'total', 'self']
+        getter = getattr(ReportEntry, key).fget
+        return sorted(self.entries, key=getter, reverse=reverse)
+
+    def get(self, head, method):
+        """ Return report entry of ``(head, method)`` or None.
+        """
+        for entry in self.entries:
+            if entry.head==head and entry.method==method:
+                return entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.sorted())
+
+    def tostr(self, key='total', limit=30):
+        lines = ['%-24s %-28s %10s %12s %12s' % ('head', 'method', 'calls', 'total(s)', 'self(s)')]
+        entries = self.sorted(key)
+        for entry in entries[:limit]:
+            lines.append('%-24s %-28s %10d %12.6f %12.6f' % entry)
+        if len(entries) > limit:
+            lines.append('... %s more entries' % (len(entries) - limit))
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.tostr()
+
+class Instrumentation:
+    """ Context for collecting call statistics of Head methods.
+
+    The context returns a Report instance that is filled with the
+    statistics collected within the context when the context exits.
+    See sympycore.instrumentation module documentation for an example.
+
+    Add ``from __future__ import with_statement`` to the header of
+    python file when using Python version 2.5.
+    """
+
+    def __init__(self, targets=None):
+        self.targets = targets
+        self.report = Report()
+
+    def __enter__(self):
+        self.enabled = not is_instrumentation_enabled()
+        if self.enabled:
+            enable_instrumentation(self.targets)
+        self.previous = dict([(key, tuple(value)) for key, value in _state.stats.iteritems()])
+        return self.report
+
+    def __exit__(self, type, value, tb):
+        self.report.update(_state.stats, self.previous)
+        if self.enabled:
+            disable_instrumentation()
+        return tb is None
@@ -2,6 +2,7 @@
 from ..core import classes
 from ..utils import EQ, NE, LT, LE, GT, GE, SYMBOL, AND, NOT, OR, NUMBER, IN, NOTIN
 from ..basealgebra import Algebra, Verbatim
+from .bdd import default_bdd
 
 head_mth_map = {
     EQ: Algebra.__eq__,
@@ -273,6 +274,50 @@ class Logic(Algebra):
 
     #XXX: Xor, Implies, Equiv
 
+    def as_bdd(self, bdd=None):
+        """ Return the node of expression in a BDD, see sympycore.logic.bdd.
+        """
+        if bdd is None:
+            bdd = default_bdd
+        return bdd.from_logic(self)
+
+    def simplify(self, bdd=None):
+        """ Return canonical form of expression. Equivalent
+        expressions have the same canonical form.
+        """
+        if bdd is None:
+            bdd = default_bdd
+        return bdd.to_logic(type(self), bdd.from_logic(self))
+
+    def is_satisfiable(self, bdd=None):
+        """ Check if expression is true for some truth values of
+        its atoms.
+        """
+        return self.as_bdd(bdd)!=0
+
+    def is_tautology(self, bdd=None):
+        """ Check if expression is true for all truth values of
+        its atoms.
+        """
+        return self.as_bdd(bdd)==1
+
+    def is_equivalent(self, other, bdd=None):
+        """ Check if expressions have the same truth values for all
+        truth values of their atoms.
+        """
+        other = self.convert(other)
+        if bdd is None:
+            bdd = default_bdd
+        return bdd.from_logic(self)==bdd.from_logic(other)
+
+    def satisfy_one(self, bdd=None):
+        """ Return a dictionary of atom truth values that makes
+        expression true, or None when expression is not satisfiable.
+        """
+        if bdd is None:
+            bdd = default_bdd
+        return bdd.satisfy_one(bdd.from_logic(self))
+
 Logic.one = Logic.true = Logic(NUMBER, True)
 Logic.zero = Logic.false = Logic(NUMBER, False)
 classes.Logic = Logic
@@ -0,0 +1,270 @@
+""" Provides reduced ordered binary decision diagrams (BDD) for Logic
+expressions.
+
+A BDD represents a boolean function of atoms. The atoms of Logic
+expressions are boolean symbols and relational subexpressions such as
+``x<y`` or ``x==y``. Negated relations are represented by the same
+atom as the relation: ``x>=y`` is the negation of the atom ``x<y``
+and ``x>y`` is the atom ``y<x``. Atoms are numbered in the order
+they are seen for the first time.
+
+Nodes are integers: 0 and 1 are the false and true terminals, other
+nodes are kept in a unique table so that equivalent functions are
+represented by the same node. Hence equivalence is a comparison of
+integers, and a function is satisfiable if its node is not 0.
+
+For example,
+
+>>> from sympycore.logic.bdd import BDD
+>>> bdd = BDD()
+>>> f = bdd.from_logic(Logic('x<y or (x>=y and z)'))
+>>> f == bdd.from_logic(Logic('x<y or z'))
+True
+>>> bdd.to_logic(Logic, f) == Logic('x<y or z')
+True
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['BDD', 'default_bdd']
+
+import threading
+
+from ..utils import EQ, NE, LT, LE, GT, GE, AND, OR, NOT, NUMBER, IN, NOTIN
+
+class BDD(object):
+    """ Holds the unique table of BDD nodes, the atoms and the cache
+    of ite operations.
+
+    Nodes created by one BDD instance must not be mixed with the
+    nodes of other instances. New nodes and atoms are added while
+    holding a lock so that one instance can be used from concurrent
+    threads, the caches map keys to nodes that are already in the
+    unique table.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """ Remove all nodes, atoms and cached results.
+        """
+        self.lock.acquire()
+        try:
+            # nodes[i] is (var, low, high), terminals have var larger
+            # than the index of any atom:
+            self.nodes = [(None, None, None), (None, None, None)]
+            self.unique = {}
+            self.atoms = []
+            self.atom_index = {}
+            self.ite_cache = {}
+            self.logic_cache = {}
+        finally:
+            self.lock.release()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return '%s(nodes=%s, atoms=%s)' % (type(self).__name__, len(self.nodes), len(self.atoms))
+
+    def var(self, node):
+        """ Return atom index of node, terminals return the number of atoms.
+        """
+        v = self.nodes[node][0]
+        if v is None:
+            return len(self.atoms)
+        return v
+
+    def mk(self, var, low, high):
+        """ Return node with atom index var and children low and high.
+        """
+        if low==high:
+            return low
+        key = (var, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            self.lock.acquire()
+            try:
+                node = self.unique.get(key)
+                if node is None:
+                    nodes = self.nodes
+                    node = len(nodes)
+                    nodes.append(key)
+                    self.unique[key] = node
+            finally:
+                self.lock.release()
+        return node
+
+    def ite(self, f, g, h):
+        """ Return node of ``(f and g) or (not f and h)``.
+        """
+        if f==1: return g
+        if f==0: return h
+        if g==h: return g
+        if g==1 and h==0: return f
+        key = (f, g, h)
+        result = self.ite_cache.get(key)
+        if result is not None:
+            return result
+        var = self.var
+        nodes = self.nodes
+        v = min(var(f), var(g), var(h))
+        cofactors = []
+        for n in (f, g, h):
+            nv, low, high = nodes[n]
+            if nv==v:
+                cofactors.append((low, high))
+            else:
+                cofactors.append((n, n))
+        (f0, f1), (g0, g1), (h0, h1) = cofactors
+        result = self.mk(v, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.ite_cache[key] = result
+        return result
+
+    def apply_not(self, f):
+        return self.ite(f, 0, 1)
+
+    def apply_and(self, f, g):
+        return self.ite(f, g, 0)
+
+    def apply_or(self, f, g):
+        return self.ite(f, 1, g)
+
+    def atom(self, cls, expr):
+        """ Return ``(index, positive)`` of an atomic Logic expression.
+        """
+        head, data = expr.pair
+        positive = True
+        swapped = None
+        if type(data) is tuple and len(data)==2:
+            lhs, rhs = data
+            if head is GE:
+                head, positive = LT, False
+            elif head is GT:
+                head, data = LT, (rhs, lhs)
+            elif head is LE:
+                head, data, positive = LT, (rhs, lhs), False
+            elif head is NE:
+                head, positive = EQ, False
+            elif head is NOTIN:
+                head, positive = IN, False
+            if head is EQ:
+                swapped = cls(EQ, (rhs, lhs))
+            expr = cls(head, data)
+        index = self.atom_index.get(expr)
+        if index is None:
+            self.lock.acquire()
+            try:
+                atom_index = self.atom_index
+                if swapped is not None and swapped in atom_index:
+                    expr = swapped
+                index = atom_index.get(expr)
+                if index is None:
+                    atoms = self.atoms
+                    index = len(atoms)
+                    atoms.append(expr)
+                    atom_index[expr] = index
+            finally:
+                self.lock.release()
+        return index, positive
+
+    def from_logic(self, expr):
+        """ Return node of a Logic expression.
+        """
+        node = self.logic_cache.get(expr)
+        if node is not None:
+            return node
+        cls = type(expr)
+        head, data = expr.pair
+        if head is NUMBER:
+            node = int(bool(data))
+        elif head is NOT:
+            node = self.apply_not(self.from_logic(data))
+        elif head is AND:
+            node = 1
+            for a in data:
+                node = self.apply_and(node, self.from_logic(a))
+                if node==0:
+                    break
+        elif head is OR:
+            node = 0
+            for a in data:
+                node = self.apply_or(node, self.from_logic(a))
+                if node==1:
+                    break
+        else:
+            index, positive = self.atom(cls, expr)
+            if positive:
+                node = self.mk(index, 0, 1)
+            else:
+                node = self.mk(index, 1, 0)
+        self.logic_cache[expr] = node
+        return node
+
+    def to_logic(self, cls, node, cache=None):
+        """ Return Logic expression of node.
+
+        The expression is a nested if-then-else form following the
+        atom order, it is the same for equivalent expressions.
+        """
+        if node<2:
+            return cls(NUMBER, bool(node))
+        if cache is None:
+            cache = {}
+        result = cache.get(node)
+        if result is not None:
+            return result
+        v, low, high = self.nodes[node]
+        atom = self.atoms[v]
+        if low==0:
+            result = cls.And(atom, self.to_logic(cls, high, cache))
+        elif high==0:
+            result = cls.And(cls.Not(atom), self.to_logic(cls, low, cache))
+        elif low==1:
+            result = cls.Or(cls.Not(atom), self.to_logic(cls, high, cache))
+        elif high==1:
+            result = cls.Or(atom, self.to_logic(cls, low, cache))
+        else:
+            result = cls.Or(cls.And(atom, self.to_logic(cls, high, cache)),
+                            cls.And(cls.Not(atom), self.to_logic(cls, low, cache)))
+        cache[node] = result
+        return result
+
+    def satisfy_one(self, node):
+        """ Return a dictionary of atom truth values that satisfies
+        node, or None when node is not satisfiable.
+        """
+        if node==0:
+            return None
+        nodes = self.nodes
+        atoms = self.atoms
+        d = {}
+        while node!=1:
+            v, low, high = nodes[node]
+            if high!=0:
+                d[atoms[v]] = True
+                node = high
+            else:
+                d[atoms[v]] = False
+                node = low
+        return d
+
+    def count(self, node):
+        """ Return the number of nodes reachable from node, including
+        terminals.
+        """
+        seen = set([])
+        stack = [node]
+        nodes = self.nodes
+        while stack:
+            n = stack.pop()
+            if n in seen:
+                continue
+            seen.add(n)
+            if n>1:
+                stack.append(nodes[n][1])
+                stack.append(nodes[n][2])
+        return len(seen)
+
+default_bdd = BDD()
@@ -79,3 +79,32 @@ def test_in():
     assert Logic('x in y') == Logic.Element(classes.Verbatim('x'), classes.Set('y'))
     assert Logic('x in Integers') == Logic.Element(classes.Calculus('x'), classes.Set('Integers'))
     
+
+def test_bdd():
+    from sympycore.logic.bdd import BDD
+    x = Symbol('x')
+    y = Symbol('y')
+    a = Logic('a')
+    b = Logic('b')
+    bdd = BDD()
+    assert Lt(x,y).as_bdd(bdd)==Not(Ge(x,y)).as_bdd(bdd)
+    assert Gt(x,y).as_bdd(bdd)==Lt(y,x).as_bdd(bdd)
+    assert Eq(x,y).as_bdd(bdd)==Eq(y,x).as_bdd(bdd)
+    assert Or(Lt(x,y), Ge(x,y)).is_tautology(bdd)
+    assert not And(Lt(x,y), Not(Lt(x,y))).is_satisfiable(bdd)
+    assert not And(Le(x,y), Gt(x,y), a).is_satisfiable(bdd)
+    f = Or(And(a, b), And(a, Not(b)))
+    assert f.is_equivalent(a, bdd)
+    assert f.simplify(bdd)==a
+    assert Or(And(a, Lt(x,y)), And(Not(a), Lt(x,y))).simplify(bdd)==Lt(x,y)
+    assert Or(a, b).is_equivalent(Not(And(Not(a), Not(b))), bdd)
+    assert not Or(a, b).is_equivalent(And(a, b), bdd)
+    d = And(a, Not(b), Eq(x,y)).satisfy_one(bdd)
+    assert d=={a:True, b:False, Eq(x,y):True},`d`
+    assert And(a, Not(a)).satisfy_one(bdd) is None
+    # parity of n atoms needs O(n) nodes
+    atoms = [Logic('a%s' % i) for i in range(20)]
+    p = Logic.false
+    for c in atoms:
+        p = Or(And(p, Not(c)), And(Not(p), c))
+    assert bdd.count(p.as_bdd(bdd)) <= 2*len(atoms)+2
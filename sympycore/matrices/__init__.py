@@ -3,5 +3,5 @@
 __docformat__ = "restructuredtext"
 
 from .algebra import Matrix, MatrixBase
-from .functions import eye, concatenate, jacobian
+from .functions import eye, concatenate, jacobian, hessian
 from .polyhedra import Polyhedron
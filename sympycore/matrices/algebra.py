@@ -63,6 +63,8 @@ def Matrix(*args, **kws):
         a = args[0]
         if isinstance(a, MatrixBase):
             return a
+        elif isinstance(a, MatrixView):
+            return a.materialize()
         elif isinstance(a, int):
             m, n = a, a
             data = {}
@@ -478,6 +480,12 @@ class MatrixDict(MatrixBase):
             return self
         return type(self)(newhead, data)
 
+    @property
+    def view(self):
+        """ Return lazy view of a matrix, see matrices.views.
+        """
+        return matrix_view(self)
+
     @property
     def I(self):
         """ Return inverse matrix.
@@ -824,7 +832,7 @@ class MatrixDict(MatrixBase):
         
         See also
         --------
-        solve_null
+        solve_null, factorize
 
         """
         t = type(rhs)
@@ -939,7 +947,7 @@ class MatrixDict(MatrixBase):
 
         See also
         --------
-        solve
+        solve, integer_nullspace
         """
         m, n = self.head.shape
         if labels is None:
@@ -1031,6 +1039,10 @@ from .linalg import (MATRIX_DICT_swap_rows, MATRIX_DICT_swap_cols,
                      MATRIX_DICT_apply_row_operations)
 from .linalg_determinant import MATRIX_DICT_determinant
 from .linalg_lp import MATRIX_DICT_LP_solve
+from .views import MatrixView, view as matrix_view
+from .packed import MATRIX_DICT_pack
+from .linalg_nullspace import MATRIX_DICT_integer_nullspace
+from .linalg_factorization import MATRIX_DICT_factorize
 
 MatrixDict.__iadd__ = MATRIX_DICT_iadd
 MatrixDict.__imul__ = MATRIX_DICT_imul
@@ -1044,3 +1056,6 @@ MatrixDict.trace = MATRIX_DICT_trace
 MatrixDict.get_gauss_jordan_elimination_operations = MATRIX_DICT_get_gauss_jordan_elimination_operations
 MatrixDict.apply_row_operations = MATRIX_DICT_apply_row_operations
 MatrixDict.LP_solve = MATRIX_DICT_LP_solve
+MatrixDict.pack = MATRIX_DICT_pack
+MatrixDict.integer_nullspace = MATRIX_DICT_integer_nullspace
+MatrixDict.factorize = MATRIX_DICT_factorize
@@ -6,21 +6,97 @@
 #
 
 __docformat__ = "restructuredtext"
-__all__ = ['eye', 'concatenate', 'jacobian']
+__all__ = ['eye', 'concatenate', 'jacobian', 'hessian']
 
-from ..utils import MATRIX, MATRIX_DICT
+from ..utils import MATRIX, MATRIX_DICT, SYMBOL
 from .algebra import MatrixDict, Matrix, MatrixBase
 
-def jacobian(expr_list, var_list):
+def jacobian(expr_list, var_list, processes=None):
     """ Return a jacobian matrix of functions in expr_list with
     respect to variables in var_list.
+
+    Only the derivatives with respect to the symbols that an
+    expression depends on are computed, the derivatives of
+    subexpressions are cached over all rows. When processes is
+    specified, the rows are distributed over a pool of processes.
     """
     m, n = len(expr_list), len(var_list)
-    jac = Matrix(m, n)
-    for i, e in enumerate(expr_list):
-        for j, v in enumerate(var_list):
-            jac[i,j] = e.diff(v)
-    return jac
+    names = symbol_names(var_list)
+    rows = [(i, e) for i, e in enumerate(expr_list)]
+    return MatrixDict(MATRIX(m, n, MATRIX_DICT),
+                      dict(map_rows(rows, names, False, processes)))
+
+def hessian(expr, var_list, processes=None):
+    """ Return a hessian matrix of expr with respect to variables
+    in var_list.
+
+    Only the structurally nonzero elements of the upper triangle are
+    computed, see also jacobian.
+    """
+    n = len(var_list)
+    names = symbol_names(var_list)
+    gradient = dict(differentiate_rows([(0, expr)], names, False))
+    rows = [(j, g) for (i, j), g in gradient.iteritems()]
+    d = {}
+    for (i, j), x in map_rows(rows, names, True, processes):
+        d[i, j] = d[j, i] = x
+    return MatrixDict(MATRIX(n, n, MATRIX_DICT), d)
+
+def symbol_names(var_list):
+    names = []
+    for v in var_list:
+        if isinstance(v, str):
+            names.append(v)
+        else:
+            head, data = v.pair
+            assert head is SYMBOL,`v.pair`
+            names.append(data)
+    return names
+
+def differentiate_rows(rows, names, symmetric, cache=None):
+    """ Return a list of ``((i, j), d(expr)/d(names[j]))`` items of
+    nonzero derivatives where rows is a list of ``(i, expr)``.
+
+    When symmetric is True then only the items with ``j>=i`` are
+    computed.
+    """
+    if cache is None:
+        cache = {}
+    indices = dict([(name, j) for j, name in enumerate(names)])
+    result = []
+    for i, e in rows:
+        symbols_data = getattr(e, 'symbols_data', None)
+        if not symbols_data:
+            continue
+        cls = type(e)
+        head, data = e.pair
+        for name in symbols_data:
+            j = indices.get(name)
+            if j is None or (symmetric and j<i):
+                continue
+            x = head.diff(cls, data, e, name, 1, cache=cache)
+            if x:
+                result.append(((i, j), x))
+    return result
+
+def _differentiate_rows(args):
+    return differentiate_rows(*args)
+
+def map_rows(rows, names, symmetric, processes=None):
+    """ Apply differentiate_rows to rows, optionally in parallel.
+    """
+    if not processes or processes==1 or len(rows)<2:
+        return differentiate_rows(rows, names, symmetric)
+    from multiprocessing import Pool
+    nchunks = min(len(rows), 4*processes)
+    chunks = [(rows[k::nchunks], names, symmetric) for k in range(nchunks)]
+    pool = Pool(processes)
+    try:
+        results = pool.map(_differentiate_rows, chunks)
+    finally:
+        pool.close()
+        pool.join()
+    return [item for result in results for item in result]
 
 def eye(m, n=None, k=0):
     """ Return n x m matrix where the k-th diagonal is all ones,
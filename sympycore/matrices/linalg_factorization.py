@@ -0,0 +1,149 @@
+""" Implements reusable LU factorization of square matrices.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['LUFactorization']
+
+from ..utils import MATRIX, MATRIX_DICT
+from ..arithmetic.numbers import div
+from .algebra import MatrixDict, Matrix
+from .linalg import lu_MATRIX
+
+class LUFactorization(object):
+    """ LU factorization of a square nonsingular matrix A that is
+    computed once and used for solving ``A * x = rhs`` for any number
+    of right-hand sides.
+
+    The factorization is ``A[pivot_table] = L * U`` where L is lower
+    triangular with unit diagonal and U is upper triangular. A solve
+    costs one forward and one backward substitution, that is,
+    O(n + nnz(L+U)) operations per right-hand side column.
+
+    For example::
+
+      f = Matrix([[1,2], [3,4]]).factorize()
+      f.solve([1,2]) -> Matrix([[0],[1/2]])
+      f.solve([3,4]) -> Matrix([[-2],[5/2]])
+    """
+
+    def __init__(self, matrix):
+        head, data = matrix.pair
+        m, n = head.shape
+        if m!=n:
+            raise ValueError('expected square matrix but got %s x %s matrix' % (m, n))
+        if head.is_transpose:
+            udata = dict([((i, j), x) for (j, i), x in data.iteritems()])
+        elif head.is_diagonal:
+            raise NotImplementedError(`head`)
+        else:
+            udata = dict(data)
+        ldata = {}
+        self.pivot_table = lu_MATRIX(m, n, n, ldata, udata)
+        self.n = n
+        self.lrows = lrows = [[] for i in xrange(n)]
+        for (i, j), x in ldata.iteritems():
+            if i!=j:
+                lrows[i].append((j, x))
+        self.urows = urows = [[] for i in xrange(n)]
+        self.udiag = udiag = [0] * n
+        for (i, j), x in udata.iteritems():
+            if i==j:
+                udiag[i] = x
+            elif i<j:
+                urows[i].append((j, x))
+        for i in xrange(n):
+            if not udiag[i]:
+                raise ZeroDivisionError('matrix is singular')
+
+    @property
+    def nnz(self):
+        """ Number of stored nonzeros of L and U.
+        """
+        return self.n + sum(map(len, self.lrows)) + sum(map(len, self.urows))
+
+    @property
+    def P(self):
+        return Matrix(self.pivot_table, permutation=True).T
+
+    @property
+    def L(self):
+        d = {}
+        for i, row in enumerate(self.lrows):
+            d[i, i] = 1
+            for j, x in row:
+                d[i, j] = x
+        return MatrixDict(MATRIX(self.n, self.n, MATRIX_DICT), d)
+
+    @property
+    def U(self):
+        d = {}
+        for i, row in enumerate(self.urows):
+            d[i, i] = self.udiag[i]
+            for j, x in row:
+                d[i, j] = x
+        return MatrixDict(MATRIX(self.n, self.n, MATRIX_DICT), d)
+
+    def __repr__(self):
+        return '%s(n=%s, nnz=%s)' % (type(self).__name__, self.n, self.nnz)
+
+    def solve_column(self, column):
+        """ Return solution of ``A * x = b`` as a list where column is
+        a dictionary of the nonzero elements of b.
+        """
+        n = self.n
+        column_get = column.get
+        y = [column_get(p, 0) for p in self.pivot_table]
+        lrows = self.lrows
+        for i in xrange(n):
+            s = y[i]
+            for j, l in lrows[i]:
+                y_j = y[j]
+                if y_j:
+                    s -= l * y_j
+            y[i] = s
+        urows = self.urows
+        udiag = self.udiag
+        for i in xrange(n-1, -1, -1):
+            s = y[i]
+            for j, u in urows[i]:
+                y_j = y[j]
+                if y_j:
+                    s -= u * y_j
+            if s:
+                s = div(s, udiag[i])
+            y[i] = s
+        return y
+
+    def solve(self, rhs):
+        """ Solve ``A * x = rhs`` where rhs is a n x q matrix or a
+        sequence of n elements.
+        """
+        t = type(rhs)
+        if t is tuple or t is list:
+            rhs = Matrix(rhs)
+        head, data = rhs.pair
+        p, q = head.shape
+        if p!=self.n:
+            raise ValueError('expected right-hand side with %s rows but got %s' % (self.n, p))
+        columns = [{} for k in xrange(q)]
+        if head.is_transpose:
+            for (j, i), x in data.iteritems():
+                columns[j][i] = x
+        else:
+            for (i, j), x in data.iteritems():
+                columns[j][i] = x
+        d = {}
+        for k, column in enumerate(columns):
+            if not column:
+                continue
+            for i, x in enumerate(self.solve_column(column)):
+                if x:
+                    d[i, k] = x
+        return MatrixDict(MATRIX(self.n, q, MATRIX_DICT), d)
+
+    __floordiv__ = solve
+
+def MATRIX_DICT_factorize(self):
+    """ Return LUFactorization of a square matrix.
+    """
+    return LUFactorization(self)
@@ -0,0 +1,227 @@
+""" Implements fraction-free computation of integer nullspace bases.
+"""
+
+from ..utils import MATRIX, MATRIX_DICT, NUMBER
+from ..arithmetic.numbers import mpq
+from ..arithmetic.number_theory import gcd
+from .algebra import MatrixDict
+
+def MATRIX_DICT_integer_nullspace(self, labels=None, search=4, return_statistics=False):
+    """ Compute an integer basis of the nullspace of a m x n matrix A
+    with rational elements.
+
+    The nullspace is computed by fraction-free Gauss-Jordan
+    elimination. Rows are kept as integer rows with unit content:
+    eliminating a column from a row multiplies it by the pivot value
+    instead of dividing by it, and the row is divided by the gcd of
+    its elements. Pivots are selected using the Markowitz criterion
+    that minimizes the fill-in, ties are broken by the smallest
+    absolute value of the pivot.
+
+    Parameters
+    ----------
+    labels : {None, list}
+      A list of column labels, the default is ``range(n)``.
+
+    search : int
+      The number of the sparsest rows searched for the pivot.
+
+    return_statistics : bool
+      When True then return also elimination statistics.
+
+    Returns
+    -------
+    ker : MatrixDict
+      n x nullity matrix with integer elements such that ``A * ker = 0``.
+      The columns of ker have unit content.
+
+    dep, indep : list
+      Lists of dependent and independent column labels,
+      respectively. The j-th column of ker has 1 or other nonzero
+      value at the row of indep[j] and zeros at the rows of the other
+      independent columns.
+
+    statistics : dict
+      Returned only when return_statistics is True. Contains the
+      number of nonzeros of A (``'nnz'``), the number of elements
+      created (``'fill_in'``) and cancelled (``'cancelled'``) during
+      elimination, the maximal number of nonzeros (``'max_nnz'``),
+      the number of nonzeros of the eliminated matrix
+      (``'nnz_reduced'``) and of the kernel (``'nnz_kernel'``), and
+      the maximal bit length of kernel elements (``'max_bits'``).
+
+    See also
+    --------
+    solve_null
+    """
+    head, data = self.pair
+    m, n = head.shape
+    if head.is_diagonal:
+        raise NotImplementedError(`head`)
+    if labels is None:
+        labels = range(n)
+    if head.is_transpose:
+        items = [((i, j), x) for (j, i), x in data.iteritems()]
+    else:
+        items = data.iteritems()
+    rows = integer_rows_MATRIX(items)
+    statistics = dict(nnz=sum(map(len, rows.itervalues())))
+    pivots = fraction_free_elimination_MATRIX(rows, search, statistics)
+    pivot_cols = set([j for i, j in pivots])
+    indep_cols = [j for j in range(n) if j not in pivot_cols]
+    kdata = integer_nullspace_MATRIX(rows, pivots, indep_cols)
+    ker = MatrixDict(MATRIX(n, len(indep_cols), MATRIX_DICT), kdata)
+    dep = [labels[j] for i, j in pivots]
+    indep = [labels[j] for j in indep_cols]
+    if return_statistics:
+        statistics['nnz_reduced'] = sum(map(len, rows.itervalues()))
+        statistics['nnz_kernel'] = len(kdata)
+        statistics['max_bits'] = max([0] + [abs(x).bit_length() for x in kdata.itervalues()])
+        return ker, dep, indep, statistics
+    return ker, dep, indep
+
+def as_fraction(x):
+    """ Return (p, q) of a rational number.
+    """
+    t = type(x)
+    if t is int or t is long:
+        return x, 1
+    if t is mpq:
+        return x
+    head, data = getattr(x, 'pair', (None, None))
+    if head is NUMBER:
+        return as_fraction(data)
+    raise TypeError('expected integer or rational matrix element but got %r' % (x,))
+
+def content(row):
+    """ Return the positive gcd of row values.
+    """
+    g = 0
+    for x in row.itervalues():
+        g = gcd(g, x)
+        if g==1 or g==-1:
+            break
+    return abs(g)
+
+def integer_rows_MATRIX(items):
+    """ Return a dictionary of rows with integer elements and unit
+    content, rows are dictionaries of column indices and values.
+    """
+    fractions = {}
+    for (i, j), x in items:
+        if x:
+            row = fractions.get(i)
+            if row is None:
+                row = fractions[i] = {}
+            row[j] = as_fraction(x)
+    rows = {}
+    for i, row in fractions.iteritems():
+        l = 1
+        for p, q in row.itervalues():
+            if q!=1:
+                l = l * q // gcd(l, q)
+        row = dict([(j, p * (l // q)) for j, (p, q) in row.iteritems()])
+        g = content(row)
+        if g!=1:
+            row = dict([(j, x // g) for j, x in row.iteritems()])
+        rows[i] = row
+    return rows
+
+def fraction_free_elimination_MATRIX(rows, search, statistics):
+    """ Reduce integer rows to a Gauss-Jordan form in place.
+
+    Return a list of (row, column) pivot positions.
+    """
+    cols = {}
+    for i, row in rows.iteritems():
+        for j in row:
+            s = cols.get(j)
+            if s is None:
+                s = cols[j] = set()
+            s.add(i)
+    active = set(rows)
+    pivots = []
+    nnz = max_nnz = statistics['nnz']
+    fill_in = cancelled = 0
+    while active:
+        # Markowitz pivot search in the sparsest active rows:
+        candidates = sorted([(len(rows[i]), i) for i in active])[:max(search, 1)]
+        best = None
+        for r, i in candidates:
+            for j, x in rows[i].iteritems():
+                cost = (r-1) * (len(cols[j])-1), abs(x), j, i
+                if best is None or cost < best:
+                    best = cost
+        if best is None:
+            break
+        pi, pj = best[3], best[2]
+        active.discard(pi)
+        pivots.append((pi, pj))
+        prow = rows[pi]
+        a = prow[pj]
+        for k in list(cols[pj]):
+            if k==pi:
+                continue
+            krow = rows[k]
+            b = krow[pj]
+            g = gcd(a, b)
+            ca, cb = a // g, b // g
+            # krow = ca * krow - cb * prow
+            if ca!=1:
+                for j in krow:
+                    krow[j] *= ca
+            for j, x in prow.iteritems():
+                y = krow.get(j)
+                if y is None:
+                    krow[j] = -cb * x
+                    cols[j].add(k)
+                    fill_in += 1
+                    nnz += 1
+                else:
+                    y -= cb * x
+                    if y:
+                        krow[j] = y
+                    else:
+                        del krow[j]
+                        cols[j].discard(k)
+                        cancelled += 1
+                        nnz -= 1
+            if krow:
+                g = content(krow)
+                if g!=1:
+                    for j in krow:
+                        krow[j] //= g
+            else:
+                del rows[k]
+                active.discard(k)
+            if nnz > max_nnz:
+                max_nnz = nnz
+    statistics.update(fill_in=fill_in, cancelled=cancelled, max_nnz=max_nnz)
+    return pivots
+
+def integer_nullspace_MATRIX(rows, pivots, indep_cols):
+    """ Return kernel data from reduced rows.
+    """
+    # Reduced rows satisfy a * x[pj] + sum(row[j]*x[j] for free j) = 0
+    free = {}
+    for k, j in enumerate(indep_cols):
+        free[j] = k
+    columns = [{} for j in indep_cols]
+    for pi, pj in pivots:
+        row = rows[pi]
+        a = row[pj]
+        for j, x in row.iteritems():
+            if j!=pj:
+                columns[free[j]][pj] = (-x, a)
+    kdata = {}
+    for k, j in enumerate(indep_cols):
+        column = columns[k]
+        l = 1
+        for p, q in column.itervalues():
+            l = l * abs(q) // abs(gcd(l, q))
+        column = dict([(i, p * (l // q)) for i, (p, q) in column.iteritems()])
+        column[j] = l
+        g = content(column)
+        for i, x in column.iteritems():
+            kdata[i, k] = x // g
+    return kdata
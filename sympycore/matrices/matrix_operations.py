@@ -1,6 +1,7 @@
 
 from ..utils import MATRIX, MATRIX_DICT
 from .algebra import Matrix, MatrixBase, MatrixDict
+from .views import MatrixView
 
 from ..core import init_module
 init_module.import_lowlevel_operations()
@@ -9,7 +10,7 @@ def MATRIX_DICT_iadd(self, other):
     """ Inplace matrix add.
     """
     t = type(other)
-    if t is list or t is tuple:
+    if t is list or t is tuple or isinstance(other, MatrixView):
         other = Matrix(other)
         t = type(other)
     if t is MatrixDict:
@@ -54,7 +55,7 @@ def MATRIX_DICT_imul(self, other):
     """ Inplace matrix multiplication.
     """
     t = type(other)
-    if t is list or t is tuple:
+    if t is list or t is tuple or isinstance(other, MatrixView):
         other = Matrix(other)
         t = type(other)
     if t is MatrixDict:
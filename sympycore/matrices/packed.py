@@ -0,0 +1,196 @@
+""" Provides memory-lean storage of sparse matrices.
+
+PackedMatrix holds the nonzero elements of a rows x cols matrix in
+two parallel sequences: an ``array('l')`` of packed indices
+``i*cols+j`` in increasing order and a list of values. An element
+costs a machine integer and a list slot instead of a dictionary
+entry, a tuple and two integer objects used by MatrixDict::
+
+  >>> a = Matrix([[1,0],[0,2]]).pack()
+  >>> a[1,1]
+  2
+  >>> a[0,1] = 3
+  >>> list(a.iter_nonzero())
+  [((0, 0), 1), ((0, 1), 3), ((1, 1), 2)]
+
+Element access uses bisection. Methods of MatrixDict that PackedMatrix
+does not implement, such as ``gauss_jordan_elimination`` or ``lu``,
+are applied to a temporary MatrixDict copy, changes made by in-place
+methods, such as ``swap_rows`` or methods called with
+``overwrite=True``, are packed back.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['PackedMatrix']
+
+import inspect
+from array import array
+from bisect import bisect_left
+
+from ..utils import MATRIX, MATRIX_DICT
+from .algebra import MatrixDict
+from .views import MatrixView
+
+# MatrixDict methods that always change the matrix in place, methods
+# with an overwrite argument change it when overwrite is true:
+inplace_methods = ['swap_rows', 'swap_cols', 'crop']
+
+def is_inplace_call(name, method, args, kws):
+    """ Check if calling a bound MatrixDict method changes the matrix.
+    """
+    if name in inplace_methods:
+        return True
+    if 'overwrite' in kws:
+        return kws['overwrite']
+    try:
+        argnames = inspect.getargspec(method)[0]
+    except TypeError:
+        return False
+    if 'overwrite' not in argnames:
+        return False
+    index = argnames.index('overwrite') - 1
+    return index < len(args) and args[index]
+
+class PackedMatrix(MatrixView):
+    """ Sparse matrix with integer-packed indices.
+    """
+
+    __slots__ = ['indices', 'values']
+
+    def __init__(self, rows, cols, data=None):
+        self.shape = rows, cols
+        self._matrix = None
+        if data is None:
+            self.indices = array('l')
+            self.values = []
+        else:
+            if isinstance(data, dict):
+                data = data.iteritems()
+            self._pack(data)
+
+    def _pack(self, items):
+        cols = self.shape[1]
+        items = sorted([(i*cols+j, x) for (i, j), x in items if x])
+        self.indices = array('l', [k for k, x in items])
+        self.values = [x for k, x in items]
+
+    @property
+    def head(self):
+        rows, cols = self.shape
+        return MATRIX(rows, cols, MATRIX_DICT)
+
+    def __len__(self):
+        return len(self.values)
+
+    def _get(self, i, j):
+        k = i*self.shape[1]+j
+        indices = self.indices
+        index = bisect_left(indices, k)
+        if index<len(indices) and indices[index]==k:
+            return self.values[index]
+        return 0
+
+    def _iter_nonzero(self):
+        cols = self.shape[1]
+        for k, x in zip(self.indices, self.values):
+            yield divmod(k, cols), x
+
+    def _take(self, rows, cols):
+        row_map = dict([(i0, i) for i, i0 in enumerate(rows)])
+        col_map = dict([(j0, j) for j, j0 in enumerate(cols)])
+        items = []
+        for (i0, j0), x in self._iter_nonzero():
+            i = row_map.get(i0)
+            if i is not None:
+                j = col_map.get(j0)
+                if j is not None:
+                    items.append(((i, j), x))
+        return PackedMatrix(len(rows), len(cols), items)
+
+    def __setitem__(self, key, value):
+        m, n = self.shape
+        if type(key) is tuple:
+            i, j = key
+            if type(i) is int and type(j) is int:
+                if i<0:
+                    i += m
+                if j<0:
+                    j += n
+                if not (0<=i<m and 0<=j<n):
+                    raise IndexError(`i, j, m, n`)
+                k = i*n+j
+                indices, values = self.indices, self.values
+                index = bisect_left(indices, k)
+                if index<len(indices) and indices[index]==k:
+                    if value:
+                        values[index] = value
+                    else:
+                        del indices[index]
+                        del values[index]
+                elif value:
+                    indices.insert(index, k)
+                    values.insert(index, value)
+                return
+        matrix = self.materialize()
+        matrix[key] = value
+        self._pack(matrix.data.iteritems())
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        matrix = self.materialize()
+        attr = getattr(matrix, name)
+        if not callable(attr):
+            return attr
+        def method(*args, **kws):
+            result = attr(*args, **kws)
+            if is_inplace_call(name, attr, args, kws):
+                head, data = matrix.pair
+                if head.shape==self.shape and not head.is_transpose:
+                    self._pack(data.iteritems())
+            if result is matrix:
+                return self
+            return result
+        method.__name__ = name
+        return method
+
+    def detach(self):
+        return self.materialize()
+
+    def __mul__(self, other):
+        if isinstance(other, (MatrixDict, MatrixView, list, tuple)):
+            return self.materialize() * other
+        return self.scaled(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, (MatrixDict, MatrixView, list, tuple)):
+            return other * self.materialize()
+        return self.scaled(other)
+
+    def scaled(self, scalar):
+        """ Return the product of a matrix and a scalar as PackedMatrix.
+        """
+        result = PackedMatrix(*self.shape)
+        indices, values = result.indices, result.values
+        for k, x in zip(self.indices, self.values):
+            x = x * scalar
+            if x:
+                indices.append(k)
+                values.append(x)
+        return result
+
+    def copy(self):
+        result = PackedMatrix(0, 0)
+        result.shape = self.shape
+        result.indices = array('l', self.indices)
+        result.values = list(self.values)
+        return result
+
+def MATRIX_DICT_pack(self):
+    """ Return a copy of a matrix as PackedMatrix instance.
+    """
+    head, data = self.pair
+    rows, cols = head.shape
+    if head.is_transpose:
+        return PackedMatrix(rows, cols, [((i, j), x) for (j, i), x in data.iteritems()])
+    return PackedMatrix(rows, cols, data)
@@ -475,6 +475,91 @@ def test_lu_issue63():
     assert p*l*u == a
     assert (p*l*u - a).data == {}
 
+def test_view():
+    a = Matrix([[1,0,3,0],[0,5,6,0],[7,0,0,8]])
+    v = a.view[1:, ::2]
+    assert v.shape==(2,2)
+    assert v.tolist()==a[1:, ::2].tolist()
+    assert v[1:, 1:].tolist()==[[0]]
+    assert sorted(v.iter_nonzero())==[((0,1),6), ((1,0),7)]
+    assert v.T.tolist()==a[1:, ::2].T.tolist()
+    assert v.T.T is v
+    assert v.T[0, 1]==7
+    assert a.T.view.tolist()==a.T.tolist()
+    assert sorted(a.T.view[1:, :2].iter_nonzero())==[((0,1),5), ((1,0),3), ((1,1),6)]
+    assert sorted(a.view.diagonal().iter_nonzero())==[((0,0),1), ((1,0),5)]
+    assert sorted(a.view.diagonal(-2).iter_nonzero())==[((0,0),7)]
+    assert a.view.diagonal(3).tolist()==[[0]]
+    assert Matrix(v)==a[1:, ::2]
+    assert a + a.view==2*a
+
+    a[2,0] = 9
+    assert v[1,0]==9
+    v[1,0] = 2
+    assert v.is_detached
+    assert v[1,0]==2 and a[2,0]==9
+
+    v = a.view[:, :3]
+    assert not v.is_detached
+    b = v.gauss_jordan_elimination()
+    assert v.is_detached
+    assert b==a[:, :3].gauss_jordan_elimination()
+
+def test_pack():
+    a = Matrix([[1,0,3,0],[0,5,6,0],[7,0,0,8]])
+    p = a.pack()
+    assert len(p)==6
+    assert list(p.indices)==[0,2,5,6,8,11]
+    assert p.tolist()==a.tolist()
+    assert a.T.pack().tolist()==a.T.tolist()
+    assert p.T.tolist()==a.T.tolist()
+    assert p[1:, 1:].tolist()==a[1:, 1:].tolist()
+    assert Matrix(p)==a
+    p[0,1] = 2
+    p[0,0] = 0
+    p[-1,-1] = 9
+    assert p.tolist()==[[0,2,3,0],[0,5,6,0],[7,0,0,9]]
+    assert list(p.indices)==[1,2,5,6,8,11]
+    p[1,:] = 0
+    assert p.tolist()==[[0,2,3,0],[0,0,0,0],[7,0,0,9]]
+    p.swap_rows(0, 2)
+    assert p.tolist()==[[7,0,0,9],[0,0,0,0],[0,2,3,0]]
+    b = Matrix([[2,1],[1,3]])
+    assert b.pack().solve([1,2])==b.solve([1,2])
+    assert b.pack().lu()==b.lu()
+    p = a.pack()
+    assert (p*2).tolist()==(a*2).tolist()
+    assert (3*p).tolist()==(3*a).tolist()
+    assert isinstance(p*2, type(p)) and len(p*0)==0
+    assert p*a.T==a*a.T
+    assert Matrix([[1,2,3]])*p==Matrix([[1,2,3]])*a
+    p.gauss_jordan_elimination()
+    assert p.tolist()==a.tolist()
+    p.gauss_jordan_elimination(overwrite=True)
+    assert p.tolist()==a.gauss_jordan_elimination().tolist()
+
+def test_factorize():
+    a = Matrix([[1,2], [3,4]])
+    f = a.factorize()
+    assert f.solve([1,2])==a.solve([1,2])
+    assert f.solve([3,4]).tolist()==[[-2],[mpq((5,2))]]
+    b = Matrix([[1,0,3],[2,0,4]])
+    assert f.solve(b)==a.solve(b)
+    assert f.solve(b.T.T)==a.solve(b)
+    assert f.P*f.L*f.U==a
+
+    a = Matrix([[0,2,0,1],[1,0,0,0],[0,3,4,0],[5,0,0,6]])
+    f = a.T.factorize()
+    x = f.solve([1,2,3,4])
+    assert a.T*x==Matrix([1,2,3,4])
+    assert f.nnz<=16
+
+    try:
+        Matrix([[1,2],[2,4]]).factorize()
+        assert 0, 'expected ZeroDivisionError'
+    except ZeroDivisionError:
+        pass
+
 def test_solve_null():
     x = ['x1', 'x2', 'x3', 'x4', 'x5', 'x6']
     a = Matrix ([[2,3,5],[-4,2,3]])
@@ -514,6 +599,38 @@ def test_solve_null():
     ker = Matrix([xd[s] for s in sorted (dep+indep)])
     assert (a*ker).is_zero,`a*ker`
 
+def test_integer_nullspace():
+    x = ['x1', 'x2', 'x3']
+    a = Matrix ([[2,3,5],[-4,2,3]])
+    ker, dep, indep = a.integer_nullspace(x)
+    assert ker.tolist()==[[-1],[-26],[16]],`ker`
+    assert dep==['x1', 'x2'],`dep`
+    assert indep==['x3'],`indep`
+
+    ker, dep, indep = (a/2).T.T.integer_nullspace(x)
+    assert ker.tolist()==[[-1],[-26],[16]],`ker`
+
+    a = Matrix([[1,0,0,0,-1,-1,-1,0,0,0,0],
+                [0,1,0,0,1,-1,-1,0,0,0,0],
+                [0,0,-1,0,0,1,0,1,0,0,0],
+                [0,0,0,-1,0,0,1,-1,0,0,0],
+                [0,0,0,0,0,0,0,0,1,-1,0],
+                [0,0,0,0,0,0,0,0,-1,0,1]])
+    for search in [1, 4, 100]:
+        ker, dep, indep, stats = a.integer_nullspace(search=search, return_statistics=True)
+        assert ker.shape==(11, 5),`ker.shape`
+        assert (a*ker).is_zero,`a*ker`
+        assert sorted(dep+indep)==range(11)
+        assert all(type(v) is int for v in ker.data.values())
+        assert stats['nnz']==len(a.data),`stats`
+        assert stats['nnz_kernel']==len(ker.data),`stats`
+        assert stats['max_nnz']>=stats['nnz'],`stats`
+
+    a = Matrix(4,6,random=True)
+    ker, dep, indep = a.integer_nullspace()
+    assert (a*ker).is_zero,`a*ker`
+    assert ker.cols==6-a.rank
+
 def test_gauss_jordan_elimination():
     a = Matrix([[1,0,0,0,-1,-1,-1,0,0,0,0],
                 [0,1,0,0,1,-1,-1,0,0,0,0],
@@ -40,3 +40,19 @@ def test_concatenate():
               [0,0,0,0,5,0,0],
               [0,0,0,0,6,0,0],
               [0,0,0,0,0,7,8]]
+
+def test_jacobian():
+    x, y, z = map(Symbol, 'xyz')
+    exprs = [x*y, y+z**2, Sin(x), Calculus(3)]
+    j = jacobian(exprs, [x, y, z])
+    assert j.tolist()==[[y, x, 0], [0, 1, 2*z], [Cos(x), 0, 0], [0, 0, 0]],`j`
+    assert len(j.data)==5
+    assert jacobian(exprs, ['x', 'y', 'z'])==j
+    assert jacobian(exprs, [x, y, z], processes=2)==j
+
+def test_hessian():
+    x, y, z = map(Symbol, 'xyz')
+    h = hessian(x**2*y + z, [x, y, z])
+    assert h.tolist()==[[2*y, 2*x, 0], [2*x, 0, 0], [0, 0, 0]],`h`
+    assert len(h.data)==3
+    assert hessian(x**2*y + z, [x, y, z], processes=2)==h
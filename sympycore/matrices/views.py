@@ -0,0 +1,298 @@
+""" Provides lazy views of MatrixDict instances.
+
+A view keeps a reference to the data of its parent matrix and maps
+its indices to the indices of the parent on access, so taking row
+and column sub-blocks, transposes or diagonals of large sparse
+matrices does not copy any elements::
+
+  >>> a = Matrix([[1,2,3],[4,5,6]])
+  >>> v = a.view[:, 1:]
+  >>> v.T[1,0]
+  3
+  >>> list(v.diagonal().iter_nonzero())
+  [((0, 0), 2), ((1, 0), 6)]
+
+Views see the changes of the parent matrix. A view is materialised,
+that is, its content is copied to a new MatrixDict instance, when it
+is written to or when a MatrixDict attribute that views do not
+implement, such as ``gauss_jordan_elimination`` or ``lu``, is
+accessed. After that the view is detached from the parent matrix.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['MatrixView', 'SliceView', 'TransposeView', 'DiagonalView']
+
+from ..utils import MATRIX, MATRIX_DICT
+from .algebra import MatrixDict, is_integer
+
+def compose_indices(indices, subindices):
+    """ Return ``[indices[k] for k in subindices]`` as xrange when
+    possible.
+    """
+    if type(indices) is xrange and type(subindices) is xrange:
+        n = len(subindices)
+        if n==0:
+            return xrange(0)
+        step = subindices[1]-subindices[0] if n>1 else 1
+        pstep = indices[1]-indices[0] if len(indices)>1 else 1
+        start = indices[subindices[0]]
+        step *= pstep
+        return xrange(start, start+n*step, step)
+    return tuple([indices[k] for k in subindices])
+
+class MatrixView(object):
+    """ Base class of lazy matrix views.
+
+    Derived classes must define the shape and implement the _get,
+    _iter_nonzero, and _take methods.
+    """
+
+    __slots__ = ['shape', '_matrix']
+
+    rows = property(lambda self: self.shape[0])
+    cols = property(lambda self: self.shape[1])
+
+    def _get(self, i, j):
+        raise NotImplementedError('%s must implement _get' % (type(self).__name__))
+
+    def _iter_nonzero(self):
+        raise NotImplementedError('%s must implement _iter_nonzero' % (type(self).__name__))
+
+    def _take(self, rows, cols):
+        """ Return a view of the rows and cols sequences of view
+        indices.
+        """
+        return SliceView(self.materialize().data, rows, cols)
+
+    @property
+    def is_detached(self):
+        """ True when view does not refer to parent data anymore.
+        """
+        return self._matrix is not None
+
+    @property
+    def T(self):
+        """ Return transposed view.
+        """
+        return TransposeView(self)
+
+    def diagonal(self, k=0):
+        """ Return a view of the k-th diagonal as a column.
+        """
+        return DiagonalView(self, k)
+
+    def iter_nonzero(self):
+        """ Iterate over ``((i, j), x)`` pairs of nonzero elements.
+        """
+        if self._matrix is not None:
+            return iter_nonzero(self._matrix)
+        return self._iter_nonzero()
+
+    def materialize(self):
+        """ Return the content of view as a new MatrixDict instance.
+        """
+        m, n = self.shape
+        return MatrixDict(MATRIX(m, n, MATRIX_DICT), dict(self.iter_nonzero()))
+
+    def detach(self):
+        """ Materialise view in place and return the result.
+        """
+        if self._matrix is None:
+            self._matrix = self.materialize()
+        return self._matrix
+
+    def tolist(self):
+        rows, cols = self.shape
+        return [[self[i,j] for j in xrange(cols)] for i in xrange(rows)]
+
+    def _indices(self, index, length):
+        t = type(index)
+        if t is slice:
+            return xrange(*index.indices(length))
+        if t is tuple or t is list:
+            return tuple(index)
+        if is_integer(index):
+            index = int(index)
+            if index<0:
+                index += length
+            if not 0<=index<length:
+                raise IndexError(`index, length`)
+            return xrange(index, index+1)
+        raise IndexError('index must contain int or slice or tuple, got %s' % (`t`))
+
+    def __getitem__(self, key):
+        if self._matrix is not None:
+            return self._matrix[key]
+        if type(key) is not tuple:
+            key = key, slice(None)
+        i, j = key
+        m, n = self.shape
+        if is_integer(i) and is_integer(j):
+            i, j = int(i), int(j)
+            if i<0:
+                i += m
+            if j<0:
+                j += n
+            if not (0<=i<m and 0<=j<n):
+                raise IndexError(`i, j, m, n`)
+            return self._get(i, j)
+        return self._take(self._indices(i, m), self._indices(j, n))
+
+    def __setitem__(self, key, value):
+        self.detach()[key] = value
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.detach(), name)
+
+    def __eq__(self, other):
+        if isinstance(other, MatrixView):
+            other = other.materialize()
+        return self.materialize()==other
+
+    def __ne__(self, other):
+        return not (self==other)
+
+    def __neg__(self):
+        return -self.materialize()
+
+    def __str__(self):
+        return str(self.materialize())
+
+    def __repr__(self):
+        return '%s(%s, %s)' % (type(self).__name__, self.rows, self.cols)
+
+class SliceView(MatrixView):
+    """ View of data[rows[i], cols[j]] where data is the dictionary of
+    a MatrixDict instance that is not transposed.
+    """
+
+    __slots__ = ['data', 'row_indices', 'col_indices', '_row_map', '_col_map']
+
+    def __init__(self, data, row_indices, col_indices):
+        self.data = data
+        self.row_indices = row_indices
+        self.col_indices = col_indices
+        self.shape = len(row_indices), len(col_indices)
+        self._row_map = self._col_map = None
+        self._matrix = None
+
+    def _get(self, i, j):
+        return self.data.get((self.row_indices[i], self.col_indices[j]), 0)
+
+    def _take(self, rows, cols):
+        return SliceView(self.data,
+                         compose_indices(self.row_indices, rows),
+                         compose_indices(self.col_indices, cols))
+
+    def _iter_nonzero(self):
+        data = self.data
+        row_indices, col_indices = self.row_indices, self.col_indices
+        m, n = self.shape
+        if m*n <= len(data):
+            # the view is smaller than the parent, look up its indices
+            for i, i0 in enumerate(row_indices):
+                for j, j0 in enumerate(col_indices):
+                    x = data.get((i0, j0))
+                    if x is not None:
+                        yield (i, j), x
+            return
+        row_map, col_map = self._row_map, self._col_map
+        if row_map is None:
+            row_map = self._row_map = dict([(i0, i) for i, i0 in enumerate(row_indices)])
+            col_map = self._col_map = dict([(j0, j) for j, j0 in enumerate(col_indices)])
+        for (i0, j0), x in data.iteritems():
+            i = row_map.get(i0)
+            if i is not None:
+                j = col_map.get(j0)
+                if j is not None:
+                    yield (i, j), x
+
+class TransposeView(MatrixView):
+    """ Transposed view of another view.
+    """
+
+    __slots__ = ['view']
+
+    def __init__(self, view):
+        self.view = view
+        m, n = view.shape
+        self.shape = n, m
+        self._matrix = None
+
+    @property
+    def T(self):
+        if self._matrix is not None:
+            return TransposeView(self)
+        return self.view
+
+    def _get(self, i, j):
+        return self.view[j, i]
+
+    def _take(self, rows, cols):
+        return TransposeView(self.view._take(cols, rows))
+
+    def _iter_nonzero(self):
+        for (j, i), x in self.view.iter_nonzero():
+            yield (i, j), x
+
+class DiagonalView(MatrixView):
+    """ Column view of the k-th diagonal of another view.
+    """
+
+    __slots__ = ['view', 'k']
+
+    def __init__(self, view, k=0):
+        self.view = view
+        self.k = k
+        m, n = view.shape
+        if k<0:
+            self.shape = max(0, min(m+k, n)), 1
+        else:
+            self.shape = max(0, min(m, n-k)), 1
+        self._matrix = None
+
+    def _get(self, i, j):
+        k = self.k
+        if k<0:
+            return self.view[i-k, i]
+        return self.view[i, i+k]
+
+    def _iter_nonzero(self):
+        k = self.k
+        view = self.view
+        size = self.shape[0]
+        if isinstance(view, SliceView) and size < len(view.data):
+            for i in xrange(size):
+                x = self._get(i, 0)
+                if x:
+                    yield (i, 0), x
+            return
+        for (i, j), x in view.iter_nonzero():
+            if j-i==k:
+                yield (min(i, j), 0), x
+
+def iter_nonzero(matrix):
+    """ Iterate over ``((i, j), x)`` pairs of nonzero elements of a
+    MatrixDict instance.
+    """
+    head, data = matrix.pair
+    if head.is_transpose:
+        for (j, i), x in data.iteritems():
+            yield (i, j), x
+    else:
+        for ij_x in data.iteritems():
+            yield ij_x
+
+def view(matrix):
+    """ Return view of a MatrixDict instance.
+    """
+    head, data = matrix.pair
+    m, n = head.shape
+    if head.is_diagonal:
+        matrix = matrix.M
+        head = matrix.head
+    if head.is_transpose:
+        return TransposeView(SliceView(data, xrange(n), xrange(m)))
+    return SliceView(data, xrange(m), xrange(n))
@@ -3,3 +3,4 @@
 __docformat__ = "restructuredtext"
 
 from .units import Unit, meter, second, kilogram
+from .quantities import Dimension, Quantity
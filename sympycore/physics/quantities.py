@@ -0,0 +1,346 @@
+#
+# Created October 2026
+#
+""" Provides Dimension and Quantity classes for unit-aware numerical
+computations.
+
+A Dimension is a vector of integer exponents over the SI base units
+with a rational scale, for example kilometer per hour is::
+
+  >>> Dimension.from_unit(1000*meter/(3600*second))
+  Dimension((1, 0, -1, 0, 0, 0, 0), 5/18)
+
+Multiplying and comparing dimensions costs a few integer operations
+instead of symbolic operations of the Unit algebra.
+
+A Quantity pairs a magnitude, a number or a NumPy array, with one
+dimension that is shared by all elements, so checking and converting
+the units of an array costs O(1) operations and a single vectorized
+multiplication::
+
+  >>> v = Quantity(numpy.array([36.0, 72.0]), 1000*meter/(3600*second))
+  >>> v.to(meter/second).magnitude
+  array([ 10.,  20.])
+
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['Dimension', 'Quantity', 'base_units']
+
+from ..core import init_module
+init_module.import_heads()
+
+from ..arithmetic.numbers import div, mpq
+from .units import Unit
+
+# Names of the SI base unit symbols in the order of exponents:
+base_units = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+base_index = dict([(name, i) for i, name in enumerate(base_units)])
+
+def number(obj):
+    """ Return the number of a Calculus or Unit number, otherwise obj.
+    """
+    while hasattr(obj, 'pair'):
+        head, data = obj.pair
+        if head is not NUMBER:
+            raise TypeError('expected number but got %s' % (obj))
+        obj = data
+    return obj
+
+class Dimension(object):
+    """ Represents a physical unit as a tuple of exponents of the SI
+    base units and a scale factor relative to the SI unit.
+    """
+
+    __slots__ = ['exponents', 'scale']
+
+    def __init__(self, exponents=(), scale=1):
+        exponents = tuple(exponents)
+        n = len(base_units)
+        if len(exponents) < n:
+            exponents += (0,) * (n - len(exponents))
+        elif len(exponents) > n:
+            raise ValueError('expected at most %s exponents but got %s' % (n, len(exponents)))
+        self.exponents = exponents
+        self.scale = number(scale)
+
+    @classmethod
+    def from_unit(cls, unit):
+        """ Return Dimension of a Unit expression, a base unit name or
+        a number.
+        """
+        if isinstance(unit, cls):
+            return unit
+        if isinstance(unit, str):
+            i = base_index.get(unit)
+            if i is None:
+                raise ValueError('unknown base unit %r' % (unit))
+            exponents = [0] * len(base_units)
+            exponents[i] = 1
+            return cls(exponents)
+        if not isinstance(unit, Unit):
+            return cls((), unit)
+        head, data = unit.pair
+        if head is NUMBER:
+            return cls((), data)
+        if head is SYMBOL:
+            return cls.from_unit(data)
+        if head is POW:
+            base, exp = data
+            return cls.from_unit(base) ** number(exp)
+        if head is BASE_EXP_DICT:
+            r = cls()
+            for base, exp in data.iteritems():
+                r = r * cls.from_unit(base) ** number(exp)
+            return r
+        if head is TERM_COEFF:
+            term, coeff = data
+            return cls.from_unit(term) * cls((), coeff)
+        if head is TERM_COEFF_DICT and len(data)==1:
+            term, coeff = data.items()[0]
+            return cls.from_unit(term) * cls((), coeff)
+        raise ValueError('cannot convert %s to Dimension' % (unit))
+
+    def as_unit(self):
+        """ Return Dimension as a Unit expression.
+        """
+        r = Unit(NUMBER, 1)
+        for name, e in zip(base_units, self.exponents):
+            if e:
+                r = r * Unit.Symbol(name) ** e
+        if self.scale != 1:
+            r = r * self.scale
+        return r
+
+    def __repr__(self):
+        return '%s(%r, %s)' % (type(self).__name__, self.exponents, self.scale)
+
+    def __str__(self):
+        factors = []
+        for name, e in zip(base_units, self.exponents):
+            if e==1:
+                factors.append(name)
+            elif e:
+                factors.append('%s**%s' % (name, e))
+        if self.scale != 1 or not factors:
+            factors.insert(0, str(self.scale))
+        return '*'.join(factors)
+
+    def __hash__(self):
+        return hash((self.exponents, self.scale))
+
+    def __eq__(self, other):
+        if isinstance(other, Dimension):
+            return self.exponents==other.exponents and self.scale==other.scale
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, Dimension):
+            return not self==other
+        return NotImplemented
+
+    @property
+    def is_dimensionless(self):
+        for e in self.exponents:
+            if e:
+                return False
+        return True
+
+    def is_compatible(self, other):
+        """ Check if dimensions differ only by their scales.
+        """
+        return self.exponents==other.exponents
+
+    def factor(self, other):
+        """ Return the factor that converts magnitudes in self units to
+        magnitudes in other units.
+        """
+        if self.exponents!=other.exponents:
+            raise ValueError('incompatible dimensions %s and %s' % (self, other))
+        if self.scale==other.scale:
+            return 1
+        return div(self.scale, other.scale)
+
+    def __mul__(self, other):
+        if isinstance(other, Dimension):
+            return Dimension([a + b for a, b in zip(self.exponents, other.exponents)],
+                             self.scale * other.scale)
+        if isinstance(other, Unit):
+            return self * Dimension.from_unit(other)
+        return Dimension(self.exponents, self.scale * number(other))
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        if isinstance(other, Dimension):
+            return Dimension([a - b for a, b in zip(self.exponents, other.exponents)],
+                             div(self.scale, other.scale))
+        if isinstance(other, Unit):
+            return self / Dimension.from_unit(other)
+        return Dimension(self.exponents, div(self.scale, number(other)))
+
+    def __rdiv__(self, other):
+        return Dimension.from_unit(other) / self
+
+    __truediv__ = __div__
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exp):
+        if not isinstance(exp, (int, long)):
+            raise TypeError('dimension exponent must be integer but got %r' % (exp,))
+        if exp < 0:
+            scale = div(1, self.scale ** -exp)
+        else:
+            scale = self.scale ** exp
+        return Dimension([a * exp for a in self.exponents], scale)
+
+dimensionless = Dimension()
+
+def as_dimension(unit):
+    if isinstance(unit, Dimension):
+        return unit
+    return Dimension.from_unit(unit)
+
+def is_exact(obj):
+    t = type(obj)
+    return t is int or t is long or t is mpq
+
+def scaled(magnitude, factor):
+    """ Return magnitude multiplied by a conversion factor, exact
+    magnitudes are scaled exactly, other magnitudes (floats, arrays)
+    by the float value of factor.
+    """
+    if factor==1:
+        return magnitude
+    if is_exact(magnitude):
+        return magnitude * factor
+    return magnitude * float(factor)
+
+def divide(a, b):
+    """ Return a/b, exact magnitudes are divided exactly.
+    """
+    if is_exact(a) and is_exact(b):
+        return div(a, b)
+    return a / b
+
+class Quantity(object):
+    """ Represents a number or an array of numbers with a physical unit.
+
+    All elements of a magnitude array share one Dimension, so the
+    arithmetic operations check and convert units once per array.
+    Lists and tuples are converted to NumPy arrays.
+    """
+
+    __slots__ = ['magnitude', 'dimension']
+
+    # NumPy binary operations with Quantity operands defer to Quantity:
+    __array_priority__ = 1000
+    __array_ufunc__ = None
+
+    def __init__(self, magnitude, unit=dimensionless):
+        if type(magnitude) in (list, tuple):
+            import numpy
+            magnitude = numpy.asarray(magnitude)
+        self.magnitude = magnitude
+        self.dimension = as_dimension(unit)
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (type(self).__name__, self.magnitude, self.dimension)
+
+    def __str__(self):
+        return '%s*%s' % (self.magnitude, self.dimension)
+
+    def __len__(self):
+        return len(self.magnitude)
+
+    def __getitem__(self, index):
+        return Quantity(self.magnitude[index], self.dimension)
+
+    def to(self, unit):
+        """ Return quantity converted to unit.
+        """
+        dimension = as_dimension(unit)
+        return Quantity(scaled(self.magnitude, self.dimension.factor(dimension)), dimension)
+
+    def value_in(self, unit):
+        """ Return the magnitude of quantity in unit.
+        """
+        return scaled(self.magnitude, self.dimension.factor(as_dimension(unit)))
+
+    def converted(self, other):
+        """ Return the magnitude of other in the units of self.
+        """
+        if isinstance(other, Quantity):
+            return scaled(other.magnitude, other.dimension.factor(self.dimension))
+        return scaled(other, dimensionless.factor(self.dimension))
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return Quantity(-self.magnitude, self.dimension)
+
+    def __abs__(self):
+        return Quantity(abs(self.magnitude), self.dimension)
+
+    def __add__(self, other):
+        return Quantity(self.magnitude + self.converted(other), self.dimension)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Quantity(self.magnitude - self.converted(other), self.dimension)
+
+    def __rsub__(self, other):
+        return Quantity(self.converted(other) - self.magnitude, self.dimension)
+
+    def __mul__(self, other):
+        if isinstance(other, Quantity):
+            return Quantity(self.magnitude * other.magnitude, self.dimension * other.dimension)
+        if isinstance(other, (Dimension, Unit)):
+            return Quantity(self.magnitude, self.dimension * other)
+        return Quantity(self.magnitude * other, self.dimension)
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        if isinstance(other, Quantity):
+            return Quantity(divide(self.magnitude, other.magnitude), self.dimension / other.dimension)
+        if isinstance(other, (Dimension, Unit)):
+            return Quantity(self.magnitude, self.dimension / other)
+        return Quantity(divide(self.magnitude, other), self.dimension)
+
+    def __rdiv__(self, other):
+        if isinstance(other, (Dimension, Unit)):
+            return Quantity(divide(1, self.magnitude), as_dimension(other) / self.dimension)
+        return Quantity(divide(other, self.magnitude), dimensionless / self.dimension)
+
+    __truediv__ = __div__
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, exp):
+        return Quantity(self.magnitude ** exp, self.dimension ** exp)
+
+    def __eq__(self, other):
+        try:
+            return self.magnitude == self.converted(other)
+        except ValueError:
+            return False
+
+    def __ne__(self, other):
+        try:
+            return self.magnitude != self.converted(other)
+        except ValueError:
+            return True
+
+    def __lt__(self, other):
+        return self.magnitude < self.converted(other)
+
+    def __le__(self, other):
+        return self.magnitude <= self.converted(other)
+
+    def __gt__(self, other):
+        return self.magnitude > self.converted(other)
+
+    def __ge__(self, other):
+        return self.magnitude >= self.converted(other)
@@ -11,6 +11,7 @@ import time
 from collections import defaultdict
 
 from ...matrices import Matrix
+from ...arithmetic.numbers import div
 from .io import load_stoic_from_sbml, load_stoic_from_text
 from .utils import objsize
 
@@ -106,6 +107,7 @@ class SteadyFluxAnalyzer(object):
         self._stoichiometry = None
         self.compute_kernel_GJE_data = None
         self.compute_kernel_SVD_data = None
+        self.compute_kernel_FFE_data = None
 
     @property
     def species(self): return self.source_data[1]
@@ -461,6 +463,90 @@ class SteadyFluxAnalyzer(object):
         self.get_relation_GJE_elapsed = end-start
         return dep_reactions, indep_reactions, r
 
+    def compute_kernel_FFE(self, search=4):
+        """ Compute the integer kernel of stoichiometric matrix via
+        fraction-free elimination routine.
+
+        Parameters
+        ----------
+        search : int
+          Specify parameter to integer_nullspace method.
+
+        See also
+        --------
+        MatrixDict.integer_nullspace
+        """
+        if self.compute_kernel_FFE_data is None:
+            start = time.time ()
+            result = self.stoichiometry.integer_nullspace(labels=self.reactions, search=search,
+                                                          return_statistics=True)
+            end = time.time()
+            self.compute_kernel_FFE_data = result
+            self.compute_kernel_FFE_elapsed = end - start
+
+    def get_kernel_FFE(self, reactions=None):
+        """ Return the integer kernel K from fraction-free elimination routine.
+
+        Notes
+        -----
+        The steady state solution is given by ``reactions = K * parameters``
+        where the rows of K corresponding to ``indep_fluxes`` form a
+        diagonal matrix.
+
+        Parameters
+        ----------
+        reactions : list
+          When specified then the reaction list defines the order of flux rows.
+          Otherwise dependent fluxes are followed by independent fluxes.
+
+        Returns
+        -------
+        fluxes, indep_fluxes, kernel : list, list, Matrix
+        """
+        self.compute_kernel_FFE()
+        ker, dep, indep, statistics = self.compute_kernel_FFE_data
+        if reactions is None:
+            reactions = dep + indep
+        start = time.time ()
+        indices = dict([(r, i) for i, r in enumerate(reactions)])
+        rindices = [indices[r] for r in self.reactions]
+        kernel = Matrix(len(reactions), len(indep),
+                        dict([((rindices[i], j), x) for (i, j), x in ker.data.iteritems()]))
+        end = time.time()
+        self.get_kernel_FFE_elapsed = end-start
+        return reactions, indep, kernel
+
+    def get_relation_FFE(self, reactions=None):
+        """ Return relation matrix R from fraction-free elimination routine.
+
+        Notes
+        -----
+        The steady state solution is given by ``dep_fluxes = R * indep_fluxes``
+
+        Returns
+        -------
+        dep_fluxes, indep_fluxes, rmatrix : list, list, Matrix
+
+        See also
+        --------
+        get_relation_GJE
+        """
+        reactions, indep_reactions, kernel = self.get_kernel_FFE(reactions=reactions)
+        start = time.time()
+        dep_reactions = [r for r in reactions if r not in indep_reactions]
+        indices = dict([(r, i) for i, r in enumerate(reactions)])
+        scales = [kernel[indices[r], j] for j, r in enumerate(indep_reactions)]
+        dep_indices = dict([(indices[r], i) for i, r in enumerate(dep_reactions)])
+        d = {}
+        for (i, j), x in kernel.data.iteritems():
+            i = dep_indices.get(i)
+            if i is not None:
+                d[i, j] = div(x, scales[j])
+        r = Matrix(len(dep_reactions), len(indep_reactions), d)
+        end = time.time()
+        self.get_relation_FFE_elapsed = end-start
+        return dep_reactions, indep_reactions, r
+
     def get_dense_stoichiometry(self, species, reactions):
         import numpy
         r = numpy.zeros (self.stoichiometry.shape, dtype=float)
@@ -642,6 +728,11 @@ class SteadyFluxAnalyzer(object):
         reactions, indep_reactions, kernel = self.get_kernel_GJE()
         return 1-len (kernel.data)/(kernel.shape[0]*kernel.shape[1])
 
+    @property
+    def sparsity_kernel_FFE(self):
+        reactions, indep_reactions, kernel = self.get_kernel_FFE()
+        return 1-len (kernel.data)/(kernel.shape[0]*kernel.shape[1])
+
     @property
     def sparsity_kernel_SVD(self):
         reactions, kernel = self.get_kernel_SVD()
@@ -695,7 +786,7 @@ class SteadyFluxAnalyzer(object):
         print 'system size: ', self.shape
         print 'rank:', self.rank
         for method in methods:
-            assert method in ['GJE', 'SVD'],`method`
+            assert method in ['GJE', 'SVD', 'FFE'],`method`
             for mthprefix in ['compute_kernel_', 'get_kernel_', 'get_relation_']:
                 mthname = mthprefix + method
                 mth = getattr(self, mthname)
@@ -715,3 +806,6 @@ class SteadyFluxAnalyzer(object):
 
         if self.compute_kernel_GJE_data is not None:
             print 'compute_kernel_GJE performed %s row operations' % (len(self.compute_kernel_GJE_data[1]))
+        if self.compute_kernel_FFE_data is not None:
+            statistics = self.compute_kernel_FFE_data[3]
+            print 'compute_kernel_FFE created %(fill_in)s and cancelled %(cancelled)s elements, max nnz %(max_nnz)s' % statistics
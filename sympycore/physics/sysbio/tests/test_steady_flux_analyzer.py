@@ -15,6 +15,21 @@ E+S2=>ES
     print network.label_matrix (kernel, ['%s='%f for f in fluxes], variables)
     print network.source_data
 
+def test_kernel_FFE():
+    network = SteadyFluxAnalyzer('''\
+v1:S1=>S2
+v2:ES=>S1+E
+E+S2=>ES
+''')
+    fluxes, indep_fluxes, kernel = network.get_kernel_FFE()
+    assert len(indep_fluxes)==kernel.shape[1]==len(fluxes)-network.rank
+    assert fluxes[-kernel.shape[1]:]==indep_fluxes
+    fluxes1, indep_fluxes1, kernel1 = network.get_kernel_FFE(network.reactions)
+    assert (network.stoichiometry * kernel1).is_zero
+    dep_fluxes, indep_fluxes, r = network.get_relation_FFE()
+    dep_fluxes2, indep_fluxes2, r2 = network.get_relation_GJE()
+    assert r.shape==r2.shape
+
 def test_example_yeast():
     sbml_file = os.path.join (os.path.dirname (__file__),'yeast_example.xml')
 
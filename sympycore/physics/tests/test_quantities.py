@@ -0,0 +1,92 @@
+
+from sympycore import *
+from sympycore.physics.quantities import base_units
+
+km = 1000*meter
+hour = 3600*second
+
+def test_dimension():
+    d = Dimension.from_unit(km/hour)
+    assert d.exponents==(1, 0, -1, 0, 0, 0, 0), `d.exponents`
+    assert d.scale==mpq((5, 18)), `d.scale`
+    assert Dimension.from_unit(meter)==Dimension.from_unit('m')
+    assert Dimension.from_unit(meter**2*kilogram/second**2).exponents==(2, 1, -2, 0, 0, 0, 0)
+    assert Dimension.from_unit(meter)*Dimension.from_unit(meter)==Dimension.from_unit(meter**2)
+    assert Dimension.from_unit(meter)/Dimension.from_unit(second)==Dimension.from_unit(meter/second)
+    assert Dimension.from_unit(km)**-2==Dimension.from_unit(1/km**2)
+    assert Dimension.from_unit(2)==Dimension((), 2)
+    assert Dimension().is_dimensionless
+    assert not Dimension.from_unit(meter).is_dimensionless
+    assert Dimension.from_unit(km).is_compatible(Dimension.from_unit(meter))
+    assert Dimension.from_unit(km).factor(Dimension.from_unit(meter))==1000
+    assert Dimension.from_unit(meter).factor(Dimension.from_unit(km))==mpq((1, 1000))
+    assert Dimension.from_unit(km/hour).as_unit()==5*meter/(18*second)
+    assert len(set([Dimension.from_unit(meter), Dimension.from_unit('m')]))==1
+    assert len(base_units)==7
+    assert str(Dimension.from_unit(km/hour))=='5/18*m*s**-1', str(Dimension.from_unit(km/hour))
+
+def test_dimension_errors():
+    try:
+        Dimension.from_unit(meter + second)
+    except ValueError:
+        pass
+    else:
+        assert 0, 'expected ValueError'
+    try:
+        Dimension.from_unit(meter).factor(Dimension.from_unit(second))
+    except ValueError:
+        pass
+    else:
+        assert 0, 'expected ValueError'
+    try:
+        Dimension.from_unit('ft')
+    except ValueError:
+        pass
+    else:
+        assert 0, 'expected ValueError'
+
+def test_quantity():
+    d = Quantity(3, km)
+    assert d.value_in(meter)==3000
+    assert (d + Quantity(500, meter)).value_in(meter)==3500
+    assert (d - Quantity(500, meter)).magnitude==mpq((5, 2))
+    assert d==Quantity(3000, meter)
+    assert d!=Quantity(3, meter)
+    assert d!=Quantity(3, second)
+    assert d > Quantity(2999, meter)
+    v = d / Quantity(2, hour)
+    assert v.dimension==Dimension.from_unit(km/hour)
+    assert v.value_in(meter/second)==mpq((5, 12)), `v.value_in(meter/second)`
+    assert (v*Quantity(2, hour)).to(km).magnitude==3
+    assert (d**2).dimension==Dimension.from_unit(km**2)
+    assert (-d).magnitude==-3
+    assert (2*d).magnitude==6
+    assert (d*second).dimension==Dimension.from_unit(km*second)
+    assert (Quantity(2)+1).magnitude==3
+    assert Quantity(mpq((1, 2)), meter).magnitude==mpq((1, 2))
+    assert (1/Quantity(4, second)).dimension==Dimension.from_unit(1/second)
+    try:
+        d + Quantity(1, second)
+    except ValueError:
+        pass
+    else:
+        assert 0, 'expected ValueError'
+
+def test_quantity_array():
+    try:
+        import numpy
+    except ImportError:
+        return
+    x = Quantity([1.0, 2.0, 3.0], km)
+    assert len(x)==3
+    assert isinstance(x.magnitude, numpy.ndarray)
+    assert list(x.value_in(meter))==[1000.0, 2000.0, 3000.0]
+    t = Quantity(numpy.array([1.0, 2.0, 4.0]), hour)
+    v = x / t
+    assert v.dimension==Dimension.from_unit(km/hour)
+    assert numpy.allclose(v.to(meter/second).magnitude, [1/3.6, 1/3.6, 0.5/3.6])
+    y = x + Quantity(numpy.ones(3), meter)
+    assert numpy.allclose(y.magnitude, [1.001, 2.001, 3.001])
+    assert x[1].value_in(meter)==2000.0
+    assert (numpy.ones(3) * x).dimension==x.dimension
+    assert list(x > Quantity(1500.0, meter))==[False, True, True]
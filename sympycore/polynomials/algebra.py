@@ -13,8 +13,21 @@ from ..utils import SYMBOL, NUMBER, ADD, MUL, POW, SPARSE_POLY, SUB, DIV
 from ..basealgebra.algebra import Algebra
 from ..ring import CommutativeRing
 from ..basealgebra.verbatim import Verbatim
-from ..arithmetic.numbers import div
-from ..arithmetic.number_theory import multinomial_coefficients
+from ..arithmetic.numbers import div, mpq
+from ..arithmetic.number_theory import multinomial_coefficients, lcm
+from ..arithmetic.monomials import (mul_exp_coeff_dicts, pow_exp_coeff_dict,
+                                    pow_packed_items, mul_packed_items, PACKED_MUL_THRESHOLD)
+from .gcd import poly_gcd, poly_content
+from .evaluation import HornerPlan
+from .heap import iter_mul_dicts, divide_dicts
+
+def is_symbolic(args):
+    """ Check if args contain algebra elements other than polynomials.
+    """
+    for a in args:
+        if isinstance(a, Algebra) and not isinstance(a, PolynomialRing):
+            return True
+    return False
 
 def cmp_symbols(x, y):
     return cmp(str(x), str(y))
@@ -41,7 +54,17 @@ class PolynomialRingFactory(type):
     def __ne__(self, other):
         return not self==other
 
-    def __getitem__(self, ring_info, cache={}):
+    def __getinitargs__(self):
+        """ Return arguments to PolynomialRingFactory that reconstruct
+        the polynomial ring class. Used by pickle and serialization
+        support.
+        """
+        if self.__name__=='PolynomialRing':
+            return
+        return (self.__name__, self.__bases__,
+                dict(nvars=self.nvars, ring=self.ring, variables=self.variables))
+
+    def __getitem__(self, ring_info):
         """ Return a new polynomial ring class
 
         Examples::
@@ -84,15 +107,12 @@ class PolynomialRingFactory(type):
         variables = tuple(sorted(variables, cmp=cmp_symbols))
         nvars = len(variables)
 
-        r = None #cache.get((variables, ring))
-        if r is None:
-            name = '%s[%s, %s]' % (self.__name__, tuple(variables), ring.__name__)
-            r = PolynomialRingFactory(name,
-                                      (self,),
-                                      dict(nvars=nvars, ring = ring,
-                                           variables = variables))
-            #cache[variables, ring] = r
-        return r
+        # ring classes are not cached, equal rings compare equal
+        name = '%s[%s, %s]' % (self.__name__, tuple(variables), ring.__name__)
+        return PolynomialRingFactory(name,
+                                     (self,),
+                                     dict(nvars=nvars, ring = ring,
+                                          variables = variables))
 
     def is_subring(self, other):
         """ Check if self contains other as a subring, i.e. whether
@@ -113,9 +133,10 @@ class PolynomialRing(CommutativeRing):
     Suitable for representing sparse multivariate polynomials.
     """
 
-    __slots__ = ['_degree', '_ldegree']
+    __slots__ = ['_degree', '_ldegree', '_horner']
     _degree = None
     _ldegree = None
+    _horner = None
     _str_value = None
     
     __metaclass__ = PolynomialRingFactory
@@ -376,8 +397,49 @@ class PolynomialRing(CommutativeRing):
         if cls == other_cls:        
             if cls.nvars==1:
                 return divmod_POLY1_POLY1_SPARSE(self, other, cls)
+            if cls.nvars > 1:
+                return divmod_POLY_POLY_SPARSE(self, other, cls)
         return NotImplemented
 
+    def divides(self, other):
+        """ Check if polynomial self divides other.
+
+        The division stops at the first term of the remainder.
+        """
+        cls = self.__class__
+        if cls != other.__class__:
+            raise TypeError('expected %s instance but got %s' % (cls.__name__, type(other).__name__))
+        return divide_dicts(other.data, self.data, cls.nvars, key=_key_maker(cls),
+                            exact=True) is not None
+
+    def pseudo_divmod(self, other):
+        """ Return ``(s, q, r)`` such that ``s*self == q*other + r``
+        where s is an integer and polynomials q and r have integer
+        coefficients when self and other have.
+
+        The scale s is a product of factors of the leading coefficient
+        of other.
+        """
+        cls = self.__class__
+        if cls != other.__class__:
+            raise TypeError('expected %s instance but got %s' % (cls.__name__, type(other).__name__))
+        s, q, r = divide_dicts(self.data, other.data, cls.nvars, key=_key_maker(cls),
+                               pseudo=True)
+        return s, cls(SPARSE_POLY, dict(q)), cls(SPARSE_POLY, dict(r))
+
+    def iter_mul(self, other):
+        """ Generate the ``(exponents, coefficient)`` terms of the
+        product of polynomials in decreasing monomial order.
+
+        The terms are merged in a heap that holds one term product per
+        term of self, so the working memory does not grow with the
+        number of term products when their sum has heavy cancellation.
+        """
+        cls = self.__class__
+        if cls != other.__class__:
+            raise TypeError('expected %s instance but got %s' % (cls.__name__, type(other).__name__))
+        return iter_mul_dicts(self.data, other.data, cls.nvars, key=_key_maker(cls))
+
     def __div__(self, other):
         cls = self.__class__
         r = self.convert_coefficient(other, typeerror=False)
@@ -404,7 +466,16 @@ class PolynomialRing(CommutativeRing):
         return NotImplemented
 
     def __call__(self, *args):
-        # XXX: Use Horner scheme.
+        if is_symbolic(args):
+            return self.monomial_sum(*args)
+        return self.horner(*args)
+
+    def monomial_sum(self, *args):
+        """ Return the sum of polynomial terms at args.
+
+        Used for symbolic arguments for which the nested Horner
+        scheme would give an unexpanded result.
+        """
         r = 0
         if self.nvars==1:
             for exps, coeff in self.data.iteritems():
@@ -414,6 +485,42 @@ class PolynomialRing(CommutativeRing):
                 r = reduce(lambda x,y: x*y, [a**e for a,e in zip(args,exps)], coeff) + r
         return r
 
+    @property
+    def horner(self):
+        """ Compiled Horner scheme of a polynomial.
+
+        The scheme is compiled on first use and evaluates the
+        polynomial at numbers, polynomials or NumPy arrays.
+        """
+        plan = self._horner
+        if plan is None:
+            plan = self._horner = HornerPlan(self.data, self.nvars)
+        return plan
+
+    def evaluate(self, points):
+        """ Return a list of polynomial values at points.
+
+        For multivariate polynomials points are tuples of variable
+        values. Values of univariate polynomials at exact rational
+        points are computed with integer arithmetic.
+
+        For example,
+
+          >>> p = PolynomialRing['x'].convert([1, 2, 3])
+          >>> p.evaluate([0, 1, mpq((1,2))])
+          [1, 6, mpq((11, 4))]
+
+        """
+        points = list(points)
+        if self.nvars==1:
+            if is_symbolic(points):
+                return map(self.monomial_sum, points)
+        else:
+            for point in points:
+                if is_symbolic(point):
+                    return [self.monomial_sum(*p) for p in points]
+        return self.horner.evaluate(points)
+
     @property
     def degree(self):
         d = self._degree
@@ -454,6 +561,65 @@ class PolynomialRing(CommutativeRing):
             return self.zero
         raise NotImplementedError(`self,nvars`)
 
+    def content(self):
+        """ Return the content of a polynomial, that is, the greatest
+        common divisor of its rational coefficients. The sign of the
+        content is chosen such that the primitive part has positive
+        leading coefficient.
+
+        Examples::
+
+          r = PolynomialRing['x']
+          r.convert([6, 4]).content() -> 2
+          r.convert([-1, mpq((1,2))]).content() -> 1/2
+        """
+        data = self.data
+        if not data:
+            return 0
+        denom, idata = _as_integer_dict(self)
+        return div(poly_content(idata), denom)
+
+    def primitive(self):
+        """ Return ``(content, primitive part)`` of a polynomial.
+        """
+        c = self.content()
+        if c==1 or c==0:
+            return c, self
+        return c, mul_POLY_COEFF(self, div(1, c), type(self))
+
+    def gcd(self, other):
+        """ Return the greatest common divisor of polynomials.
+
+        For polynomials with integer coefficients the result has
+        positive leading coefficient, for polynomials with rational
+        coefficients the result is a primitive polynomial.
+
+        Examples::
+
+          r = PolynomialRing[('x','y')]
+          r.convert('x**2 - y**2').gcd(r.convert('x*y + y**2')) -> x + y
+        """
+        return self.cofactors(other)[0]
+
+    def cofactors(self, other):
+        """ Return ``(h, cff, cfg)`` where ``h`` is the greatest common
+        divisor of polynomials self and other, ``cff = self/h`` and
+        ``cfg = other/h``.
+        """
+        cls = self.__class__
+        other_cls = other.__class__
+        if cls != other_cls:
+            other = self.convert(other)
+            other_cls = other.__class__
+            if cls != other_cls:
+                if cls.is_subring(other_cls):
+                    return self.as_algebra(other_cls).cofactors(other)
+                if not other_cls.is_subring(cls):
+                    new_cls = PolynomialRing[cls.variables+other_cls.variables, cls.ring]
+                    return self.as_algebra(new_cls).cofactors(other.as_algebra(new_cls))
+                other = other.as_algebra(cls)
+        return gcd_POLY_POLY(self, other, cls)
+
     def diff(self, index=0): # TODO: don't use index as the order of variables is automatically sorted
         if self.nvars==0:
             return self.zero
@@ -524,6 +690,57 @@ class PolynomialRing(CommutativeRing):
             return result
         raise NotImplementedError(`self.variables, variable, index`)
 
+classes.PolynomialRing = PolynomialRing
+
+def _as_integer_dict(poly):
+    """ Return ``(denom, data)`` such that ``poly == cls(data)/denom``
+    where data is a dictionary of exponent tuples and integer
+    coefficients.
+    """
+    nvars = poly.nvars
+    items = []
+    denom = 1
+    for exps, coeff in poly.data.iteritems():
+        if type(exps) in (int, long):
+            exps = exps,
+        elif isinstance(exps, IntegerList):
+            exps = tuple(exps.data)
+        else:
+            exps = tuple(exps)
+        if isinstance(coeff, mpq):
+            denom = lcm(denom, coeff[1])
+        elif not isinstance(coeff, (int, long)):
+            raise NotImplementedError('polynomial gcd with %s coefficients' % (type(coeff).__name__))
+        items.append((exps, coeff))
+    if denom==1:
+        return 1, dict(items)
+    return denom, dict([(exps, int(coeff * denom)) for exps, coeff in items])
+
+def _from_integer_dict(data, cls, denom=1):
+    """ Inverse of _as_integer_dict.
+    """
+    d = {}
+    if cls.nvars==1:
+        for (e,), c in data.iteritems():
+            d[e] = div(c, denom)
+    else:
+        for exps, c in data.iteritems():
+            d[AdditiveTuple(list(exps))] = div(c, denom)
+    return cls(SPARSE_POLY, d)
+
+def gcd_POLY_POLY(lhs, rhs, cls):
+    ldenom, ldata = _as_integer_dict(lhs)
+    rdenom, rdata = _as_integer_dict(rhs)
+    h, cff, cfg = poly_gcd(ldata, rdata, cls.nvars)
+    if ldenom==1 and rdenom==1:
+        return _from_integer_dict(h, cls), _from_integer_dict(cff, cls), _from_integer_dict(cfg, cls)
+    # over rationals, return primitive gcd
+    c = poly_content(h)
+    if c != 1:
+        h = dict([(e, v // c) for e, v in h.iteritems()])
+    return _from_integer_dict(h, cls), _from_integer_dict(cff, cls, div(ldenom, c)), \
+           _from_integer_dict(cfg, cls, div(rdenom, c))
+
 def divmod_POLY1_POLY1_SPARSE(lhs, rhs, cls):
     d2 = rhs.degree
     c2 = rhs.coeff
@@ -560,6 +777,18 @@ def divmod_POLY1_POLY1_SPARSE(lhs, rhs, cls):
                     del dr[e0]
                     dseq_remove(e0)
 
+def _key_maker(cls):
+    """ Return function that makes a dictionary key from a list of
+    exponents, or None for IntegerList keys.
+    """
+    if cls.nvars==1:
+        return lambda exps: exps[0]
+    return None
+
+def divmod_POLY_POLY_SPARSE(lhs, rhs, cls):
+    q, r = divide_dicts(lhs.data, rhs.data, cls.nvars)
+    return cls(SPARSE_POLY, dict(q)), cls(SPARSE_POLY, dict(r))
+
 def divmod_POLY1_POLY1_DENSE(lhs, rhs, cls):
     if not rhs.coeff:
         raise ZeroDivisionError, "polynomial division"
@@ -594,6 +823,11 @@ def pow_POLY_INT(base, exp, cls):
         exps, coeff = data.items()[0]
         return cls(SPARSE_POLY, {exps * exp: coeff ** exp})
     nvars = cls.nvars
+    if nvars==1:
+        # integer exponents are packed monomials
+        return cls(SPARSE_POLY, dict(pow_packed_items(data.items(), exp)))
+    if nvars > 1:
+        return cls(SPARSE_POLY, pow_exp_coeff_dict(data, exp, nvars))
     d = {}
     items = data.items()
     m = len(data)
@@ -646,6 +880,11 @@ def iadd_POLY_POLY(lhs, rhs, cls):
     
 
 def mul_POLY_POLY(lhs, rhs, cls):
+    if len(lhs.data) * len(rhs.data) >= PACKED_MUL_THRESHOLD:
+        if cls.nvars==1:
+            return cls(SPARSE_POLY, mul_packed_items(lhs.data.iteritems(), rhs.data.items()))
+        if cls.nvars > 1:
+            return cls(SPARSE_POLY, mul_exp_coeff_dicts(lhs.data, rhs.data, cls.nvars))
     d = {}
     for exps1, coeff1 in lhs.data.iteritems():
         for exps2, coeff2 in rhs.data.iteritems():
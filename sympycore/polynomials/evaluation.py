@@ -0,0 +1,263 @@
+#
+# Created October 2026
+#
+""" Provides fast evaluation of polynomials at many points.
+
+HornerPlan compiles a sparse multivariate polynomial into a Python
+function that evaluates the nested Horner scheme::
+
+  3*x**4*y + 2*x*y**2 + 1 -> ((3*y)*x**3 + 2*y**2)*x + 1
+
+The compiled function accepts numbers, algebra elements or NumPy
+arrays. Batch evaluation at exact rational points clears
+denominators and uses integer arithmetic. multipoint_evaluation
+implements subproduct tree evaluation of univariate polynomials.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['HornerPlan', 'multipoint_evaluation']
+
+import sys
+
+from ..arithmetic.numbers import mpq, normalized_fraction
+from ..arithmetic.number_theory import lcm
+from ..calculus.series import mul_coeffs, PowerSeries
+
+def is_array(obj):
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+def numeric_coefficient(c):
+    """ Return float or complex value of c, or None.
+    """
+    try:
+        return float(c)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return complex(c)
+    except (TypeError, ValueError):
+        return None
+
+def horner_tree(items, nvars, index=0):
+    """ Return a nested list ``[(exp, subtree), ...]`` of decreasing
+    exponents of variable index, leaves are coefficients.
+    """
+    if index==nvars:
+        return items[0][1]
+    groups = {}
+    for exps, c in items:
+        groups.setdefault(exps[index], []).append((exps, c))
+    return [(e, horner_tree(groups[e], nvars, index+1)) for e in sorted(groups, reverse=True)]
+
+class HornerPlan(object):
+    """ Compiled Horner scheme of a polynomial given by a dictionary
+    of ``{exponents: coefficient}`` pairs.
+    """
+
+    def __init__(self, data, nvars):
+        self.nvars = nvars
+        items = []
+        for exps, c in data.iteritems():
+            if isinstance(exps, (int, long)):
+                exps = exps,
+            items.append((tuple(exps), c))
+        self.data = items
+        self.coeffs = coeffs = []
+        self.lines = lines = []
+        if items:
+            result = self.generate(horner_tree(items, nvars), 0)
+        else:
+            result = '0'
+        args = ['x%s' % (i) for i in range(nvars)]
+        self.source = 'def horner(%s):\n    %s\n' \
+            % (', '.join(args + ['c=c']), '\n    '.join(lines + ['return %s' % (result)]))
+        self.function = self.compile(tuple(coeffs))
+        self._numeric_function = None
+
+    def compile(self, coeffs):
+        namespace = dict(c=coeffs)
+        exec self.source in namespace
+        return namespace['horner']
+
+    def generate(self, tree, index):
+        """ Generate code of a Horner tree, return the name of the value.
+        """
+        if index==self.nvars:
+            self.coeffs.append(tree)
+            return 'c[%s]' % (len(self.coeffs)-1)
+        x = 'x%s' % (index)
+        r = 'r%s_%s' % (index, len(self.lines))
+        previous = None
+        for e, subtree in tree:
+            value = self.generate(subtree, index+1)
+            if previous is None:
+                self.lines.append('%s = %s' % (r, value))
+            else:
+                self.lines.append('%s = %s*%s + %s' % (r, r, power(x, previous - e), value))
+            previous = e
+        if previous:
+            self.lines.append('%s = %s*%s' % (r, r, power(x, previous)))
+        return r
+
+    @property
+    def numeric_function(self):
+        """ Horner function with float or complex coefficients, or None.
+        """
+        f = self._numeric_function
+        if f is None:
+            coeffs = map(numeric_coefficient, self.coeffs)
+            if None in coeffs:
+                f = False
+            else:
+                f = self.compile(tuple(coeffs))
+            self._numeric_function = f
+        return f or None
+
+    def __call__(self, *args):
+        if len(args)!=self.nvars:
+            raise TypeError('expected %s arguments but got %s' % (self.nvars, len(args)))
+        for a in args:
+            if is_array(a):
+                f = self.numeric_function
+                if f is not None:
+                    return f(*args)
+                break
+        return self.function(*args)
+
+    def evaluate(self, points):
+        """ Return a list of polynomial values at points.
+
+        Points are tuples of variable values, or values when the
+        polynomial is univariate.
+        """
+        if self.nvars==1:
+            points = list(points)
+            if is_rational_sequence(points):
+                return self.evaluate_rational(points)
+            return map(self.function, points)
+        f = self.function
+        return [f(*point) for point in points]
+
+    def dense_coefficients(self):
+        """ Return the coefficient list of a univariate polynomial.
+        """
+        degree = max([exps[0] for exps, c in self.data] + [0])
+        coeffs = [0] * (degree + 1)
+        for exps, c in self.data:
+            coeffs[exps[0]] = c
+        return coeffs
+
+    def evaluate_rational(self, points):
+        """ Return values of a univariate polynomial with rational
+        coefficients at rational points.
+        """
+        if not is_rational_sequence([c for exps, c in self.data]):
+            return map(self.function, points)
+        coeffs = self.dense_coefficients()
+        if len(coeffs) > 4 * len(self.data):
+            # sparse polynomial, avoid dense Horner
+            return map(self.function, points)
+        # p(a/b) = (sum(C[k] * a**k * b**(d-k)) / b**d) / D with integers C[k]
+        denom = 1
+        for c in coeffs:
+            if type(c) is mpq:
+                denom = lcm(denom, c[1])
+        icoeffs = [integer_numerator(c, denom) for c in coeffs]
+        degree = len(coeffs) - 1
+        values = []
+        for x in points:
+            if type(x) is mpq:
+                a, b = x
+                r = icoeffs[degree]
+                bk = 1
+                for k in xrange(degree-1, -1, -1):
+                    bk *= b
+                    r = r * a + icoeffs[k] * bk
+                values.append(normalized_fraction(r, denom * bk))
+            else:
+                r = icoeffs[degree]
+                for k in xrange(degree-1, -1, -1):
+                    r = r * x + icoeffs[k]
+                if denom==1:
+                    values.append(r)
+                else:
+                    values.append(normalized_fraction(r, denom))
+        return values
+
+def power(x, e):
+    if e==1:
+        return x
+    return '%s**%s' % (x, e)
+
+def is_rational_sequence(seq):
+    for x in seq:
+        t = type(x)
+        if not (t is int or t is long or t is mpq):
+            return False
+    return True
+
+def integer_numerator(c, denom):
+    if type(c) is mpq:
+        p, q = c
+        return p * (denom // q)
+    return c * denom
+
+def multipoint_evaluation(coeffs, points):
+    """ Evaluate a univariate polynomial with coefficients
+    ``coeffs[k]`` of ``x**k`` at points using a subproduct tree.
+
+    The polynomial is reduced modulo the products of ``x - point``
+    over halves of points recursively, so the values are remainders
+    modulo ``x - point``. Division uses Newton iteration for the
+    reciprocal of reversed divisors.
+
+    The method needs O(M(n) log(n)) coefficient operations for n
+    points where M(n) is the cost of multiplication. With integer
+    points the coefficients of the subproduct tree grow fast, so
+    HornerPlan.evaluate is faster unless the coefficient ring has
+    bounded size elements.
+    """
+    points = list(points)
+    n = max(len(coeffs), 2)
+    if len(points) > n:
+        # trees over chunks of n points keep the products small
+        values = []
+        for i in xrange(0, len(points), n):
+            values.extend(multipoint_evaluation(coeffs, points[i:i+n]))
+        return values
+    if not points:
+        return []
+    tree = [[[-x, 1] for x in points]]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        next = []
+        for i in xrange(0, len(level) - 1, 2):
+            a, b = level[i], level[i+1]
+            next.append(mul_coeffs(a, b, len(a) + len(b) - 1))
+        if len(level) % 2:
+            next.append(level[-1])
+        tree.append(next)
+    remainders = [remainder(list(coeffs), tree[-1][0])]
+    for level in reversed(tree[:-1]):
+        next = []
+        for i, g in enumerate(level):
+            next.append(remainder(remainders[i // 2], g))
+        remainders = next
+    return [(r[0] if r else 0) for r in remainders]
+
+def remainder(f, g):
+    """ Return the remainder of f divided by a monic polynomial g.
+    """
+    while f and not f[-1]:
+        f = f[:-1]
+    n, m = len(f) - 1, len(g) - 1
+    if n < m:
+        return f
+    k = n - m + 1
+    # quotient of reversed polynomials: rev(q) = rev(f) / rev(g) mod x**k
+    rg = PowerSeries(g[::-1][:k] + [0] * (k - min(k, m + 1)))
+    rq = mul_coeffs(f[::-1], rg.reciprocal().coeffs, k)
+    q = rq[::-1]
+    qg = mul_coeffs(q, g, m)
+    return [x - y for x, y in zip(f[:m], qg + [0] * (m - len(qg)))]
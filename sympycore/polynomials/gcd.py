@@ -0,0 +1,578 @@
+#
+# Created: October 2026
+#
+""" Provides greatest common divisor algorithms for sparse multivariate
+polynomials.
+
+Polynomials are represented as dictionaries of ``{<exponents>:
+<coefficient>}`` pairs where ``<exponents>`` is a tuple of nonnegative
+integers (all of the same length ``nvars``) and ``<coefficient>`` is a
+nonzero integer. Monomials are ordered lexicographically, that is, by
+comparing the exponent tuples.
+
+The GCD is computed by Brown's dense modular algorithm: the
+polynomials are reduced modulo a sequence of large primes, images of
+the GCD modulo a prime are computed by evaluating the last variable
+at several points, recursing and interpolating (Newton), and the
+integer result is recovered with Chinese remaindering. Unlucky primes
+and evaluation points are detected by comparing the leading monomials
+of the images, the final result is verified by trial division.
+
+For three and more variables, the images following the first one are
+computed with Zippel's sparse interpolation: the monomial support of
+the first image is assumed and only its coefficients are determined
+from univariate GCDs by solving Vandermonde systems. Sparse
+interpolation is used when the leading coefficient of the first image
+with respect to the first variable is a monomial, the dense algorithm
+is used otherwise or when the assumed support turns out to be wrong.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['poly_gcd', 'poly_content', 'poly_primitive',
+           'poly_div_exact', 'poly_mul', 'poly_mul_value']
+
+import random
+
+from ..arithmetic.number_theory import gcd as igcd
+from .heap import divide_dicts
+
+_random = random.Random(20261019)
+
+class ModularGCDFailed(Exception):
+    """ Raised when a prime has not enough good evaluation points.
+    """
+
+def _is_prime(n):
+    """ Deterministic Miller-Rabin test for ``n < 3215031751``.
+    """
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in (2, 3, 5, 7):
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for r in xrange(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _iter_primes(start=2**31 - 1):
+    """ Generate primes in decreasing order starting from start.
+    """
+    n = start
+    while n > 2:
+        if _is_prime(n):
+            yield n
+        n -= 1
+    raise ModularGCDFailed('ran out of primes')
+
+def _invmod(a, p):
+    """ Return the inverse of a modulo prime p.
+    """
+    return pow(a, p - 2, p)
+
+#----------------------------------------------------------------------------
+# Dense univariate polynomials over Z_p, coefficient lists in increasing degree.
+#
+
+def _gf_strip(f):
+    while f and not f[-1]:
+        f.pop()
+    return f
+
+def _gf_monic(f, p):
+    if not f:
+        return f
+    lc = f[-1]
+    if lc == 1:
+        return f
+    inv = _invmod(lc, p)
+    return [c * inv % p for c in f]
+
+def _gf_rem(f, g, p):
+    f = list(f)
+    dg = len(g) - 1
+    inv = _invmod(g[-1], p)
+    while len(f) > dg:
+        c = f[-1] * inv % p
+        if c:
+            k = len(f) - 1 - dg
+            for i, b in enumerate(g):
+                f[k + i] = (f[k + i] - c * b) % p
+        f.pop()
+        _gf_strip(f)
+    return f
+
+def _gf_quo(f, g, p):
+    f = list(f)
+    dg = len(g) - 1
+    if len(f) <= dg:
+        return []
+    inv = _invmod(g[-1], p)
+    q = [0] * (len(f) - dg)
+    while len(f) > dg:
+        c = f[-1] * inv % p
+        k = len(f) - 1 - dg
+        q[k] = c
+        if c:
+            for i, b in enumerate(g):
+                f[k + i] = (f[k + i] - c * b) % p
+        f.pop()
+    return _gf_strip(q)
+
+def _gf_gcd(f, g, p):
+    while g:
+        f, g = g, _gf_rem(f, g, p)
+    return _gf_monic(f, p)
+
+def _gf_mul(f, g, p):
+    if not f or not g:
+        return []
+    r = [0] * (len(f) + len(g) - 1)
+    for i, a in enumerate(f):
+        if a:
+            for j, b in enumerate(g):
+                r[i + j] += a * b
+    return _gf_strip([c % p for c in r])
+
+def _gf_eval(f, a, p):
+    r = 0
+    for c in reversed(f):
+        r = (r * a + c) % p
+    return r
+
+#----------------------------------------------------------------------------
+# Sparse multivariate polynomials.
+#
+
+def poly_mul(f, g, p=None):
+    """ Return the product of polynomials f and g (modulo p when given).
+    """
+    d = {}
+    for e1, c1 in f.iteritems():
+        for e2, c2 in g.iteritems():
+            e = tuple([a + b for a, b in zip(e1, e2)])
+            c = d.get(e, 0) + c1 * c2
+            if p is not None:
+                c %= p
+            if c:
+                d[e] = c
+            elif e in d:
+                del d[e]
+    return d
+
+def poly_mul_value(f, value, p=None):
+    """ Return the product of polynomial f and number value.
+    """
+    if p is None:
+        if value == 1:
+            return dict(f)
+        return dict([(e, c * value) for e, c in f.iteritems() if c * value])
+    d = {}
+    for e, c in f.iteritems():
+        c = c * value % p
+        if c:
+            d[e] = c
+    return d
+
+def _div_integer(c, lc):
+    q, r = divmod(c, lc)
+    if r:
+        return
+    return q
+
+def poly_div_exact(f, g, p=None):
+    """ Return the quotient q of polynomials such that ``f == q*g``.
+
+    When f is not divisible by g, return None. Without p the
+    coefficients must be integers and the quotient must have integer
+    coefficients, otherwise the arithmetic is modulo p.
+    """
+    if not g:
+        raise ZeroDivisionError('polynomial division')
+    if not f:
+        return {}
+    if p is None:
+        coeff_div = _div_integer
+    else:
+        inv = _invmod(g[max(g)] % p, p)
+        coeff_div = lambda c, lc: c * inv % p
+    result = divide_dicts(f, g, len(iter(g).next()), key=tuple,
+                          coeff_div=coeff_div, exact=True, p=p)
+    if result is None:
+        return
+    return dict(result[0])
+
+def poly_content(f):
+    """ Return the integer content of a polynomial f.
+
+    The sign of the content is the sign of the leading coefficient of
+    f so that the primitive part has positive leading coefficient.
+    """
+    if not f:
+        return 0
+    c = 0
+    for v in f.itervalues():
+        c = igcd(c, v)
+        if c == 1:
+            break
+    c = abs(c)
+    if f[max(f)] < 0:
+        return -c
+    return c
+
+def poly_primitive(f):
+    """ Return the content and primitive part of a polynomial f.
+    """
+    c = poly_content(f)
+    if c == 1 or not c:
+        return c, dict(f)
+    return c, dict([(e, v // c) for e, v in f.iteritems()])
+
+def _reduce_mod(f, p):
+    d = {}
+    for e, c in f.iteritems():
+        c %= p
+        if c:
+            d[e] = c
+    return d
+
+def _eval_last(f, a, p):
+    """ Evaluate the last variable of f at a modulo p.
+    """
+    d = {}
+    for e, c in f.iteritems():
+        k = e[:-1]
+        v = (d.get(k, 0) + c * pow(a, e[-1], p)) % p
+        if v:
+            d[k] = v
+        elif k in d:
+            del d[k]
+    return d
+
+def _coeffs_in_last(f):
+    """ Return f as ``{<exponents of leading variables>: <dense list in last variable>}``.
+    """
+    d = {}
+    for e, c in f.iteritems():
+        k = e[:-1]
+        l = d.get(k)
+        if l is None:
+            l = d[k] = []
+        n = e[-1]
+        if len(l) <= n:
+            l.extend([0] * (n + 1 - len(l)))
+        l[n] = c
+    return d
+
+def _from_coeffs_in_last(d):
+    r = {}
+    for k, l in d.iteritems():
+        for n, c in enumerate(l):
+            if c:
+                r[k + (n,)] = c
+    return r
+
+def _content_in_last(coeffs, p):
+    c = []
+    for l in coeffs.itervalues():
+        c = _gf_gcd(c, l, p)
+        if len(c) == 1:
+            break
+    return c
+
+def _solve_transposed_vandermonde(nodes, values, p):
+    """ Return c such that ``sum(c[j] * nodes[j]**(i+1)) == values[i]``
+    modulo p for ``i = 0..len(nodes)-1``.
+    """
+    n = len(nodes)
+    # master polynomial prod(z - v), coefficients in increasing degree:
+    master = [1]
+    for v in nodes:
+        master = _gf_mul(master, [-v % p, 1], p)
+    coeffs = []
+    for v in nodes:
+        # synthetic division master(z)/(z - v):
+        q = [0] * n
+        r = master[n]
+        for k in xrange(n - 1, -1, -1):
+            q[k] = r
+            r = (master[k] + r * v) % p
+        num = 0
+        for k in xrange(n):
+            num += q[k] * values[k]
+        den = _gf_eval(q, v, p) * v % p
+        coeffs.append(num * _invmod(den, p) % p)
+    return coeffs
+
+def _make_skeleton(h):
+    """ Return the monomial support of h suitable for sparse interpolation.
+
+    Return None when the leading coefficient of h with respect to the
+    first variable is not a monomial.
+    """
+    lm = max(h)
+    dmax = lm[0]
+    groups = {}
+    for e in h:
+        if e[0] == dmax:
+            if e != lm:
+                return
+            continue
+        l = groups.get(e[0])
+        if l is None:
+            l = groups[e[0]] = []
+        l.append(e[1:])
+    return dmax, lm[1:], groups
+
+def _sparse_image(f, g, p, skeleton, scale):
+    """ Return the GCD of f and g modulo p having the support given by
+    skeleton and leading coefficient scale.
+
+    f and g have at least two variables. Return None when the GCD
+    cannot be determined using the skeleton.
+    """
+    dmax, m_lead, groups = skeleton
+    nunknowns = max([0] + [len(l) for l in groups.itervalues()])
+    npoints = nunknowns + 1
+    b = [_random.randint(2, p - 1) for v in m_lead]
+    def node(rest):
+        r = 1
+        for bl, el in zip(b, rest):
+            if el:
+                r = r * pow(bl, el, p) % p
+        return r
+    fterms = [(e[0], node(e[1:])) for e in f]
+    gterms = [(e[0], node(e[1:])) for e in g]
+    fcur, gcur = f.values(), g.values()
+    df, dg = max(f)[0], max(g)[0]
+    lead_node = node(m_lead)
+    images = []
+    s = scale
+    for i in xrange(npoints):
+        uf, ug = [0] * (df + 1), [0] * (dg + 1)
+        for k, (d, w) in enumerate(fterms):
+            c = fcur[k] = fcur[k] * w % p
+            uf[d] += c
+        for k, (d, w) in enumerate(gterms):
+            c = gcur[k] = gcur[k] * w % p
+            ug[d] += c
+        uf = _gf_strip([c % p for c in uf])
+        ug = _gf_strip([c % p for c in ug])
+        if len(uf) != df + 1 or len(ug) != dg + 1:
+            return
+        u = _gf_gcd(uf, ug, p)
+        if len(u) != dmax + 1:
+            return
+        s = s * lead_node % p
+        images.append([c * s % p for c in u])
+    h = {(dmax,) + m_lead: scale}
+    for d in xrange(dmax):
+        w = [img[d] for img in images]
+        rests = groups.get(d)
+        if rests is None:
+            for c in w:
+                if c:
+                    return
+            continue
+        nodes = [node(r) for r in rests]
+        if len(set(nodes)) != len(nodes):
+            return
+        n = len(nodes)
+        coeffs = _solve_transposed_vandermonde(nodes, w[:n], p)
+        # use the remaining points to check the solution:
+        for i in xrange(n, npoints):
+            v = 0
+            for c, node_j in zip(coeffs, nodes):
+                v += c * pow(node_j, i + 1, p)
+            if v % p != w[i]:
+                return
+        for r, c in zip(rests, coeffs):
+            if c:
+                h[(d,) + r] = c
+    return h
+
+def _gcd_mod_p(f, g, p, nvars):
+    """ Return the monic GCD of nonzero polynomials f and g modulo prime p.
+    """
+    if nvars == 1:
+        uf, ug = [0] * (max(f)[0] + 1), [0] * (max(g)[0] + 1)
+        for (e,), c in f.iteritems():
+            uf[e] = c
+        for (e,), c in g.iteritems():
+            ug[e] = c
+        h = _gf_gcd(uf, ug, p)
+        return dict([((e,), c) for e, c in enumerate(h) if c])
+
+    # view f and g as polynomials in leading variables with
+    # coefficients in Z_p[<last variable>]:
+    fc, gc = _coeffs_in_last(f), _coeffs_in_last(g)
+    cf, cg = _content_in_last(fc, p), _content_in_last(gc, p)
+    cont = _gf_gcd(cf, cg, p)
+    if len(cf) > 1:
+        fc = dict([(k, _gf_quo(l, cf, p)) for k, l in fc.iteritems()])
+    if len(cg) > 1:
+        gc = dict([(k, _gf_quo(l, cg, p)) for k, l in gc.iteritems()])
+    lf, lg = fc[max(fc)], gc[max(gc)]
+    gamma = _gf_gcd(lf, lg, p)
+    f, g = _from_coeffs_in_last(fc), _from_coeffs_in_last(gc)
+    bound = min(max([len(l) for l in fc.itervalues()]),
+                max([len(l) for l in gc.itervalues()])) + len(gamma) - 2
+
+    h, q, lm, count = None, None, None, 0
+    use_sparse = nvars > 2
+    skeleton = None
+    for a in xrange(p):
+        ga = _gf_eval(gamma, a, p)
+        if not ga or not _gf_eval(lf, a, p) or not _gf_eval(lg, a, p):
+            continue
+        fa, gb = _eval_last(f, a, p), _eval_last(g, a, p)
+        ha = None
+        if skeleton is not None:
+            ha = _sparse_image(fa, gb, p, skeleton, ga)
+            m = lm
+        if ha is None:
+            ha = _gcd_mod_p(fa, gb, p, nvars - 1)
+            m = max(ha)
+            ha = poly_mul_value(ha, ga, p)
+        if lm is None or m < lm:
+            # all previous evaluation points were unlucky
+            h = dict([(e + (0,), c) for e, c in ha.iteritems()])
+            q = [-a % p, 1]
+            lm, count = m, 1
+            changed = True
+            if use_sparse:
+                skeleton = _make_skeleton(ha)
+        elif m > lm:
+            # unlucky evaluation point
+            continue
+        else:
+            ha0 = _eval_last(h, a, p)
+            inv = _invmod(_gf_eval(q, a, p), p)
+            changed = False
+            for k in set(ha).union(ha0):
+                c = (ha.get(k, 0) - ha0.get(k, 0)) * inv % p
+                if not c:
+                    continue
+                changed = True
+                for n, b in enumerate(q):
+                    e = k + (n,)
+                    v = (h.get(e, 0) + c * b) % p
+                    if v:
+                        h[e] = v
+                    elif e in h:
+                        del h[e]
+            q = _gf_mul(q, [-a % p, 1], p)
+            count += 1
+        if count > bound or not changed:
+            hc = _coeffs_in_last(h)
+            c = _content_in_last(hc, p)
+            hc = dict([(k, _gf_quo(l, c, p)) for k, l in hc.iteritems()])
+            candidate = _from_coeffs_in_last(hc)
+            if poly_div_exact(f, candidate, p) is not None \
+                   and poly_div_exact(g, candidate, p) is not None:
+                if len(cont) > 1:
+                    candidate = poly_mul(candidate, _from_coeffs_in_last({(0,)*(nvars-1): cont}), p)
+                lc = candidate[max(candidate)]
+                return poly_mul_value(candidate, _invmod(lc, p), p)
+            if skeleton is not None and count > bound:
+                # the support of the first image was wrong, start over
+                # using dense interpolation
+                use_sparse = False
+                skeleton = lm = None
+    raise ModularGCDFailed('not enough evaluation points modulo %s' % (p))
+
+def _crt(h, m, hp, p):
+    """ Combine h (mod m) and hp (mod p) to a polynomial modulo m*p
+    with symmetric coefficients.
+    """
+    mp = m * p
+    half = mp // 2
+    inv = _invmod(m % p, p)
+    r = {}
+    for e in set(h).union(hp):
+        a = h.get(e, 0)
+        c = a + m * (((hp.get(e, 0) - a) * inv) % p)
+        c %= mp
+        if c > half:
+            c -= mp
+        if c:
+            r[e] = c
+    return r
+
+def poly_gcd(f, g, nvars):
+    """ Return ``(h, cff, cfg)`` where h is the GCD of polynomials f and
+    g with integer coefficients, ``f == h*cff`` and ``g == h*cfg``.
+
+    The leading coefficient of h is positive.
+    """
+    if not f and not g:
+        return {}, {}, {}
+    zero = (0,) * nvars
+    if not f or not g:
+        if not f:
+            h, cf, cg = g, {}, {zero: 1}
+        else:
+            h, cf, cg = f, {zero: 1}, {}
+        if h[max(h)] < 0:
+            h = poly_mul_value(h, -1)
+            cf = poly_mul_value(cf, -1)
+            cg = poly_mul_value(cg, -1)
+        return dict(h), cf, cg
+    cont_f, pf = poly_primitive(f)
+    cont_g, pg = poly_primitive(g)
+    cont = abs(igcd(cont_f, cont_g))
+    if nvars == 0 or (len(pf) == 1 and len(pg) == 1):
+        # gcd of monomials
+        (ef, vf), = pf.items()
+        (eg, vg), = pg.items()
+        e = tuple(map(min, zip(ef, eg)))
+        h = {e: cont}
+        return h, poly_div_exact(f, h), poly_div_exact(g, h)
+
+    lc_f, lc_g = pf[max(pf)], pg[max(pg)]
+    gamma = igcd(lc_f, lc_g)
+    h, m, lm = None, None, None
+    for p in _iter_primes():
+        if not gamma % p or not lc_f % p or not lc_g % p:
+            continue
+        try:
+            hp = _gcd_mod_p(_reduce_mod(pf, p), _reduce_mod(pg, p), p, nvars)
+        except ModularGCDFailed:
+            continue
+        mp = max(hp)
+        hp = poly_mul_value(hp, gamma, p)
+        if lm is None or mp < lm:
+            # all previous primes were unlucky
+            half = p // 2
+            h = dict([(e, (c - p if c > half else c)) for e, c in hp.iteritems()])
+            m, lm = p, mp
+        elif mp > lm:
+            # unlucky prime
+            continue
+        else:
+            h1 = _crt(h, m, hp, p)
+            m *= p
+            if h1 != h:
+                h = h1
+                continue
+        c, candidate = poly_primitive(h)
+        qf = poly_div_exact(pf, candidate)
+        if qf is None:
+            continue
+        qg = poly_div_exact(pg, candidate)
+        if qg is None:
+            continue
+        return (poly_mul_value(candidate, cont),
+                poly_mul_value(qf, cont_f // cont),
+                poly_mul_value(qg, cont_g // cont))
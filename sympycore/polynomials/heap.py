@@ -0,0 +1,181 @@
+#
+# Created October 2026
+#
+""" Provides heap-based multiplication and division of sparse
+polynomials.
+
+Polynomials are lists of ``(<monomial>, <coefficient>)`` pairs in
+decreasing monomial order where monomials are packed integers, see
+sympycore.arithmetic.monomials, or integers of univariate
+polynomials. Terms are produced in decreasing order by merging the
+term products in a heap (Johnson's algorithm), so the working memory
+is proportional to the number of terms of one operand instead of the
+number of term products. Division follows Monagan and Pearce: the
+products of quotient terms and the divisor are merged with the terms
+of the dividend, the heap holds one product per quotient term.
+Exact division stops at the first term that is not divisible.
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['heap_mul', 'heap_divide', 'packed_terms', 'iter_mul_dicts', 'divide_dicts']
+
+from heapq import heappush, heappop
+
+from ..arithmetic.numbers import div
+from ..arithmetic.number_theory import gcd as igcd
+from ..arithmetic.monomials import MonomialPacker, exponent_bounds
+
+def heap_mul(f, g, p=None):
+    """ Generate the terms of the product of polynomials f and g in
+    decreasing order, coefficients are reduced modulo p when given.
+    """
+    if not f or not g:
+        return
+    nf, ng = len(f), len(g)
+    heap = [(-(f[0][0] + g[0][0]), 0, 0)]
+    while heap:
+        key, i, j = heappop(heap)
+        c = f[i][1] * g[j][1]
+        pending = [(i, j)]
+        while heap and heap[0][0]==key:
+            i, j = heappop(heap)[1:]
+            c += f[i][1] * g[j][1]
+            pending.append((i, j))
+        # successors of a product have smaller monomials
+        for i, j in pending:
+            if j==0 and i + 1 < nf:
+                heappush(heap, (-(f[i+1][0] + g[0][0]), i + 1, 0))
+            if j + 1 < ng:
+                heappush(heap, (-(f[i][0] + g[j+1][0]), i, j + 1))
+        if p is not None:
+            c %= p
+        if c:
+            yield -key, c
+
+def heap_divide(f, g, divides, coeff_div=div, exact=False, p=None, pseudo=False):
+    """ Divide polynomial f by g, return ``(q, r)`` such that ``f ==
+    q*g + r`` and no monomial of r is divisible by the leading
+    monomial of g.
+
+    divides(m1, m2) checks if monomial m1 divides m2, coeff_div(c,
+    lc) returns the quotient of coefficients or None when c is not
+    divisible by lc. When exact is True, return None as soon as a
+    term of the remainder or a non-divisible coefficient is found.
+    Coefficients are reduced modulo p when given.
+
+    With pseudo=True the coefficients must be integers and the result
+    is ``(s, q, r)`` such that ``s*f == q*g + r`` where s is a product
+    of factors of the leading coefficient of g, integer division is
+    used throughout.
+    """
+    if not g:
+        raise ZeroDivisionError('polynomial division')
+    gm, gc = g[0]
+    ng = len(g)
+    nf = len(f)
+    q = []      # (monomial, coefficient, scale) triples
+    r = []
+    heap = []
+    fi = 0
+    s = 1
+    while 1:
+        if heap:
+            m = -heap[0][0]
+            if fi < nf and f[fi][0] > m:
+                m = f[fi][0]
+        elif fi < nf:
+            m = f[fi][0]
+        else:
+            break
+        if fi < nf and f[fi][0]==m:
+            c = f[fi][1] * s
+            fi += 1
+        else:
+            c = 0
+        while heap and heap[0][0]==-m:
+            k, j = heappop(heap)[1:]
+            qm, qc, qs = q[k]
+            if qs==s:
+                c -= qc * g[j][1]
+            else:
+                c -= qc * g[j][1] * (s // qs)
+            j += 1
+            if j < ng:
+                heappush(heap, (-(qm + g[j][0]), k, j))
+        if p is not None:
+            c %= p
+        if not c:
+            continue
+        if divides(gm, m):
+            if pseudo:
+                a = abs(gc // igcd(c, gc))
+                if a!=1:
+                    s *= a
+                    c *= a
+                qc = c // gc
+            else:
+                qc = coeff_div(c, gc)
+                if qc is None:
+                    return
+            q.append((m - gm, qc, s))
+            if ng > 1:
+                heappush(heap, (-(m - gm + g[1][0]), len(q) - 1, 1))
+        elif exact:
+            return
+        else:
+            r.append((m, c, s))
+    q = [(m, c * (s // qs)) for m, c, qs in q]
+    r = [(m, c * (s // rs)) for m, c, rs in r]
+    if pseudo:
+        return s, q, r
+    return q, r
+
+def packed_terms(data, pack):
+    """ Return the terms of a polynomial dictionary with packed
+    monomials in decreasing order.
+    """
+    terms = [(pack(exps), c) for exps, c in data.iteritems()]
+    terms.sort(reverse=True)
+    return terms
+
+def unpacker(packer, key):
+    if key is None:
+        return packer.unpack_key
+    unpack = packer.unpack
+    return lambda m: key(unpack(m))
+
+def iter_mul_dicts(dict1, dict2, nvars, key=None):
+    """ Generate the ``(exponents, coefficient)`` terms of the product
+    of polynomial dictionaries with nonnegative exponents in
+    decreasing order, see heap_mul.
+
+    Exponents are IntegerList instances, or ``key(<list of
+    exponents>)`` when key is given.
+    """
+    lo1, hi1 = exponent_bounds(dict1, nvars)
+    lo2, hi2 = exponent_bounds(dict2, nvars)
+    packer = MonomialPacker.for_ranges([a + b for a, b in zip(hi1, hi2)])
+    unpack = unpacker(packer, key)
+    for m, c in heap_mul(packed_terms(dict1, packer.pack), packed_terms(dict2, packer.pack)):
+        yield unpack(m), c
+
+def divide_dicts(dict1, dict2, nvars, key=None, **kws):
+    """ Divide polynomial dictionaries with nonnegative exponents
+    using heap_divide, keyword arguments are passed to heap_divide.
+
+    The quotient and the remainder are lists of ``(exponents,
+    coefficient)`` pairs, see iter_mul_dicts.
+    """
+    lo1, hi1 = exponent_bounds(dict1, nvars)
+    lo2, hi2 = exponent_bounds(dict2, nvars)
+    # products of quotient and divisor terms are bounded by hi1 + hi2
+    packer = MonomialPacker.for_ranges([a + b for a, b in zip(hi1, hi2)])
+    result = heap_divide(packed_terms(dict1, packer.pack), packed_terms(dict2, packer.pack),
+                         packer.divides, **kws)
+    if result is None:
+        return
+    unpack = unpacker(packer, key)
+    result = list(result)
+    for i in (-2, -1):
+        result[i] = [(unpack(m), c) for m, c in result[i]]
+    return tuple(result)
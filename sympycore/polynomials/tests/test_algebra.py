@@ -55,3 +55,66 @@ def test_univariate():
     assert str((5 + 3*x) / 5) == '3/5*x + 1', repr((5 + 3*x) / 5)
     assert str(C([4, 11, 6]) / C([6, 12])) == '1/2*x + 2/3'
     assert str(C([2, 3, 4]) % C([1, 2, 3])) == '1/3*x + 2/3'
+
+def test_evaluate():
+    from sympycore.arithmetic.numbers import mpq
+    from sympycore.polynomials.evaluation import multipoint_evaluation
+    X = PolynomialRing['x']
+    p = X.convert([1, 2, 3])
+    assert p(2) == 17
+    assert p.evaluate([0, 1, mpq((1,2))]) == [1, 6, mpq((11,4))]
+    assert (p/2).evaluate([2, mpq((1,3))]) == [mpq((17,2)), 1]
+    assert X.convert({100:1, 0:1}).evaluate([2]) == [2**100 + 1]
+    XY = PolynomialRing['x', 'y']
+    x = XY.convert('x')
+    y = XY.convert('y')
+    q = 3*x**4*y + 2*x*y**2 - 5*y**3 + 1
+    assert q(2, 3) == 3*16*3 + 2*2*9 - 5*27 + 1
+    assert q.evaluate([(2, 3), (0, 0)]) == [q(2, 3), 1]
+    z = Symbol('z')
+    assert p(z) == 1 + 2*z + 3*z**2
+    assert p.evaluate([z, 1]) == [1 + 2*z + 3*z**2, 6]
+    assert (x*y + x**2)(z, 1) == z + z**2
+    assert q.evaluate([(z, 1)]) == [3*z**4 + 2*z - 4]
+    assert p(x)(2, 0) == 17
+    coeffs = [3, -1, 0, 4, 2]
+    points = range(-7, 8)
+    assert multipoint_evaluation(coeffs, points) == map(X.convert(coeffs), points)
+    try:
+        import numpy
+    except ImportError:
+        return
+    a = numpy.array([1.0, 2.0])
+    assert list(p(a)) == [6.0, 17.0]
+
+def test_packed_mul():
+    XYZ = PolynomialRing['x', 'y', 'z']
+    x, y, z = map(XYZ.convert, 'xyz')
+    p = (x + 2*y + 3*z + 1)**6
+    q = (x - y + z - 2)**5
+    assert len(p.data) == 84
+    assert (p*q)(1, 2, 3) == p(1, 2, 3) * q(1, 2, 3)
+    assert (p*q)(-1, 0, 2) == p(-1, 0, 2) * q(-1, 0, 2)
+    X = PolynomialRing['x']
+    x = X.convert([0, 1])
+    assert (x + 1)**10 * (x - 1)**10 == (x**2 - 1)**10
+
+def test_heap_division():
+    XY = PolynomialRing['x', 'y']
+    x = XY.convert('x')
+    y = XY.convert('y')
+    f = x**3*y - 2*x*y**2 + y + 5
+    g = x**2 + 3*y - 1
+    q, r = divmod(f*g, g)
+    assert (q, r) == (f, XY.zero)
+    q, r = divmod(f, g)
+    assert q*g + r == f
+    assert q == x*y
+    assert g.divides(f*g)
+    assert not g.divides(f*g + x)
+    s, q, r = f.pseudo_divmod(2*x + y)
+    assert s*f == q*(2*x + y) + r
+    terms = list(f.iter_mul(g))
+    assert dict(terms) == (f*g).data
+    exps = [e.data for e, c in terms]
+    assert exps == sorted(exps, reverse=True)
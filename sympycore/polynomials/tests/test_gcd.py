@@ -0,0 +1,75 @@
+
+from sympycore import *
+from sympycore.polynomials.gcd import poly_gcd, poly_mul, poly_div_exact, poly_content, poly_primitive
+
+def test_poly_content():
+    assert poly_content({}) == 0
+    assert poly_content({(2,): 6, (0,): 4}) == 2
+    assert poly_content({(2,): -6, (0,): 4}) == -2
+    assert poly_primitive({(1,0): -6, (0,1): 3}) == (-3, {(1,0): 2, (0,1): -1})
+
+def test_poly_div_exact():
+    f = {(2,): 1, (0,): -1}
+    assert poly_div_exact(f, {(1,): 1, (0,): -1}) == {(1,): 1, (0,): 1}
+    assert poly_div_exact(f, {(1,): 2, (0,): -2}) is None
+    assert poly_div_exact(f, {(1,): 1, (0,): 2}) is None
+
+def test_poly_gcd_univariate():
+    f = {(2,): 1, (0,): -1}
+    g = {(2,): 1, (1,): 2, (0,): 1}
+    h, cf, cg = poly_gcd(f, g, 1)
+    assert h == {(1,): 1, (0,): 1}, `h`
+    assert cf == {(1,): 1, (0,): -1}, `cf`
+    assert cg == {(1,): 1, (0,): 1}, `cg`
+    assert poly_gcd({(0,): 6}, {(0,): -4}, 1)[0] == {(0,): 2}
+    assert poly_gcd({}, {(1,): -2}, 1) == ({(1,): 2}, {}, {(0,): -1})
+    assert poly_gcd({(3,): 4}, {(1,): 6}, 1)[0] == {(1,): 2}
+
+def test_poly_gcd_multivariate():
+    x, y, z = {(1,0,0): 1}, {(0,1,0): 1}, {(0,0,1): 1}
+    def add(*seq):
+        d = {}
+        for p in seq:
+            for e, c in p.iteritems():
+                c = d.get(e, 0) + c
+                if c: d[e] = c
+                else: del d[e]
+        return d
+    g = add(poly_mul(x, y), poly_mul(z, {(0,0,0): 3}), {(0,0,0): -1})
+    f1 = add(poly_mul(x, x), y, z)
+    f2 = add(poly_mul(y, poly_mul(z, z)), {(0,0,0): 5})
+    f, h = poly_mul(f1, g), poly_mul(f2, g)
+    r, cf, ch = poly_gcd(f, h, 3)
+    assert r == g, `r`
+    assert cf == f1, `cf`
+    assert ch == f2, `ch`
+    # common factor depending only on the last variable:
+    r = poly_gcd(poly_mul(f1, add(z, {(0,0,0): 2})), poly_mul(f2, add(z, {(0,0,0): 2})), 3)[0]
+    assert r == add(z, {(0,0,0): 2}), `r`
+
+def test_polynomial_ring_gcd():
+    P = PolynomialRing[('x','y')]
+    a = P.convert('(x+y)*(x-y)*3')
+    b = P.convert('(x+y)**2*6')
+    h, ca, cb = a.cofactors(b)
+    assert h == P.convert('3*x+3*y'), `h`
+    assert ca == P.convert('x-y'), `ca`
+    assert cb == P.convert('2*x+2*y'), `cb`
+    assert a.gcd(b) == h
+    X = PolynomialRing['x']
+    assert X.convert('x**2-1').gcd(X.convert('x**2+2*x+1')) == X.convert('x+1')
+    f = X.convert({1:mpq((1,2)), 0:mpq((-1,2))})
+    g = X.convert({2:mpq((1,3)), 0:mpq((-1,3))})
+    h, cf, cg = f.cofactors(g)
+    assert h == X.convert('x-1'), `h`
+    assert h*cf == f, `cf`
+    assert h*cg == g, `cg`
+
+def test_polynomial_ring_content():
+    X = PolynomialRing['x']
+    assert X.convert([6, 4]).content() == 2
+    assert X.convert([-6, -4]).content() == -2
+    assert X.zero.content() == 0
+    c, p = X.convert([-1, mpq((1,2))]).primitive()
+    assert c == mpq((1,2)), `c`
+    assert p == X.convert([-2, 1]), `p`
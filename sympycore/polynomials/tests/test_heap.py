@@ -0,0 +1,34 @@
+from operator import le
+from sympycore.arithmetic.numbers import mpq
+from sympycore.arithmetic.monomials import MonomialPacker
+from sympycore.polynomials.heap import heap_mul, heap_divide, packed_terms, divide_dicts
+
+def test_heap_mul():
+    f = [(3, 1), (1, 2), (0, 1)]
+    g = [(2, 1), (1, -2), (0, 1)]
+    # (x**3 + 2*x + 1)*(x**2 - 2*x + 1), the x terms cancel
+    assert list(heap_mul(f, g)) == [(5, 1), (4, -2), (3, 3), (2, -3), (0, 1)]
+    assert list(heap_mul([(1, 1), (0, 1)], [(1, 1), (0, -1)])) == [(2, 1), (0, -1)]
+    assert list(heap_mul([(1, 3)], [(0, 5)], 7)) == [(1, 1)]
+    assert list(heap_mul([], g)) == []
+
+def test_heap_divide():
+    f = [(2, 1), (0, -1)]
+    assert heap_divide(f, [(1, 1), (0, -1)], le) == ([(1, 1), (0, 1)], [])
+    assert heap_divide(f, [(1, 2), (0, 1)], le)[1] == [(0, mpq((-3, 4)))]
+    assert heap_divide(f, [(1, 1), (0, 2)], le, exact=True) is None
+    s, q, r = heap_divide([(2, 1), (0, 1)], [(1, 2), (0, 1)], le, pseudo=True)
+    assert (s, q, r) == (4, [(1, 2), (0, -1)], [(0, 5)])
+
+def test_divide_dicts():
+    p = MonomialPacker(2, 8)
+    # x**2 - y**2 == (x - y)*(x + y)
+    f = {(2, 0): 1, (0, 2): -1}
+    g = {(1, 0): 1, (0, 1): 1}
+    q, r = divide_dicts(f, g, 2, key=tuple)
+    assert dict(q) == {(1, 0): 1, (0, 1): -1} and r == []
+    # x**2 + y == x*x + y
+    q, r = divide_dicts({(2, 0): 1, (0, 1): 1}, {(1, 0): 1}, 2, key=tuple)
+    assert (q, r) == ([((1, 0), 1)], [((0, 1), 1)])
+    assert divide_dicts({(2, 0): 1, (0, 1): 1}, {(1, 0): 1}, 2, exact=True) is None
+    assert packed_terms(g, p.pack) == [(p.pack((1, 0)), 1), (p.pack((0, 1)), 1)]
@@ -0,0 +1,671 @@
+""" Provides iterative printer of expressions.
+
+The printer writes the string representation of an expression to a
+file object piece by piece. Unlike ``str(expr)``, it does not build
+intermediate strings of subexpressions and it uses an explicit stack
+instead of recursion, so that huge or deeply nested expressions can be
+printed. Printing can be limited to a maximum length, in which case
+the rest of the expression is not visited at all.
+
+The terms of sums and the factors of products are written in a
+deterministic order that does not depend on the order of dictionary
+items. The items are kept in a heap and only the items that are
+written are ordered.
+
+For example,
+
+>>> from sympycore.printing import write_str, tostr
+>>> e = ((x+y)**3).expand()
+>>> tostr(e)
+'x**3 + 3*x**2*y + 3*x*y**2 + y**3'
+>>> tostr(((x+y)**100).expand(), maxlen=30)
+'x**100 + 100*x**99*y + 4950...'
+>>> from StringIO import StringIO
+>>> f = StringIO()
+>>> write_str(e, f)
+33
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['write_str', 'tostr']
+
+import heapq
+import threading
+
+from .core import Expr, heads_precedence
+from .heads import (NUMBER, SYMBOL, ADD, MUL, POW, APPLY, TERM_COEFF,
+                    TERM_COEFF_DICT, BASE_EXP_DICT)
+from .arithmetic.numbers import numbertypes, realtypes
+
+_inttypes = (int, long)
+
+# internal head of products of (head, data) pairs:
+_MUL = 'MUL'
+
+# task kinds:
+_WRITE, _NODE, _END, _ADD_ITEMS, _MUL_ITEMS, _MUL_END = range(6)
+
+class _Elided(Exception):
+    pass
+
+class _Output(object):
+    """ Writes to file object at most maxlen characters. When the
+    output would exceed maxlen, the last characters are replaced with
+    ``'...'`` and _Elided is raised.
+    """
+
+    def __init__(self, write, maxlen):
+        self._write = write
+        self.maxlen = maxlen
+        self.length = 0
+        # characters that are written only when the output fits
+        self.tail = ''
+
+    def write(self, s):
+        maxlen = self.maxlen
+        if maxlen is None:
+            self._write(s)
+            self.length += len(s)
+            return
+        s = self.tail + s
+        free = maxlen - 3 - self.length
+        if len(s) <= free:
+            self._write(s)
+            self.length += len(s)
+            self.tail = ''
+        elif len(s) <= free + 3:
+            if free > 0:
+                self._write(s[:free])
+                self.length += free
+                s = s[free:]
+            self.tail = s
+        else:
+            s = s[:max(free, 0)] + '...'[:maxlen - self.length]
+            self._write(s)
+            self.length += len(s)
+            self.tail = ''
+            raise _Elided
+
+    def flush(self):
+        if self.tail:
+            self._write(self.tail)
+            self.length += len(self.tail)
+            self.tail = ''
+
+# keys of subexpressions are computed from at most _KEY_MAXLEN
+# characters of their string representation, up to _KEY_DEPTH levels
+# of nesting; deeper subexpressions are ordered by their heads only.
+# The keys are cached during the outermost write_str call of each
+# thread:
+_KEY_MAXLEN = 60
+_KEY_DEPTH = 16
+
+class _KeyState(threading.local):
+    def __init__(self):
+        self.depth = 0
+        self.cache = {}
+
+_key_state = _KeyState()
+
+def _base_key(base):
+    """ Return a key of a base or exponent that does not depend on
+    hash values.
+    """
+    if not isinstance(base, Expr):
+        if isinstance(base, numbertypes):
+            return 1, str(base)
+        return 0, str(base)
+    head, data = base.pair
+    if head is SYMBOL:
+        return 0, str(data)
+    if head is NUMBER:
+        return 1, str(data)
+    state = _key_state
+    key = state.cache.get(id(base))
+    if key is not None:
+        return key[1]
+    if state.depth >= _KEY_DEPTH:
+        return 2, repr(head)
+    state.depth += 1
+    try:
+        key = 2, tostr(base, maxlen=_KEY_MAXLEN)
+    finally:
+        state.depth -= 1
+    # base is stored to keep its id valid:
+    state.cache[id(base)] = base, key
+    return key
+
+def _term_key(term):
+    """ Order terms of sums by decreasing total degree and then by
+    bases and exponents.
+    """
+    if not isinstance(term, Expr):
+        return 1, 0, ()
+    head, data = term.pair
+    if head is NUMBER:
+        return 1, 0, ()
+    if head is BASE_EXP_DICT:
+        items = data.iteritems()
+    elif head is POW:
+        items = [data]
+    else:
+        items = [(term, 1)]
+    degree = 0
+    l = []
+    for base, exp in items:
+        if isinstance(exp, Expr) and exp.head is NUMBER:
+            exp = exp.data
+        if isinstance(exp, realtypes):
+            degree += exp
+            l.append((_base_key(base), (0, -exp)))
+        else:
+            l.append((_base_key(base), (1, _base_key(exp))))
+    l.sort()
+    return 0, -degree, tuple(l)
+
+def _ordered(items, key):
+    heap = [(key(item[0]), i, item) for i, item in enumerate(items)]
+    heapq.heapify(heap)
+    heappop = heapq.heappop
+    while heap:
+        yield heappop(heap)[2]
+
+def _pair(obj):
+    if isinstance(obj, Expr):
+        return obj.pair
+    if isinstance(obj, numbertypes):
+        return NUMBER, obj
+    return SYMBOL, obj
+
+def _split_base_exp_dict(data, order):
+    """ Return ``(factors, coeff)`` where factors is a list of POW
+    pairs, see BASE_EXP_DICT.data_to_str_and_precedence.
+    """
+    factors = []
+    coeff = None
+    items = data.iteritems()
+    if order:
+        items = _ordered(items, _base_key)
+    for base, exp in items:
+        if exp==1 and base.head is NUMBER:
+            coeff = base.data
+        else:
+            factors.append((POW, (base, exp)))
+    return factors, coeff
+
+def _precedence(cls, head, data):
+    """ Return ``(precedence, string)`` of cls(head, data). string is
+    None when the expression is written by _Printer, otherwise it is
+    the string representation of the expression.
+    """
+    if head is TERM_COEFF_DICT or head is ADD:
+        n = len(data)
+        if n==0:
+            return heads_precedence.NUMBER, '0'
+        if n==1:
+            if head is ADD:
+                h, d = data[0].pair
+                return _precedence(cls, h, d)
+            return _precedence(cls, TERM_COEFF, data.items()[0])
+        return heads_precedence.ADD, None
+    if head is TERM_COEFF:
+        term, coeff = data
+        if term==1:
+            return NUMBER.data_to_str_and_precedence(cls, coeff)[::-1]
+        if coeff==1:
+            h, d = _pair(term)
+            return _precedence(cls, h, d)
+        if coeff==-1:
+            return heads_precedence.NEG, None
+        if coeff==0:
+            return heads_precedence.NUMBER, '0'
+        return heads_precedence.MUL, None
+    if head is BASE_EXP_DICT:
+        factors, coeff = _split_base_exp_dict(data, False)
+        if coeff is None or coeff==1:
+            return _precedence(cls, _MUL, factors)
+        if not factors:
+            return NUMBER.data_to_str_and_precedence(cls, coeff)[::-1]
+        if coeff==-1:
+            return heads_precedence.NEG, None
+        if coeff==0:
+            return heads_precedence.NUMBER, '0'
+        return heads_precedence.MUL, None
+    if head is MUL or head is _MUL:
+        n = len(data)
+        if n==0:
+            return heads_precedence.NUMBER, '1'
+        if n==1:
+            h, d = _pair(data[0]) if head is MUL else data[0]
+            return _precedence(cls, h, d)
+        return heads_precedence.MUL, None
+    if head is POW:
+        base, exp = data
+        if isinstance(exp, Expr):
+            h, d = exp.pair
+            if h is NUMBER and isinstance(d, numbertypes):
+                exp = d
+        if isinstance(exp, numbertypes):
+            if exp==0:
+                return heads_precedence.NUMBER, '1'
+            if exp==1:
+                h, d = _pair(base)
+                return _precedence(cls, h, d)
+            if exp < 0:
+                return heads_precedence.DIV, None
+        return heads_precedence.POW, None
+    if head is APPLY:
+        return heads_precedence.APPLY, None
+    s, p = head.data_to_str_and_precedence(cls, data)
+    return p, s
+
+def _add_prefix(text, complete, evaluate_addition):
+    if evaluate_addition and text.startswith('-'):
+        return ' - ' + text[1:]
+    return ' + ' + text
+
+def _mul_prefix(text, complete, state):
+    if complete and text=='1':
+        return ''
+    if state[0]:
+        state[0] = False
+        return text
+    if text.startswith('1/'):
+        return text[1:]
+    return '*' + text
+
+def _term_prefix(text, complete, arg):
+    if complete and text=='1':
+        return ''
+    if text.startswith('1/'):
+        return text[1:]
+    return '*' + text
+
+class _Printer(object):
+    """ Writes expression using an explicit stack of tasks.
+
+    Parent expressions that need to know how the string of a
+    subexpression starts (for example, ``x + -y`` is written as ``x -
+    y``) install a prefix handler that buffers the output of the
+    subexpression until the decision can be made.
+    """
+
+    def __init__(self, output, order):
+        self.output = output
+        self.order = order
+        self.handlers = []
+        self.stack = []
+        # maps symbol data to its string, None when not atomic:
+        self.symbols = {}
+
+    def emit(self, s):
+        handlers = self.handlers
+        while handlers:
+            h = handlers[-1]
+            h[2].append(s)
+            h[3] += len(s)
+            if h[3] < 2:
+                return
+            handlers.pop()
+            s = h[0](''.join(h[2]), False, h[1])
+        if s:
+            self.output.write(s)
+
+    def end(self, h):
+        handlers = self.handlers
+        if handlers and handlers[-1] is h:
+            handlers.pop()
+            self.emit(h[0](''.join(h[2]), True, h[1]))
+
+    def run(self, cls, expr):
+        stack = self.stack
+        emit = self.emit
+        head, data = _pair(expr)
+        stack.append((_NODE, cls, head, data, None))
+        while stack:
+            task = stack.pop()
+            kind = task[0]
+            if kind is _WRITE:
+                emit(task[1])
+            elif kind is _NODE:
+                handler = task[4]
+                if handler is not None:
+                    h = [handler[0], handler[1], [], 0]
+                    self.handlers.append(h)
+                    stack.append((_END, h))
+                self.node(task[1], task[2], task[3])
+            elif kind is _END:
+                self.end(task[1])
+            elif kind is _ADD_ITEMS:
+                self.add_item(task)
+            elif kind is _MUL_ITEMS:
+                self.mul_item(task)
+            else:
+                if task[1][0]:
+                    emit('1')
+
+    def push(self, cls, head, data, handler=None, s=None):
+        """ Push writing cls(head, data) to stack. s is the string
+        representation when known.
+        """
+        if s is None:
+            self.stack.append((_NODE, cls, head, data, handler))
+        elif handler is None:
+            self.stack.append((_WRITE, s))
+        else:
+            self.stack.append((_NODE, cls, None, s, handler))
+
+    def push_paren(self, cls, head, data, s, left='(', right=')'):
+        stack = self.stack
+        stack.append((_WRITE, right))
+        self.push(cls, head, data, s=s)
+        stack.append((_WRITE, left))
+
+    def node(self, cls, head, data):
+        stack = self.stack
+        order = self.order
+        if head is None:
+            # data is the string representation
+            self.emit(data)
+        elif head is TERM_COEFF_DICT or head is ADD:
+            n = len(data)
+            if n==0:
+                self.emit('0')
+                return
+            if head is ADD:
+                items = (op.pair for op in data)
+            elif order:
+                items = ((TERM_COEFF, item) for item in _ordered(data.iteritems(), _term_key))
+            else:
+                items = ((TERM_COEFF, item) for item in data.iteritems())
+            h, d = items.next()
+            if n==1:
+                self.push(cls, h, d)
+                return
+            add_p = heads_precedence.ADD
+            stack.append((_ADD_ITEMS, cls, items, cls.algebra_options.get('evaluate_addition')))
+            if h is TERM_COEFF:
+                s = self.simple_term(cls, d)
+                if s is not None:
+                    self.emit(s)
+                    return
+            p, s = _precedence(cls, h, d)
+            if p < add_p:
+                self.push_paren(cls, h, d, s)
+            else:
+                self.push(cls, h, d, s=s)
+        elif head is TERM_COEFF:
+            term, coeff = data
+            if term==1:
+                self.emit(NUMBER.data_to_str_and_precedence(cls, coeff)[0])
+            else:
+                self.term_coeff(cls, _pair(term), coeff)
+        elif head is BASE_EXP_DICT:
+            factors, coeff = _split_base_exp_dict(data, order)
+            if coeff is None:
+                self.mul(cls, factors)
+            elif not factors:
+                self.emit(NUMBER.data_to_str_and_precedence(cls, coeff)[0])
+            else:
+                self.term_coeff(cls, (_MUL, factors), coeff)
+        elif head is MUL:
+            self.mul(cls, [_pair(op) for op in data])
+        elif head is _MUL:
+            self.mul(cls, data)
+        elif head is POW:
+            self.pow(cls, data)
+        elif head is APPLY:
+            self.apply(cls, data)
+        else:
+            self.emit(head.data_to_str_and_precedence(cls, data)[0])
+
+    def add_item(self, task):
+        cls, items, evaluate_addition = task[1:]
+        simple_term = self.simple_term
+        emit = self.emit
+        for h, d in items:
+            if h is TERM_COEFF:
+                s = simple_term(cls, d)
+                if s is not None:
+                    if evaluate_addition and s.startswith('-'):
+                        emit(' - ' + s[1:])
+                    else:
+                        emit(' + ' + s)
+                    continue
+            break
+        else:
+            return
+        self.stack.append(task)
+        p, s = _precedence(cls, h, d)
+        if p < heads_precedence.ADD:
+            if s is None:
+                s = h.data_to_str_and_precedence(cls, d)[0]
+            if evaluate_addition and s.startswith('-'):
+                self.emit(' - ' + s[1:])
+            else:
+                self.emit(' + (' + s + ')')
+        else:
+            self.push(cls, h, d, (_add_prefix, evaluate_addition), s)
+
+    def symbol(self, data):
+        symbols = self.symbols
+        try:
+            return symbols[data]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+        s = None
+        if not isinstance(data, Expr):
+            s, p = SYMBOL.data_to_str_and_precedence(None, data)
+            if p < heads_precedence.SYMBOL:
+                s = None
+        symbols[data] = s
+        return s
+
+    def monomial(self, term):
+        """ Return string of a product of symbols with positive
+        integer exponents, otherwise return None.
+        """
+        if not isinstance(term, Expr):
+            return None
+        head, data = term.pair
+        if head is SYMBOL:
+            return self.symbol(data)
+        if head is POW:
+            items = [data]
+        elif head is BASE_EXP_DICT:
+            items = data.iteritems()
+        else:
+            return None
+        l = []
+        for base, exp in items:
+            if type(exp) not in _inttypes or exp < 1 or not isinstance(base, Expr):
+                return None
+            h, d = base.pair
+            if h is not SYMBOL:
+                return None
+            b = self.symbol(d)
+            if b is None:
+                return None
+            l.append((str(d), b, exp))
+        if not l:
+            return None
+        if self.order:
+            l.sort()
+        return '*'.join([(b if exp==1 else b + '**' + str(exp)) for n, b, exp in l])
+
+    def simple_term(self, cls, (term, coeff)):
+        """ Return string of cls(TERM_COEFF, (term, coeff)) when term
+        is a monomial, otherwise return None.
+        """
+        t = self.monomial(term)
+        if t is None:
+            return None
+        if coeff==1:
+            return t
+        if coeff==-1:
+            return '-' + t
+        if coeff==0:
+            return '0'
+        if type(coeff) in _inttypes:
+            return str(coeff) + '*' + t
+        c, c_p = NUMBER.data_to_str_and_precedence(cls, coeff)
+        if c_p < heads_precedence.MUL:
+            return '(' + c + ')*' + t
+        return c + '*' + t
+
+    def term_coeff(self, cls, (h, d), coeff):
+        mul_p = heads_precedence.MUL
+        if coeff==1:
+            self.push(cls, h, d)
+            return
+        if coeff==0:
+            self.emit('0')
+            return
+        p, s = _precedence(cls, h, d)
+        if coeff==-1:
+            if p < mul_p:
+                self.push_paren(cls, h, d, s, '-(', ')')
+            else:
+                self.push(cls, h, d, s=s)
+                self.stack.append((_WRITE, '-'))
+            return
+        c, c_p = NUMBER.data_to_str_and_precedence(cls, coeff)
+        if c_p < mul_p:
+            c = '(' + c + ')'
+        if p < mul_p:
+            self.push_paren(cls, h, d, s, c + '*(', ')')
+        else:
+            self.push(cls, h, d, (_term_prefix, None), s)
+            self.stack.append((_WRITE, c))
+
+    def mul(self, cls, factors):
+        n = len(factors)
+        if n==0:
+            self.emit('1')
+        elif n==1:
+            h, d = factors[0]
+            self.push(cls, h, d)
+        else:
+            state = [True]
+            self.stack.append((_MUL_END, state))
+            self.stack.append((_MUL_ITEMS, cls, iter(factors), state))
+
+    def mul_item(self, task):
+        cls, factors, state = task[1:]
+        for h, d in factors:
+            break
+        else:
+            return
+        self.stack.append(task)
+        p, s = _precedence(cls, h, d)
+        if p < heads_precedence.MUL:
+            left = '(' if state[0] else '*('
+            state[0] = False
+            self.push_paren(cls, h, d, s, left)
+        else:
+            self.push(cls, h, d, (_mul_prefix, state), s)
+
+    def pow(self, cls, (base, exp)):
+        pow_p = heads_precedence.POW
+        h, d = _pair(base)
+        b_p, b = _precedence(cls, h, d)
+        if isinstance(exp, Expr):
+            eh, ed = exp.pair
+            if eh is NUMBER and isinstance(ed, numbertypes):
+                exp = ed
+        stack = self.stack
+        if isinstance(exp, numbertypes):
+            if exp==0:
+                self.emit('1')
+                return
+            if exp==1:
+                self.push(cls, h, d, s=b)
+                return
+            if exp < 0:
+                if exp==-1:
+                    if b_p <= pow_p:
+                        self.push_paren(cls, h, d, b, '1/(', ')')
+                    else:
+                        self.push(cls, h, d, s=b)
+                        stack.append((_WRITE, '1/'))
+                    return
+                e, e_p = NUMBER.data_to_str_and_precedence(cls, -exp)
+                if e_p < pow_p:
+                    e = '(' + e + ')'
+                if b_p < pow_p:
+                    self.push_paren(cls, h, d, b, '1/(', ')**' + e)
+                else:
+                    stack.append((_WRITE, '**' + e))
+                    self.push(cls, h, d, s=b)
+                    stack.append((_WRITE, '1/'))
+                return
+            e, e_p = NUMBER.data_to_str_and_precedence(cls, exp)
+            eh = ed = None
+        elif isinstance(exp, Expr):
+            eh, ed = exp.pair
+            e_p, e = _precedence(cls, eh, ed)
+        else:
+            e, e_p = str(exp), 0.0
+            eh = ed = None
+        if e_p < pow_p:
+            self.push_paren(cls, eh, ed, e)
+        else:
+            self.push(cls, eh, ed, s=e)
+        if b_p <= pow_p:
+            self.push_paren(cls, h, d, b, '(', ')**')
+        else:
+            stack.append((_WRITE, '**'))
+            self.push(cls, h, d, s=b)
+
+    def apply(self, cls, (func, args)):
+        arg_p = heads_precedence.ARG
+        f, f_p = func.head.data_to_str_and_precedence(type(func), func.data)
+        if f_p < heads_precedence.APPLY:
+            f = '(' + f + ')'
+        stack = self.stack
+        stack.append((_WRITE, ')'))
+        for i in range(len(args)-1, -1, -1):
+            h, d = args[i].pair
+            p, s = _precedence(cls, h, d)
+            if p < arg_p:
+                self.push_paren(cls, h, d, s)
+            else:
+                self.push(cls, h, d, s=s)
+            if i:
+                stack.append((_WRITE, ', '))
+        stack.append((_WRITE, f + '('))
+
+def write_str(expr, fileobj, maxlen=None, order=True):
+    """ Write string representation of expr to fileobj and return the
+    number of written characters.
+
+    When maxlen is given, at most maxlen characters are written and
+    the end of a longer output is replaced with ``'...'``. When order
+    is False, the terms and factors are written in the order of
+    dictionary items, the same as ``str(expr)``.
+    """
+    output = _Output(fileobj.write, maxlen)
+    printer = _Printer(output, order)
+    try:
+        try:
+            printer.run(type(expr), expr)
+        except _Elided:
+            return output.length
+    finally:
+        if not _key_state.depth:
+            _key_state.cache.clear()
+    output.flush()
+    return output.length
+
+def tostr(expr, maxlen=None, order=True):
+    """ Return string representation of expr, see write_str.
+    """
+    class Buffer:
+        pass
+    l = []
+    buf = Buffer()
+    buf.write = l.append
+    write_str(expr, buf, maxlen, order)
+    return ''.join(l)
@@ -11,7 +11,9 @@ init_module.import_numbers()
 @init_module
 def _init(m):
     from ..arithmetic import mpq
+    from .integration import integrate_indefinite
     Ring.coefftypes = (int, long, mpq)
+    m.integrate_indefinite = integrate_indefinite
 
 class Ring(Algebra, RingInterface):
     """
@@ -242,7 +244,7 @@ class CommutativeRing(Ring):
             raise TypeError('integrate(x,..), x must be str or %s instance but got %s instance' % (cls.__name__, type(symbol).__name__))
     
         if a is None:
-            return self.head.integrate_indefinite(cls, self.data, self, x)
+            return integrate_indefinite(cls, self, x)
         if type(a) is not cls:
             a = cls(a)
         if type(b) is not cls:
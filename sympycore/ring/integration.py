@@ -0,0 +1,177 @@
+""" Provides a memo of indefinite integrals.
+
+Integrands are normalized by their numeric coefficients (see
+Head.term_coeff) before the memo is looked up, so that, for example,
+``3*x*exp(x)`` and ``-x*exp(x)`` share the memo entry of
+``x*exp(x)``. Sums are integrated term by term where the terms that
+have the same factor depending on the integration variable are
+integrated only once.
+
+The memo is used by Ring.integrate. Its statistics are available
+via integral_memo instance:
+
+>>> from sympycore.ring.integration import integral_memo
+>>> integral_memo.clear()
+>>> r = (x**2*(1+y+2*z)).expand().integrate(x)
+>>> integral_memo.hits, integral_memo.misses
+(0, 2)
+>>> r = (5*x**2).integrate(x)
+>>> integral_memo.hits, integral_memo.misses
+(1, 2)
+>>> integral_memo.maxsize = 0 # disables the memo
+"""
+
+__docformat__ = "restructuredtext"
+__all__ = ['IntegralMemo', 'integral_memo', 'integrate_indefinite', 'integrate_sum',
+           'split_constant']
+
+import threading
+
+from ..core import init_module
+init_module.import_heads()
+init_module.import_lowlevel_operations()
+
+class IntegralMemo(object):
+    """ Holds at most maxsize least recently used integrals.
+
+    Attributes hits, misses and evictions count the memo lookups that
+    found an integral, the lookups that did not find an integral, and
+    the integrals that were removed from a full memo,
+    respectively. maxsize equal to None means that the memo is not
+    bounded, maxsize equal to 0 disables the memo.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.links = {}
+        # circular doubly linked list of [prev, next, key, value] links,
+        # the least recently used link follows root:
+        self.root = root = []
+        root[:] = [root, root, None, None]
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.links)
+
+    def __repr__(self):
+        return '%s(maxsize=%r, size=%s, hits=%s, misses=%s, evictions=%s)' \
+               % (type(self).__name__, self.maxsize, len(self.links),
+                  self.hits, self.misses, self.evictions)
+
+    def get(self, key):
+        """ Return integral of key or None when it is not in the memo.
+        """
+        self.lock.acquire()
+        try:
+            link = self.links.get(key)
+            if link is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            prev, next = link[0], link[1]
+            prev[1] = next
+            next[0] = prev
+            root = self.root
+            last = root[0]
+            last[1] = root[0] = link
+            link[0] = last
+            link[1] = root
+            return link[3]
+        finally:
+            self.lock.release()
+
+    def set(self, key, value):
+        """ Store integral of key.
+        """
+        self.lock.acquire()
+        try:
+            links = self.links
+            maxsize = self.maxsize
+            if maxsize==0 or key in links:
+                return
+            root = self.root
+            if maxsize is not None:
+                while len(links) >= maxsize:
+                    oldest = root[1]
+                    root[1] = oldest[1]
+                    oldest[1][0] = root
+                    del links[oldest[2]]
+                    self.evictions += 1
+            last = root[0]
+            last[1] = root[0] = links[key] = [last, root, key, value]
+        finally:
+            self.lock.release()
+
+    def clear(self):
+        """ Remove all integrals and reset statistics.
+        """
+        self.lock.acquire()
+        try:
+            self.links.clear()
+            root = self.root
+            root[:] = [root, root, None, None]
+            self.hits = self.misses = self.evictions = 0
+        finally:
+            self.lock.release()
+
+integral_memo = IntegralMemo()
+
+def integrate_indefinite(cls, expr, x, memo=None):
+    """ Return indefinite integral of expr over symbol x using memo.
+    """
+    if memo is None:
+        memo = integral_memo
+    term, coeff = expr.head.term_coeff(cls, expr)
+    key = (cls, x, term)
+    result = memo.get(key)
+    if result is None:
+        result = term.head.integrate_indefinite(cls, term.data, term, x)
+        hash(result) # memo items must not be changed inplace
+        memo.set(key, result)
+    if coeff==1:
+        return result
+    return result * coeff
+
+def split_constant(cls, expr, x):
+    """ Return ``(const, rest)`` such that ``const * rest == expr``
+    and const does not depend on symbol x.
+    """
+    if x not in expr.symbols_data:
+        return expr, cls(NUMBER, 1)
+    head, data = expr.pair
+    if head is TERM_COEFF:
+        term, coeff = data
+        const, rest = split_constant(cls, term, x)
+        return const * coeff, rest
+    if head is BASE_EXP_DICT:
+        const = {}
+        rest = {}
+        for base, exp in data.iteritems():
+            if x in base.symbols_data or (type(exp) is cls and x in exp.symbols_data):
+                rest[base] = exp
+            else:
+                const[base] = exp
+        if const:
+            return base_exp_dict_new(cls, const), base_exp_dict_new(cls, rest)
+    return cls(NUMBER, 1), expr
+
+def integrate_sum(cls, data, x, memo=None):
+    """ Return indefinite integral of cls(TERM_COEFF_DICT, data) over
+    symbol x. Terms with the same factor depending on x are collected
+    before integration.
+    """
+    groups = {}
+    for term, coeff in data.iteritems():
+        const, rest = split_constant(cls, term, x)
+        l = groups.get(rest)
+        if l is None:
+            groups[rest] = [(const, coeff)]
+        else:
+            l.append((const, coeff))
+    result = cls(NUMBER, 0)
+    for rest, l in groups.iteritems():
+        integral = integrate_indefinite(cls, rest, x, memo)
+        for const, coeff in l:
+            result += integral * const * coeff
+    return result
@@ -0,0 +1,454 @@
+"""Provides compact binary serialization of expressions.
+
+The serialization format stores every distinct expression node,
+head, class and string exactly once in a table. The table is
+topologically ordered: an entry refers only to entries that precede
+it, so that loading is a single forward pass and shared
+subexpressions are restored as shared objects.
+
+Usage::
+
+  >>> from sympycore.serialization import dumps, loads
+  >>> expr = (x + y)**2 + Sin(x + y)
+  >>> loads(dumps(expr)) == expr
+  True
+
+Stream layout::
+
+  MAGIC <version byte> <varint payload length> <payload>
+  payload: <varint entry count> <entry>* <value>
+
+Table entries start with one of the following tags:
+
+  ``S`` - string, ``U`` - unicode string (UTF-8 encoded),
+  ``H`` - registered head (referenced by name),
+  ``M`` - MATRIX head,
+  ``C`` - class (referenced by module and name),
+  ``K`` - class constructed by its metaclass from ``__getinitargs__``,
+  ``E`` - expression ``cls(head, data)``,
+  ``P`` - pickled object, ``Q`` - pickled head.
+
+Values are encoded inline using the following tags:
+
+  ``N``, ``T``, ``F`` - None, True, False,
+  bytes ``0xc0``-``0xff`` - integers in range ``[-16, 48)``,
+  ``i`` - zigzag varint integer, ``l`` - hexadecimal long integer,
+  ``q`` - mpq as zigzag varint numerator and varint denominator,
+  ``c`` - mpqc, ``f`` - float, ``z`` - complex,
+  ``t``, ``L``, ``D``, ``s``, ``e`` - tuple, list, dict, set, frozenset,
+  ``R`` - reference to a table entry.
+"""
+
+__docformat__ = 'restructuredtext'
+__all__ = ['dumps', 'loads', 'dump', 'load']
+
+import sys
+import struct
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from .core import Expr, heads
+from .utils import MATRIX
+from .arithmetic.numbers import mpq, mpqc
+
+MAGIC = 'SYCX'
+VERSION = 1
+
+_small_int_min = -16
+_small_int_max = 48
+_small_int_offset = 0xc0 - _small_int_min
+_varint_bytes = [chr(i) for i in range(128)]
+_small_int_bytes = dict([(i, chr(i + _small_int_offset)) \
+                         for i in range(_small_int_min, _small_int_max)])
+_float_struct = struct.Struct('<d')
+_complex_struct = struct.Struct('<dd')
+
+def _varint(n):
+    """ Return unsigned LEB128 encoding of a non-negative integer n.
+    """
+    if n < 128:
+        return _varint_bytes[n]
+    l = []
+    while n >= 128:
+        l.append(chr((n & 127) | 128))
+        n >>= 7
+    l.append(chr(n))
+    return ''.join(l)
+
+def _zigzag(n):
+    if n < 0:
+        return _varint(((-n) << 1) - 1)
+    return _varint(n << 1)
+
+def _read_varint(s, pos):
+    b = ord(s[pos])
+    pos += 1
+    if b < 128:
+        return b, pos
+    n = b & 127
+    shift = 7
+    while 1:
+        b = ord(s[pos])
+        pos += 1
+        n |= (b & 127) << shift
+        if b < 128:
+            return n, pos
+        shift += 7
+
+def _read_zigzag(s, pos):
+    n, pos = _read_varint(s, pos)
+    if n & 1:
+        return -((n + 1) >> 1), pos
+    return n >> 1, pos
+
+class _Writer:
+
+    def __init__(self):
+        self.entries = []
+        self.entry_index = {}
+        self.memo = {}
+        self.writers = {
+            type(None): self.write_none,
+            bool: self.write_bool,
+            int: self.write_int,
+            long: self.write_int,
+            mpq: self.write_mpq,
+            mpqc: self.write_mpqc,
+            float: self.write_float,
+            complex: self.write_complex,
+            str: self.write_ref,
+            unicode: self.write_ref,
+            tuple: self.write_tuple,
+            list: self.write_list,
+            dict: self.write_dict,
+            set: self.write_set,
+            frozenset: self.write_set,
+            }
+
+    def add_entry(self, s):
+        index = self.entry_index.get(s)
+        if index is None:
+            index = self.entry_index[s] = len(self.entries)
+            self.entries.append(s)
+        return index
+
+    def ref(self, obj):
+        """ Return table index of obj, add obj to table when needed.
+        """
+        key = id(obj)
+        r = self.memo.get(key)
+        if r is not None:
+            return r[0]
+        t = type(obj)
+        if t is str:
+            index = self.add_entry('S' + _varint(len(obj)) + obj)
+        elif t is unicode:
+            s = obj.encode('utf-8')
+            index = self.add_entry('U' + _varint(len(s)) + s)
+        elif isinstance(obj, Expr):
+            head, data = obj.pair
+            out = ['E', _varint(self.ref(t)), _varint(self.ref(head))]
+            self.writers.get(type(data), self.write_other)(data, out)
+            index = self.add_entry(''.join(out))
+        elif isinstance(obj, type):
+            index = self.class_ref(obj)
+        elif hasattr(obj, 'as_unique_head'):
+            # Head and sympycore.utils.HEAD instances
+            index = self.head_ref(obj)
+        else:
+            index = self.add_entry(self.pickle_entry('P', obj, pickle.HIGHEST_PROTOCOL))
+        self.memo[key] = index, obj
+        return index
+
+    def pickle_entry(self, tag, obj, protocol):
+        s = pickle.dumps(obj, protocol)
+        return tag + _varint(len(s)) + s
+
+    def head_ref(self, head):
+        if getattr(heads, repr(head), None) is head:
+            return self.add_entry('H' + _varint(self.ref(repr(head))))
+        if type(head) is MATRIX:
+            out = ['M']
+            self.write_tuple((head.rows, head.cols, head.storage), out)
+            return self.add_entry(''.join(out))
+        # Pickle protocol 0 does not call HEAD.__new__ with
+        # arguments, see also sympycore.core._reconstruct.
+        return self.add_entry(self.pickle_entry('Q', head, 0))
+
+    def class_ref(self, cls):
+        module = sys.modules.get(cls.__module__)
+        if getattr(module, cls.__name__, None) is cls:
+            return self.add_entry('C' + _varint(self.ref(cls.__module__)) + _varint(self.ref(cls.__name__)))
+        typ = type(cls)
+        try:
+            args = typ.__getinitargs__(cls)
+        except AttributeError:
+            args = None
+        if args is None:
+            return self.add_entry(self.pickle_entry('P', cls, pickle.HIGHEST_PROTOCOL))
+        out = ['K', _varint(self.ref(typ))]
+        self.write_tuple(tuple(args), out)
+        return self.add_entry(''.join(out))
+
+    def write_value(self, obj, out):
+        self.writers.get(type(obj), self.write_other)(obj, out)
+
+    def write_none(self, obj, out):
+        out.append('N')
+
+    def write_bool(self, obj, out):
+        out.append(obj and 'T' or 'F')
+
+    def write_int(self, obj, out):
+        if _small_int_min <= obj < _small_int_max:
+            out.append(_small_int_bytes[obj])
+        elif -0x7fffffffffffffff <= obj <= 0x7fffffffffffffff:
+            out.append('i')
+            out.append(_zigzag(obj))
+        else:
+            s = '%x' % (obj)
+            out.append('l')
+            out.append(_varint(len(s)))
+            out.append(s)
+
+    def write_mpq(self, obj, out):
+        p, q = obj
+        out.append('q')
+        out.append(_zigzag(p))
+        out.append(_varint(q))
+
+    def write_mpqc(self, obj, out):
+        out.append('c')
+        self.write_value(obj.real, out)
+        self.write_value(obj.imag, out)
+
+    def write_float(self, obj, out):
+        out.append('f')
+        out.append(_float_struct.pack(obj))
+
+    def write_complex(self, obj, out):
+        out.append('z')
+        out.append(_complex_struct.pack(obj.real, obj.imag))
+
+    def write_ref(self, obj, out):
+        out.append('R')
+        out.append(_varint(self.ref(obj)))
+
+    def write_tuple(self, obj, out, tag='t'):
+        out.append(tag)
+        out.append(_varint(len(obj)))
+        writers = self.writers
+        write_other = self.write_other
+        for item in obj:
+            writers.get(type(item), write_other)(item, out)
+
+    def write_list(self, obj, out):
+        self.write_tuple(obj, out, 'L')
+
+    def write_set(self, obj, out):
+        self.write_tuple(obj, out, type(obj) is set and 's' or 'e')
+
+    def write_dict(self, obj, out):
+        out.append('D')
+        out.append(_varint(len(obj)))
+        writers = self.writers
+        write_other = self.write_other
+        for key, value in obj.iteritems():
+            writers.get(type(key), write_other)(key, out)
+            writers.get(type(value), write_other)(value, out)
+
+    def write_other(self, obj, out):
+        t = type(obj)
+        if issubclass(t, Expr) or isinstance(obj, type) or hasattr(obj, 'as_unique_head'):
+            # Subsequent objects of the same type are written directly.
+            self.writers[t] = self.write_ref
+        self.write_ref(obj, out)
+
+    def getvalue(self, obj):
+        out = []
+        self.write_value(obj, out)
+        payload = '%s%s%s' % (_varint(len(self.entries)), ''.join(self.entries), ''.join(out))
+        return '%s%s%s%s' % (MAGIC, chr(VERSION), _varint(len(payload)), payload)
+
+class _Reader:
+
+    def __init__(self, s, pos):
+        self.s = s
+        self.pos = pos
+        self.table = []
+
+    def read(self):
+        s = self.s
+        n, self.pos = _read_varint(s, self.pos)
+        append = self.table.append
+        read_entry = self.read_entry
+        for i in xrange(n):
+            append(read_entry())
+        return self.read_value()
+
+    def read_bytes(self):
+        n, pos = _read_varint(self.s, self.pos)
+        self.pos = end = pos + n
+        if end > len(self.s):
+            raise ValueError('truncated sympycore serialization stream')
+        return self.s[pos:end]
+
+    def read_index(self):
+        index, self.pos = _read_varint(self.s, self.pos)
+        return self.table[index]
+
+    def read_entry(self):
+        tag = self.s[self.pos]
+        self.pos += 1
+        if tag=='E':
+            cls = self.read_index()
+            head = self.read_index()
+            return cls(head, self.read_value())
+        if tag=='S':
+            return self.read_bytes()
+        if tag=='H':
+            name = self.read_index()
+            head = getattr(heads, name, None)
+            if head is None:
+                raise ValueError('unknown expression head %r' % (name))
+            return head
+        if tag=='C':
+            module = self.read_index()
+            name = self.read_index()
+            __import__(module)
+            return getattr(sys.modules[module], name)
+        if tag=='K':
+            typ = self.read_index()
+            return typ(*self.read_value())
+        if tag=='M':
+            return MATRIX(*self.read_value())
+        if tag=='U':
+            return self.read_bytes().decode('utf-8')
+        if tag=='P':
+            return pickle.loads(self.read_bytes())
+        if tag=='Q':
+            return pickle.loads(self.read_bytes()).as_unique_head()
+        raise ValueError('invalid sympycore serialization entry tag %r' % (tag))
+
+    def read_value(self):
+        s = self.s
+        pos = self.pos
+        tag = s[pos]
+        self.pos = pos = pos + 1
+        b = ord(tag)
+        if b >= 0xc0:
+            return b - _small_int_offset
+        if tag=='R':
+            index, self.pos = _read_varint(s, pos)
+            return self.table[index]
+        if tag=='t' or tag=='L' or tag=='s' or tag=='e':
+            n, self.pos = _read_varint(s, pos)
+            read_value = self.read_value
+            l = [read_value() for i in xrange(n)]
+            if tag=='t':
+                return tuple(l)
+            if tag=='L':
+                return l
+            if tag=='s':
+                return set(l)
+            return frozenset(l)
+        if tag=='D':
+            n, self.pos = _read_varint(s, pos)
+            read_value = self.read_value
+            d = {}
+            for i in xrange(n):
+                key = read_value()
+                d[key] = read_value()
+            return d
+        if tag=='i':
+            n, self.pos = _read_zigzag(s, pos)
+            return n
+        if tag=='q':
+            p, pos = _read_zigzag(s, pos)
+            q, self.pos = _read_varint(s, pos)
+            return mpq((p, q))
+        if tag=='f':
+            self.pos = pos + 8
+            return _float_struct.unpack(s[pos:pos+8])[0]
+        if tag=='N':
+            return None
+        if tag=='T':
+            return True
+        if tag=='F':
+            return False
+        if tag=='l':
+            return long(self.read_bytes(), 16)
+        if tag=='c':
+            real = self.read_value()
+            return mpqc(real, self.read_value())
+        if tag=='z':
+            self.pos = pos + 16
+            real, imag = _complex_struct.unpack(s[pos:pos+16])
+            return complex(real, imag)
+        raise ValueError('invalid sympycore serialization value tag %r' % (tag))
+
+def _read(s, pos):
+    try:
+        return _Reader(s, pos).read()
+    except (IndexError, struct.error):
+        # a read went past the end of s
+        raise ValueError('truncated or corrupt sympycore serialization stream')
+
+def dumps(obj):
+    """ Return a compact binary string representation of obj.
+
+    obj can be an expression or a (nested) container of expressions
+    and numbers. Distinct subexpressions are stored only once.
+    """
+    return _Writer().getvalue(obj)
+
+def _check_header(header):
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a sympycore serialization stream')
+    version = ord(header[len(MAGIC)])
+    if version != VERSION:
+        raise ValueError('unsupported sympycore serialization version %s' % (version))
+
+def loads(s):
+    """ Return an object reconstructed from a string created by dumps.
+    """
+    if len(s) <= len(MAGIC):
+        raise ValueError('not a sympycore serialization stream')
+    _check_header(s)
+    n, pos = _read_varint(s, len(MAGIC) + 1)
+    if pos + n > len(s):
+        raise ValueError('truncated sympycore serialization stream')
+    return _read(s, pos)
+
+def dump(obj, f):
+    """ Write a compact binary representation of obj to file object f.
+    """
+    f.write(dumps(obj))
+
+def load(f):
+    """ Read an object from file object f that was written by dump.
+
+    Several objects written to the same file can be read back by
+    calling load repeatedly.
+    """
+    header = f.read(len(MAGIC) + 1)
+    if len(header) < len(MAGIC) + 1:
+        raise EOFError('no sympycore serialization stream')
+    _check_header(header)
+    n = shift = 0
+    while 1:
+        c = f.read(1)
+        if not c:
+            raise ValueError('truncated sympycore serialization stream')
+        b = ord(c)
+        n |= (b & 127) << shift
+        if b < 128:
+            break
+        shift += 7
+    payload = f.read(n)
+    if len(payload) < n:
+        raise ValueError('truncated sympycore serialization stream')
+    return _read(payload, 0)
@@ -0,0 +1,129 @@
+""" Tests that pure Python Expr and extension type Expr behave the same.
+
+Each test is run against all available Expr implementations.
+"""
+
+import pickle
+
+from sympycore import core, expr
+from sympycore.heads import *
+
+if core.expr_module is not expr:
+    # expr is not initialized by sympycore when expr_ext is used
+    expr.init_module(expr)
+
+implementations = [expr]
+try:
+    from sympycore import expr_ext
+    implementations.append(expr_ext)
+except ImportError:
+    pass
+
+def subclasses():
+    # pickling requires classes that are accessible as module attributes
+    return [globals()['Expr_' + m.__name__.split('.')[-1]] for m in implementations]
+
+for _m in implementations:
+    _name = 'Expr_' + _m.__name__.split('.')[-1]
+    globals()[_name] = type(_name, (_m.Expr,), {})
+
+def test_pair():
+    for E in subclasses():
+        x = E(SYMBOL, 'x')
+        assert x.pair==(SYMBOL, 'x'), repr((E, x.pair))
+        assert x.head is SYMBOL
+        assert x.data=='x'
+        d = {x:2}
+        e = E(TERM_COEFF_DICT, d)
+        assert e.data is d
+        assert repr(x)=="%s(SYMBOL, 'x')" % (E.__name__), repr(x)
+
+def test_hash():
+    for E in subclasses():
+        x, y = E(SYMBOL, 'x'), E(SYMBOL, 'y')
+        assert hash(x)==hash('x')
+        assert hash(E(NUMBER, 3))==hash(3)
+        assert hash(E(TERM_COEFF_DICT, {x:1, y:2}))==hash((TERM_COEFF_DICT, frozenset([(x,1), (y,2)])))
+        assert hash(E(MUL, [x, y]))==hash((MUL, (x, y)))
+        assert hash(E(POW, (x, 1)))==hash(x)
+        assert hash(E(TERM_COEFF_DICT, {x:1}))==hash(x)
+        x._sethash(-1)
+        assert hash(x)==hash('x')
+
+def test_is_writable():
+    for E in subclasses():
+        x = E(SYMBOL, 'x')
+        assert not x.is_writable
+        e = E(TERM_COEFF_DICT, {x:1, E(SYMBOL, 'y'):1})
+        assert e.is_writable
+        hash(e)
+        assert not e.is_writable
+        l = E(MUL, [x, x])
+        assert l.is_writable
+        assert not E(MUL, (x, x)).is_writable
+
+def test_as_lowlevel():
+    for E in subclasses():
+        x = E(SYMBOL, 'x')
+        assert E(NUMBER, 2).as_lowlevel()==2
+        assert x.as_lowlevel()=='x'
+        assert E(MUL, []).as_lowlevel()==1
+        assert E(ADD, []).as_lowlevel()==0
+        assert E(ADD, [x]).as_lowlevel() is x
+        assert E(POW, (x, 0)).as_lowlevel()==1
+        assert E(POW, (x, 1)).as_lowlevel() is x
+        assert E(TERM_COEFF, (x, 0)).as_lowlevel()==0
+        assert E(TERM_COEFF, (x, 1)).as_lowlevel() is x
+        assert E(TERM_COEFF_DICT, {}).as_lowlevel()==0
+        assert E(TERM_COEFF_DICT, {x:2}).as_lowlevel()==(TERM_COEFF, (x, 2))
+        assert E(BASE_EXP_DICT, {}).as_lowlevel()==1
+        assert E(BASE_EXP_DICT, {x:2}).as_lowlevel()==(POW, (x, 2))
+        e = E(TERM_COEFF_DICT, {x:1, E(SYMBOL, 'y'):1})
+        assert e.as_lowlevel() is e.pair
+
+def test_nonzero():
+    for E in subclasses():
+        assert not E(NUMBER, 0)
+        assert E(NUMBER, 2)
+        assert not E(TERM_COEFF_DICT, {})
+        assert E(SYMBOL, 'x')
+
+def test_richcompare():
+    for E in subclasses():
+        x, y = E(SYMBOL, 'x'), E(SYMBOL, 'y')
+        assert x==E(SYMBOL, 'x')
+        assert x!=y
+        assert x=='x' and 'x'==x
+        assert E(NUMBER, 2)==2 and 2==E(NUMBER, 2)
+        assert E(NUMBER, 2)==2.0
+        assert E(NUMBER, 2)!=3
+        assert E(NUMBER, 2)<3 and E(NUMBER, 2)<=2
+        assert E(NUMBER, 2)>1 and E(NUMBER, 2)>=2
+        assert E(TERM_COEFF_DICT, {x:1})==x
+        assert E(MUL, (x, y))==E(MUL, (x, y))
+        assert E(MUL, [x, y])!=E(MUL, (x, y))
+
+def test_pickle():
+    for E in subclasses():
+        for obj in [E(SYMBOL, 'x'), E(NUMBER, 3), E(TERM_COEFF_DICT, {E(SYMBOL, 'x'):2, E(SYMBOL, 'y'):1})]:
+            for protocol in range(pickle.HIGHEST_PROTOCOL+1):
+                obj2 = pickle.loads(pickle.dumps(obj, protocol))
+                assert type(obj2) is E
+                assert obj2.head is obj.head, repr((obj.head, obj2.head))
+                assert obj2==obj, repr((obj, obj2))
+                assert hash(obj2)==hash(obj)
+
+def test_same_results():
+    if len(implementations)<2:
+        return
+    def samples(E):
+        x, y = E(SYMBOL, 'x'), E(SYMBOL, 'y')
+        return [x, E(NUMBER, 5), E(MUL, []), E(MUL, [x, y]), E(POW, (x, 1)), E(POW, (x, 2)),
+                E(TERM_COEFF, (x, 0)), E(TERM_COEFF_DICT, {x:1}), E(TERM_COEFF_DICT, {x:1, y:3}),
+                E(BASE_EXP_DICT, {x:2, y:1})]
+    E1, E2 = subclasses()
+    for a, b in zip(samples(E1), samples(E2)):
+        assert hash(a)==hash(b), repr((a, b))
+        assert bool(a)==bool(b), repr((a, b))
+        assert a.is_writable==b.is_writable, repr((a, b))
+        assert repr(a).replace(E1.__name__, '')==repr(b).replace(E2.__name__, ''), repr((a, b))
@@ -0,0 +1,50 @@
+from __future__ import with_statement
+
+from sympycore import *
+from sympycore.core import using_C_Expr
+from sympycore.heads.term_coeff_dict import TermCoeffDictHead
+from sympycore.instrumentation import Instrumentation, enable_instrumentation, \
+     disable_instrumentation, reset_instrumentation, get_report
+
+x, y = map(Symbol, 'xy')
+
+def test_instrumentation():
+    expand = TermCoeffDictHead.__dict__['expand_intpow']
+    with Instrumentation() as report:
+        assert TermCoeffDictHead.__dict__['expand_intpow'] is not expand
+        ((x + y)**3).expand()
+    assert TermCoeffDictHead.__dict__['expand_intpow'] is expand
+    entry = report.get('TERM_COEFF_DICT', 'expand_intpow')
+    assert entry is not None,`report.entries`
+    assert entry.calls==1,`entry`
+    assert entry.total >= entry.self >= 0,`entry`
+    if not using_C_Expr:
+        # methods of the extension type Expr cannot be wrapped
+        assert report.get('Calculus', '__init__').calls > 1
+    l = report.sorted('calls')
+    assert l[0].calls >= l[-1].calls
+    l = report.sorted('head')
+    assert l[0].head <= l[-1].head
+    assert 'expand_intpow' in str(report)
+
+def test_nested():
+    with Instrumentation() as report1:
+        x + y
+        with Instrumentation() as report2:
+            x * y
+    assert report2.get('SYMBOL', 'commutative_mul').calls==1
+    assert report1.get('SYMBOL', 'commutative_mul').calls==1
+    assert report1.get('SYMBOL', 'add').calls==1
+    assert report2.get('SYMBOL', 'add') is None
+
+def test_enable_disable():
+    reset_instrumentation()
+    enable_instrumentation()
+    try:
+        x*y
+    finally:
+        disable_instrumentation()
+    x*y
+    assert get_report().get('SYMBOL', 'commutative_mul').calls==1
+    reset_instrumentation()
+    assert len(get_report())==0
@@ -0,0 +1,78 @@
+
+import os
+import sys
+import subprocess
+
+import sympycore
+from sympycore.core import classes, Holder
+
+_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_python(code):
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([_path] + filter(None, [env.get('PYTHONPATH')]))
+    p = subprocess.Popen([sys.executable, '-c', code], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out, err = p.communicate()
+    assert not p.returncode, err
+    # the last line holds the output of code
+    return out.strip().splitlines()[-1]
+
+def test_import_is_lazy():
+    code = '''
+import sys
+import sympycore
+print [n for n in ['matrices', 'polynomials', 'physics', 'sets', 'calculus.cancel',
+                  'calculus.autodiff', 'calculus.series', 'calculus.identity']
+       if 'sympycore.' + n in sys.modules]
+'''
+    assert run_python(code)=='[]', run_python(code)
+
+def test_access_name():
+    code = '''
+import sys
+import sympycore
+from sympycore.core import init_module
+assert 'sympycore.matrices' not in sys.modules
+m = sympycore.Matrix([[1,2],[3,4]])
+assert 'sympycore.matrices' in sys.modules
+assert not init_module.func_list
+print m.det(), 'sympycore.physics' in sys.modules
+'''
+    assert run_python(code)=='-2 False', run_python(code)
+
+def test_access_classes():
+    code = '''
+import sympycore
+from sympycore.core import classes
+print sympycore.Logic('x in Integers'), classes.PolynomialRing['x'].__name__
+'''
+    assert run_python(code)=="x in Integers PolynomialRing[('x',), Calculus]", run_python(code)
+
+def test_import_all():
+    code = '''
+import sympycore
+from sympycore import *
+print Matrix, PolynomialRing, Set, Unit, meter, is_zero, cancel
+print [n for n in sympycore._excluded_names if n in dir()]
+'''
+    assert run_python(code)=='[]', run_python(code)
+
+def test_lazy_names():
+    for subpackage, names in sympycore._lazy_names.items():
+        module = __import__('sympycore.' + subpackage, fromlist=['*'])
+        for name in names:
+            assert getattr(sympycore, name) is getattr(module, name), name
+
+def test_holder_set_lazy():
+    h = Holder('test holder')
+    h.set_lazy('Foo', 'sympycore.sets')
+    assert not h.is_loaded('Foo')
+    try:
+        h.Foo
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('expected AttributeError')
+    assert classes.Set is sympycore.Set
+    assert classes.is_loaded('Set')
@@ -204,3 +204,32 @@ def test_is_writable():
     assert MyExpr(MUL, [n,m]).is_writable
     assert not MyExpr(MUL, (n,m)).is_writable
     
+
+def test_term_coeff_dict_add_multinomial():
+    from sympycore import Calculus, Number
+    from sympycore.arithmetic.number_theory import multinomial_coefficients
+    from sympycore import core, expr
+    if core.expr_module is not expr:
+        expr.init_module(expr)
+    modules = [expr]
+    try:
+        from sympycore import expr_ext
+        modules.append(expr_ext)
+    except ImportError:
+        pass
+    x, y = map(Calculus.Symbol, 'xy')
+    for base in [x+y, 3*x+2, Number(3,4)*x + 2*x*y + Number(1,2), x**y+x+1]:
+        data = base.data
+        term_coeff_list = [(term.base_exp(), coeff) for term, coeff in data.items()]
+        for n in [2, 3, 5]:
+            mdata = multinomial_coefficients(len(term_coeff_list), n)
+            expected = base
+            for i in range(n-1):
+                expected = (expected * base).expand()
+            for m in modules:
+                d = {}
+                m.term_coeff_dict_add_multinomial(Calculus, d, term_coeff_list, mdata)
+                r = m.term_coeff_dict_new(Calculus, d)
+                assert r==expected,`m.__name__, base, n, r, expected`
+    r = ((x + x*y)**2).expand()
+    assert r.data=={x**2:1, x**2*y:2, x**2*y**2:1},`r`
@@ -0,0 +1,54 @@
+
+from StringIO import StringIO
+
+from sympycore import *
+from sympycore.printing import write_str, tostr
+
+x, y, z = map(Symbol, 'xyz')
+
+def test_unordered():
+    for e in [x, x+y, 2*x, -x, x-y, x*y, x**2, x**-1, x**-2, 1/(x+y),
+              (x+y)**-3, x**y, x**(y+1), (x+y)**2, -2*x*y, 3*x**2*y/5,
+              Sin(x), Sin(x+y)*Cos(y)**2, -Sin(x)/y, x/y, 2/x, -x/y,
+              Number(-3)/4, x+Number(1)/2, x*I, (1+I)*x, -(x+y)**2,
+              ((x+2*y+3*z)**4).expand(), (x+y)/(x-y), (2*x)**y,
+              x**(Number(-1)/2), Exp(x)*x, (x+y)*(x-y)*z, -1/x, x**(-y),
+              (-x)**y, Number(2)**x, Calculus('x[1]'), Logic('x and y')]:
+        assert tostr(e, order=False)==str(e),`e, tostr(e, order=False)`
+
+def test_ordered():
+    assert tostr(((x+y)**3).expand())=='x**3 + 3*x**2*y + 3*x*y**2 + y**3'
+    assert tostr(((x-y)**2).expand())=='x**2 - 2*x*y + y**2'
+    assert tostr(z*y*x+1)=='x*y*z + 1'
+    assert tostr(Sin(y)+Sin(x))=='Sin(x) + Sin(y)'
+    e = ((x+2*y+3*z)**5).expand() + x*y*z*x
+    assert tostr(e)==tostr(Calculus(str(e))),`e`
+
+def test_maxlen():
+    e = ((x+y)**100).expand()
+    s = tostr(e)
+    for n in [0, 1, 3, 4, 10, 30, 100]:
+        s1 = tostr(e, maxlen=n)
+        assert len(s1)==n,`n, s1`
+        assert s1.endswith('...'[:n]),`n, s1`
+        assert s.startswith(s1[:-3]),`n, s1`
+    assert tostr(x+y, maxlen=5)=='x + y'
+    assert tostr(x+y, maxlen=4)=='x...'
+
+def test_write_str():
+    e = ((x+y)**3).expand()
+    f = StringIO()
+    n = write_str(e, f)
+    assert f.getvalue()=='x**3 + 3*x**2*y + 3*x*y**2 + y**3'
+    assert n==len(f.getvalue())
+    f = StringIO()
+    assert write_str(e, f, maxlen=10)==10
+
+def test_deep():
+    e = x
+    for i in range(3000):
+        e = Sin(e) + i
+    s = tostr(e)
+    assert s.startswith('Sin(Sin(Sin('),`s[:20]`
+    assert s.endswith(') + 2999'),`s[-20:]`
+    assert tostr(e, maxlen=20)=='Sin(Sin(Sin(Sin(S...'
@@ -0,0 +1,78 @@
+
+from StringIO import StringIO
+
+from sympycore import *
+from sympycore.serialization import dumps, loads, dump, load
+
+x, y = map(Symbol, 'xy')
+
+def test_roundtrip():
+    for obj in [x, Number(3,4), 2.5*x, x**Number(1,2), x*I,
+                (x + y)**2 + Sin(x + y), 10**40*x - 3**50,
+                Logic('a and b'), Matrix([[1,x],[y,2]]),
+                [x, {x: (1, -100000, 2.0, 1j, None, True)}]]:
+        obj2 = loads(dumps(obj))
+        assert obj2==obj,`obj, obj2`
+        assert type(obj2) is type(obj),`type(obj), type(obj2)`
+
+def test_polynomial_ring():
+    P = PolynomialRing[('x','y')]
+    p = P.convert('x**2*y+3*x') + mpq((1,2))
+    p2 = loads(dumps(p))
+    assert p2==p,`p, p2`
+    assert type(p2)==P
+    import pickle
+    assert pickle.loads(pickle.dumps(p))==p
+
+def test_sharing():
+    a = Sin(x + y)
+    b = Sin(x + y)
+    assert a is not b
+    l = loads(dumps([a, a, b, a + 1]))
+    assert l[0] is l[1] is l[2]
+    assert l[0] in l[3].data
+    assert [k for k in l[3].data if k==a][0] is l[0]
+
+def test_compact():
+    e = ((x + y + 1)**10).expand()
+    e = e*(e + 1)
+    import pickle
+    assert 2*len(dumps(e)) < len(pickle.dumps(e, 2))
+
+def test_dump_load():
+    f = StringIO()
+    dump(x + y, f)
+    dump(Number(2,3), f)
+    f.seek(0)
+    assert load(f)==x + y
+    assert load(f)==Number(2,3)
+    try:
+        load(f)
+        assert 0, 'expected EOFError'
+    except EOFError:
+        pass
+
+def test_errors():
+    s = dumps(x + y)
+    for t in [s[:-3], 'XXXX' + s[4:], '']:
+        try:
+            loads(t)
+            assert 0,`t`
+        except ValueError:
+            pass
+    # streams with consistent headers but truncated payloads:
+    from sympycore.serialization import MAGIC, VERSION, _varint, _read_varint
+    n, pos = _read_varint(s, len(MAGIC) + 1)
+    payload = s[pos:]
+    for k in range(len(payload)):
+        t = MAGIC + chr(VERSION) + _varint(k) + payload[:k]
+        try:
+            loads(t)
+            assert 0, repr(t)
+        except ValueError:
+            pass
+        try:
+            load(StringIO(t))
+            assert 0, repr(t)
+        except ValueError:
+            pass
@@ -0,0 +1,114 @@
+import sys
+import threading
+
+from sympycore import *
+from sympycore.arithmetic import number_theory
+from sympycore.printing import tostr
+
+x, y, z = map(Symbol, 'xyz')
+
+def run_threads(func, nthreads=8):
+    """ Run func(index) in threads, return the results and the
+    exceptions raised in threads.
+    """
+    results = [None] * nthreads
+    errors = []
+    def target(i):
+        try:
+            results[i] = func(i)
+        except Exception, msg:
+            errors.append(msg)
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(nthreads)]
+    interval = sys.getcheckinterval()
+    sys.setcheckinterval(1)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setcheckinterval(interval)
+    return results, errors
+
+def work(i):
+    e = ((x + y*i + z)**6).expand()
+    d = (Sin(x*y) + Exp(i*x) + (x + i)**4 / (1 + y)).diff(x, 2)
+    m = Matrix([[i + 1, 2, x], [3, i + 4, 5], [7, 8, i + 9 + y]])
+    return e, d, m.gauss_jordan_elimination(), tostr(e)
+
+def test_concurrent_work():
+    expected = map(work, range(8))
+    results, errors = run_threads(work)
+    assert not errors, errors
+    for r, e in zip(results, expected):
+        assert r[0] == e[0]
+        assert r[1] == e[1]
+        assert r[2] == e[2]
+        assert r[3] == e[3]
+
+def test_factorial():
+    saved = number_theory._factorials[:]
+    del number_theory._factorials[2:]
+    try:
+        results, errors = run_threads(lambda i: [factorial(n) for n in range(120, 0, -1 - i)])
+        assert not errors, errors
+        memo = number_theory._factorials
+        for n in range(1, len(memo)):
+            assert memo[n] == n * memo[n-1]
+    finally:
+        number_theory._factorials[:] = saved
+
+def test_shared_expression():
+    e = (x + y + 1)**3
+    s = e.expand()
+    hash(s)
+    def add_to_shared(i):
+        r = s
+        for k in range(50):
+            r += x**k
+        return r
+    results, errors = run_threads(add_to_shared)
+    assert not errors, errors
+    assert s == e.expand()
+    assert len(set(results)) == 1
+
+def test_bdd():
+    from sympycore.logic.bdd import BDD
+    bdd = BDD()
+    names = ['a%s' % (k) for k in range(16)]
+    def check(i):
+        r = []
+        for k in range(16):
+            f = Logic(' and '.join(['(%s or %s)' % (names[(j + i + k) % 16], names[(3*j + k) % 16])
+                                    for j in range(6)]))
+            r.append((f.is_satisfiable(bdd), f.is_tautology(bdd),
+                      Logic.Or(f, Logic.Not(f)).is_tautology(bdd),
+                      Logic.And(f, Logic.Not(f)).is_satisfiable(bdd)))
+        return r
+    results, errors = run_threads(check)
+    assert not errors, errors
+    for r in results:
+        assert r == [(True, False, True, False)] * 16, r
+    assert len(bdd.unique) == len(bdd.nodes) - 2
+    for node in range(2, len(bdd.nodes)):
+        assert bdd.unique[bdd.nodes[node]] == node
+    assert len(bdd.atoms) == len(bdd.atom_index) == 16
+
+def test_integral_memo():
+    from sympycore.ring.integration import IntegralMemo, integrate_indefinite
+    memo = IntegralMemo(maxsize=4)
+    terms = [(k + 1) * x**k for k in range(6)]
+    expected = [integrate_indefinite(Calculus, t, x, IntegralMemo(0)) for t in terms]
+    def integrate(i):
+        return [integrate_indefinite(Calculus, terms[(k + i) % 6], x, memo)
+                for k in range(300)]
+    results, errors = run_threads(integrate)
+    assert not errors, errors
+    for i, r in enumerate(results):
+        assert r == [expected[(k + i) % 6] for k in range(300)]
+    assert memo.hits + memo.misses == 8 * 300
+    n, link = 0, memo.root[1]
+    while link is not memo.root and n <= 4:
+        assert memo.links[link[2]] is link
+        n, link = n + 1, link[1]
+    assert n == len(memo) == 4
@@ -15,10 +15,12 @@ class HEAD(object):
         key = '%s%s' % (cls.__name__, args)
         obj = cls._cache.get(key)
         if obj is None:
-            obj = object.__new__(cls)
-            cls._cache[key] = obj
-            obj._key = key
-            obj.init(*args)
+            new = object.__new__(cls)
+            new._key = key
+            new.init(*args)
+            # publish only initialized heads; setdefault is atomic,
+            # concurrent callers get the same instance
+            obj = cls._cache.setdefault(key, new)
         return obj
 
     def init(self, *args):
@@ -94,43 +96,42 @@ class MATRIX(HEAD):
         self.shape = (rows, cols)
         self.storage = storage
 
-        self.is_transpose = is_transpose = storage in [MATRIX_DICT_T, MATRIX_DICT_TA, MATRIX_DICT_TD]
+        self.is_transpose = storage in [MATRIX_DICT_T, MATRIX_DICT_TA, MATRIX_DICT_TD]
         self.is_array = storage in [MATRIX_DICT_A, MATRIX_DICT_TA]
         self.is_diagonal = storage in [MATRIX_DICT_D, MATRIX_DICT_TD]
 
-        if storage==MATRIX_DICT:
-            self.T = type(self)(cols, rows,  MATRIX_DICT_T)
-            self.A = type(self)(rows, cols,  MATRIX_DICT_A)
-            self.M = self
-            self.D = type(self)(rows, cols,  MATRIX_DICT_D)
-        elif storage==MATRIX_DICT_T:
-            self.T = type(self)(cols, rows,  MATRIX_DICT)
-            self.A = type(self)(rows, cols,  MATRIX_DICT_TA)
-            self.M = self
-            self.D = type(self)(rows, cols,  MATRIX_DICT_TD)
-        elif storage==MATRIX_DICT_A:
-            self.T = type(self)(cols, rows,  MATRIX_DICT_TA)
-            self.A = self
-            self.M = type(self)(rows, cols,  MATRIX_DICT)
-            self.D = type(self)(rows, cols,  MATRIX_DICT_D)
-        elif storage==MATRIX_DICT_TA:
-            self.T = type(self)(cols, rows,  MATRIX_DICT_A)
-            self.A = self
-            self.M = type(self)(rows, cols,  MATRIX_DICT_T)
-            self.D = type(self)(rows, cols,  MATRIX_DICT_TD)
-        elif storage==MATRIX_DICT_D:
-            self.T = type(self)(cols, rows,  MATRIX_DICT_T)
-            self.A = type(self)(rows, cols,  MATRIX_DICT_A)
-            self.M = type(self)(rows, cols,  MATRIX_DICT)
-            self.D = self
-        elif storage==MATRIX_DICT_TD:
-            self.T = type(self)(cols, rows,  MATRIX_DICT)
-            self.A = type(self)(rows, cols,  MATRIX_DICT_TA)
-            self.M = type(self)(rows, cols,  MATRIX_DICT_T)
-            self.D = self
-        else:
+        if storage not in matrix_views:
             raise NotImplementedError(`storage`) #pragma NO COVER
 
+    # The transpose and view heads are constructed on demand because
+    # they refer back to this head:
+
+    @property
+    def T(self):
+        return type(self)(self.cols, self.rows, matrix_views[self.storage][0])
+
+    @property
+    def A(self):
+        return type(self)(self.rows, self.cols, matrix_views[self.storage][1])
+
+    @property
+    def M(self):
+        return type(self)(self.rows, self.cols, matrix_views[self.storage][2])
+
+    @property
+    def D(self):
+        return type(self)(self.rows, self.cols, matrix_views[self.storage][3])
+
+# Storages of the T, A, M, D heads of a MATRIX head:
+matrix_views = {
+    MATRIX_DICT: (MATRIX_DICT_T, MATRIX_DICT_A, MATRIX_DICT, MATRIX_DICT_D),
+    MATRIX_DICT_T: (MATRIX_DICT, MATRIX_DICT_TA, MATRIX_DICT_T, MATRIX_DICT_TD),
+    MATRIX_DICT_A: (MATRIX_DICT_TA, MATRIX_DICT_A, MATRIX_DICT, MATRIX_DICT_D),
+    MATRIX_DICT_TA: (MATRIX_DICT_A, MATRIX_DICT_TA, MATRIX_DICT_T, MATRIX_DICT_TD),
+    MATRIX_DICT_D: (MATRIX_DICT_T, MATRIX_DICT_A, MATRIX_DICT, MATRIX_DICT_D),
+    MATRIX_DICT_TD: (MATRIX_DICT, MATRIX_DICT_TA, MATRIX_DICT_T, MATRIX_DICT_TD),
+    }
+
 def totree(obj, tab=''):
     from .core import Expr
     if isinstance(obj, Expr):